@@ -0,0 +1,149 @@
+# bench/fixtures.py
+# Dataset sintético e determinístico com o formato da SWAPI (mesmas chaves,
+# mesmos volumes e "buracos" de id conhecidos, ex.: people/17).
+from __future__ import annotations
+
+import random
+from typing import Any
+
+# ids existentes aproximados da SWAPI real (com os "buracos")
+_IDS: dict[str, tuple[int, ...]] = {
+    "films": tuple(range(1, 7)),
+    "people": tuple(i for i in range(1, 84) if i != 17),
+    "planets": tuple(range(1, 61)),
+    "species": tuple(range(1, 38)),
+    "starships": (2, 3, 5, 9, 10, 11, 12, 13, 15, 17, 21, 22, 23, 27, 28, 29, 31, 32, 39, 40, 41, 43,
+                  47, 48, 49, 52, 58, 59, 61, 63, 64, 65, 66, 68, 74, 75),
+    "vehicles": (4, 6, 7, 8, 14, 16, 18, 19, 20, 24, 25, 26, 30, 33, 34, 35, 36, 37, 38, 42, 44, 45,
+                 46, 50, 51, 53, 54, 55, 56, 57, 60, 62, 67, 69, 70, 71, 72, 73, 76),
+}
+
+_CLIMATES = ["arid", "temperate", "tropical", "frozen", "murky", "temperate, arid", "unknown"]
+_GENDERS = ["male", "female", "n/a", "hermaphrodite", "none"]
+
+
+def resource_ids(resource: str) -> list[int]:
+    return list(_IDS[resource])
+
+
+def build_dataset(base_url: str, *, seed: int = 42) -> dict[str, dict[int, dict[str, Any]]]:
+    """
+    Retorna {resource: {id: record}} com URLs absolutas apontando para `base_url`
+    (ex.: http://127.0.0.1:8765/api).
+    """
+    rng = random.Random(seed)
+    base = base_url.rstrip("/")
+    ids = {r: resource_ids(r) for r in _IDS}
+
+    def url(resource: str, i: int) -> str:
+        return f"{base}/{resource}/{i}/"
+
+    def sample(resource: str, k_max: int) -> list[str]:
+        k = rng.randint(0, min(k_max, len(ids[resource])))
+        return [url(resource, i) for i in sorted(rng.sample(ids[resource], k))]
+
+    def number(lo: int, hi: int) -> str:
+        # SWAPI devolve números como string, às vezes "unknown" ou com vírgula
+        roll = rng.random()
+        if roll < 0.1:
+            return "unknown"
+        n = rng.randint(lo, hi)
+        return f"{n:,}" if roll < 0.2 else str(n)
+
+    stamp = {"created": "2014-12-09T13:50:51.644000Z", "edited": "2014-12-20T21:17:56.891000Z"}
+    data: dict[str, dict[int, dict[str, Any]]] = {r: {} for r in _IDS}
+
+    for i in ids["films"]:
+        data["films"][i] = {
+            "title": f"Episode {i}",
+            "episode_id": i,
+            "opening_crawl": "It is a period of civil war. " * 12,
+            "director": "George Lucas",
+            "producer": "Gary Kurtz, Rick McCallum",
+            "release_date": f"19{77 + i}-05-25",
+            "characters": sample("people", 40),
+            "planets": sample("planets", 12),
+            "starships": sample("starships", 12),
+            "vehicles": sample("vehicles", 12),
+            "species": sample("species", 15),
+            **stamp,
+            "url": url("films", i),
+        }
+
+    for i in ids["people"]:
+        data["people"][i] = {
+            "name": f"Person {i}" if i != 1 else "Luke Skywalker",
+            "height": number(60, 230),
+            "mass": number(20, 1400),
+            "hair_color": rng.choice(["blond", "brown", "black", "none", "n/a"]),
+            "skin_color": rng.choice(["fair", "gold", "white, blue", "green"]),
+            "eye_color": rng.choice(["blue", "yellow", "red", "brown"]),
+            "birth_year": f"{rng.randint(8, 900)}BBY",
+            "gender": rng.choice(_GENDERS),
+            "homeworld": url("planets", rng.choice(ids["planets"])),
+            "films": sample("films", 6),
+            "species": sample("species", 1),
+            "vehicles": sample("vehicles", 3),
+            "starships": sample("starships", 4),
+            **stamp,
+            "url": url("people", i),
+        }
+
+    for i in ids["planets"]:
+        data["planets"][i] = {
+            "name": f"Planet {i}" if i != 1 else "Tatooine",
+            "rotation_period": number(6, 40),
+            "orbital_period": number(200, 5000),
+            "diameter": number(0, 120000),
+            "climate": rng.choice(_CLIMATES),
+            "gravity": "1 standard",
+            "terrain": rng.choice(["desert", "grasslands, mountains", "jungle", "ocean"]),
+            "surface_water": number(0, 100),
+            "population": number(0, 2_000_000_000),
+            "residents": sample("people", 10),
+            "films": sample("films", 5),
+            **stamp,
+            "url": url("planets", i),
+        }
+
+    for i in ids["species"]:
+        data["species"][i] = {
+            "name": f"Species {i}",
+            "classification": rng.choice(["mammal", "artificial", "reptile", "amphibian"]),
+            "designation": "sentient",
+            "average_height": number(30, 300),
+            "average_lifespan": number(20, 1000),
+            "language": f"Language {i}",
+            "homeworld": url("planets", rng.choice(ids["planets"])),
+            "people": sample("people", 8),
+            "films": sample("films", 6),
+            **stamp,
+            "url": url("species", i),
+        }
+
+    for resource in ("starships", "vehicles"):
+        for i in ids[resource]:
+            data[resource][i] = {
+                "name": f"{resource[:-1].title()} {i}",
+                "model": f"Model {i}",
+                "manufacturer": "Corellian Engineering Corporation",
+                "cost_in_credits": number(1000, 1_000_000_000),
+                "length": number(3, 19000),
+                "max_atmosphering_speed": number(100, 1500),
+                "crew": number(1, 300000),
+                "passengers": number(0, 800000),
+                "cargo_capacity": number(0, 1_000_000_000),
+                "consumables": f"{rng.randint(1, 6)} years",
+                "pilots": sample("people", 4),
+                "films": sample("films", 3),
+                **stamp,
+                "url": url(resource, i),
+            }
+            if resource == "starships":
+                data[resource][i]["hyperdrive_rating"] = f"{rng.choice([0.5, 1.0, 2.0, 4.0])}"
+                data[resource][i]["MGLT"] = number(10, 120)
+                data[resource][i]["starship_class"] = rng.choice(["Starfighter", "Deep Space Mobile Battlestation"])
+            else:
+                data[resource][i]["vehicle_class"] = rng.choice(["wheeled", "repulsorcraft", "walker"])
+
+    return data
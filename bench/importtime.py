@@ -0,0 +1,107 @@
+# bench/importtime.py
+# Orçamento de tempo de import do entrypoint (cold start do Cloud Functions).
+#
+# Roda `python -X importtime -c "import <preload>; import main"` em subprocessos
+# novos, mede o cumulativo do módulo `main` (mediana de N execuções) e lista os
+# módulos mais caros. `--preload flask` (default) simula o functions-framework,
+# que já importou o Flask antes de carregar o nosso source.
+#
+# Uso (na raiz do repo):
+#   python -m bench.importtime                      # exit 1 se passar do orçamento
+#   python -m bench.importtime --budget-ms 200 --top 25
+#   python -m bench.importtime --preload ""         # sem pré-carga (conta o Flask também)
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# folga sobre o medido numa máquina de dev (~115 ms com Flask pré-carregado)
+DEFAULT_BUDGET_MS = 180.0
+
+_LINE_RE = re.compile(r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cum>\d+)\s+\|(?P<indent>\s+)(?P<name>\S+)\s*$")
+
+
+@dataclass(frozen=True)
+class ImportEntry:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportEntry]:
+    entries: list[ImportEntry] = []
+    for line in stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if not m:
+            continue  # cabeçalho ("self [us] | cumulative | ...") e outras saídas
+        entries.append(
+            ImportEntry(
+                name=m.group("name"),
+                self_us=int(m.group("self")),
+                cumulative_us=int(m.group("cum")),
+                depth=(len(m.group("indent")) - 1) // 2,
+            )
+        )
+    return entries
+
+
+def run_once(module: str, preload: str) -> list[ImportEntry]:
+    code = f"import {preload}; import {module}" if preload else f"import {module}"
+    env = {**os.environ, "PYTHONPATH": SRC}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    entries = parse_importtime(proc.stderr)
+    if preload:
+        # descarta o que o preload importou: mede só o que o nosso módulo traz
+        names = [e.name for e in entries]
+        cut = names.index(module) if module in names else 0
+        first = next((i for i, e in enumerate(entries) if e.depth == 0 and e.name == preload), -1)
+        entries = entries[first + 1 : cut + 1] if first >= 0 else entries
+    return entries
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Tempo de import do entrypoint com orçamento")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--preload", default="flask", help='módulo importado antes (""=nenhum)')
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    runs = [run_once(args.module, args.preload) for _ in range(max(1, args.runs))]
+    totals = []
+    for entries in runs:
+        top_level = next((e for e in entries if e.name == args.module and e.depth == 0), None)
+        totals.append(top_level.cumulative_us / 1000 if top_level else 0.0)
+    total_ms = statistics.median(totals)
+
+    # mais caros por tempo próprio (mediana entre execuções não vale o custo: usa a execução mediana)
+    median_run = runs[totals.index(sorted(totals)[len(totals) // 2])]
+    print(f"{'self ms':>9} {'cum ms':>9}  module")
+    for e in sorted(median_run, key=lambda e: e.self_us, reverse=True)[: args.top]:
+        print(f"{e.self_us / 1000:9.2f} {e.cumulative_us / 1000:9.2f}  {'  ' * e.depth}{e.name}")
+
+    preload = f" (preload: {args.preload})" if args.preload else ""
+    print(f"\nimport {args.module}{preload}: {total_ms:.1f} ms (mediana de {len(totals)}), orçamento {args.budget_ms:.0f} ms")
+    if total_ms > args.budget_ms:
+        print("ACIMA DO ORÇAMENTO")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,226 @@
+# bench/run_bench.py
+# Benchmark end-to-end: emulador SWAPI local -> entrypoint `main` (Flask/functions-framework)
+# -> HTTP real, com concorrência configurável.
+#
+# Uso (na raiz do repo):
+#   PYTHONPATH=src:. python -m bench.run_bench --requests 200 --concurrency 16 --latency-ms 40
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import httpx
+
+from bench.swapi_emulator import FaultConfig, SwapiEmulator, fixed_latency, lognormal_latency, uniform_latency
+
+# rotas exercitadas por padrão (todas as registradas em create_app_router)
+DEFAULT_ROUTES = (
+    "/health",
+    "/films",
+    "/people?page=1&page_size=10",
+    "/people?page=3&page_size=25",
+    "/planets?page=2",
+    "/starships?q=starship",
+    "/films/1/characters?page=1&page_size=20",
+    "/planets/1/residents",
+    "/resolve?refs=films/1,people/1,planets/1",
+    "/export/people",
+)
+
+
+@dataclass
+class RouteResult:
+    route: str
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    upstream_calls_per_request: float
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss: KiB no Linux, bytes no macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def build_wsgi_app() -> Any:
+    """
+    Usa o functions-framework quando instalado (mesmo caminho de produção);
+    senão, um Flask mínimo que delega todo path para `main`.
+    """
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    try:
+        import functions_framework
+
+        return functions_framework.create_app(target="main", source=os.path.join(src, "main.py"))
+    except ImportError:
+        from flask import Flask, request
+
+        from app.main import main
+
+        app = Flask(__name__)
+
+        @app.route("/", defaults={"path": ""}, methods=["GET", "POST", "OPTIONS"])
+        @app.route("/<path:path>", methods=["GET", "POST", "OPTIONS"])
+        def _all(path: str) -> Any:
+            return main(request)
+
+        return app
+
+
+class _Server:
+    def __init__(self, app: Any) -> None:
+        from werkzeug.serving import make_server
+
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)  # sem log por request
+        self._srv = make_server("127.0.0.1", 0, app, threaded=True)
+        self.base_url = f"http://127.0.0.1:{self._srv.server_port}"
+        self._thread = threading.Thread(target=self._srv.serve_forever, name="bench-app", daemon=True)
+
+    def __enter__(self) -> "_Server":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._srv.shutdown()
+
+
+def run_route(
+    http: httpx.Client,
+    emulator: SwapiEmulator,
+    route: str,
+    *,
+    requests: int,
+    concurrency: int,
+) -> RouteResult:
+    emulator.reset_calls()
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(_: int) -> None:
+        nonlocal errors
+        t0 = time.perf_counter()
+        try:
+            resp = http.get(route)
+            ok = resp.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        dt = (time.perf_counter() - t0) * 1000
+        with lock:
+            latencies.append(dt)
+            if not ok:
+                errors += 1
+
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        list(ex.map(one, range(requests)))
+    wall = time.perf_counter() - t_start
+
+    lat = sorted(latencies)
+    return RouteResult(
+        route=route,
+        requests=requests,
+        errors=errors,
+        rps=requests / wall if wall > 0 else 0.0,
+        p50_ms=statistics.median(lat) if lat else 0.0,
+        p95_ms=_percentile(lat, 95),
+        p99_ms=_percentile(lat, 99),
+        upstream_calls_per_request=emulator.calls / requests,
+    )
+
+
+def _latency_from_args(args: argparse.Namespace) -> Any:
+    seconds = args.latency_ms / 1000
+    if args.latency_dist == "uniform":
+        return uniform_latency(0.0, 2 * seconds)
+    if args.latency_dist == "lognormal" and seconds > 0:
+        return lognormal_latency(seconds, args.latency_sigma)
+    return fixed_latency(seconds)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end contra o emulador SWAPI local")
+    parser.add_argument("--requests", type=int, default=100, help="requests por rota")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--routes", nargs="*", default=list(DEFAULT_ROUTES))
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="latência upstream (mediana)")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", dest="json_path", help="grava o relatório em JSON")
+    args = parser.parse_args(argv)
+
+    faults = FaultConfig(
+        latency=_latency_from_args(args),
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        timeout_rate=args.timeout_rate,
+        seed=args.seed,
+    )
+
+    with SwapiEmulator(faults=faults) as emulator:
+        # o router do app é criado no 1º request e lê SWAPI_BASE_URL nesse momento
+        os.environ["SWAPI_BASE_URL"] = emulator.base_url
+        # log JSON por request (stdout) se misturaria ao relatório; REQUEST_LOG=1 explícito mantém
+        os.environ.setdefault("REQUEST_LOG", "0")
+        app = build_wsgi_app()
+
+        with _Server(app) as server, httpx.Client(base_url=server.base_url, timeout=30.0) as http:
+            results = [
+                run_route(http, emulator, r, requests=args.requests, concurrency=args.concurrency)
+                for r in args.routes
+            ]
+
+    peak_rss = _peak_rss_mb()
+
+    header = f"{'route':48} {'req':>5} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'up/req':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.route[:48]:48} {r.requests:5d} {r.errors:4d} {r.rps:8.1f} "
+            f"{r.p50_ms:8.2f} {r.p95_ms:8.2f} {r.p99_ms:8.2f} {r.upstream_calls_per_request:7.2f}"
+        )
+    print(f"\npeak RSS (processo inteiro, inclui emulador): {peak_rss:.1f} MiB")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "config": {k: v for k, v in vars(args).items() if k != "json_path"},
+                    "peak_rss_mb": peak_rss,
+                    "routes": [asdict(r) for r in results],
+                },
+                fh,
+                indent=2,
+            )
+
+    return 1 if any(r.errors for r in results) and not (args.rate_429 or args.rate_5xx or args.timeout_rate) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
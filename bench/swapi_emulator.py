@@ -0,0 +1,192 @@
+# bench/swapi_emulator.py
+# Emulador local da SWAPI (HTTP real, stdlib) com injeção de falhas/latência.
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qs, quote, urlsplit
+
+from bench.fixtures import build_dataset
+
+PAGE_SIZE = 10  # mesma página fixa da SWAPI
+
+_LIST_RE = re.compile(r"^/api/(?P<resource>[a-z]+)/?$")
+_DETAIL_RE = re.compile(r"^/api/(?P<resource>[a-z]+)/(?P<id>\d+)/?$")
+
+
+def fixed_latency(seconds: float) -> Callable[[random.Random], float]:
+    return lambda _rng: seconds
+
+
+def uniform_latency(lo: float, hi: float) -> Callable[[random.Random], float]:
+    return lambda rng: rng.uniform(lo, hi)
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> Callable[[random.Random], float]:
+    """Cauda longa típica de upstream HTTP (p99 bem acima da mediana)."""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+@dataclass
+class FaultConfig:
+    """
+    Falhas injetadas por request (probabilidades independentes, avaliadas nessa ordem):
+    timeout_rate: dorme `timeout_seconds` antes de responder (estoura o timeout do client)
+    rate_429: responde 429
+    rate_5xx: responde 503
+    """
+    latency: Callable[[random.Random], float] = field(default_factory=lambda: fixed_latency(0.0))
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 5.0
+    seed: int = 7
+
+
+class SwapiEmulator:
+    """
+    Serve o dataset de `bench.fixtures` com a semântica de paginação/busca da SWAPI:
+    - listagens em páginas de 10 com count/next/previous
+    - `search` case-insensitive em name/title
+    - 404 para página fora do range e para id inexistente
+
+    Uso:
+        with SwapiEmulator(faults=FaultConfig(rate_429=0.01)) as emu:
+            client = SwapiClient(base_url=emu.base_url)
+    """
+
+    def __init__(self, *, host: str = "127.0.0.1", port: int = 0, faults: FaultConfig | None = None) -> None:
+        self.faults = faults or FaultConfig()
+        self._rng = random.Random(self.faults.seed)
+        self._rng_lock = threading.Lock()
+        self._calls = 0
+        self._calls_lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self.base_url = f"http://{host}:{self._server.server_address[1]}/api"
+        self.data = build_dataset(self.base_url)
+        self._thread: threading.Thread | None = None
+
+    # ---------- ciclo de vida ----------
+    def start(self) -> "SwapiEmulator":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="swapi-emulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "SwapiEmulator":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # ---------- contadores ----------
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    def reset_calls(self) -> None:
+        with self._calls_lock:
+            self._calls = 0
+
+    # ---------- semântica SWAPI ----------
+    def _list(self, resource: str, query: dict[str, list[str]]) -> tuple[int, dict[str, Any]]:
+        items = [self.data[resource][i] for i in sorted(self.data[resource])]
+
+        search = (query.get("search") or [""])[0].strip().lower()
+        if search:
+            items = [it for it in items if search in str(it.get("name") or it.get("title") or "").lower()]
+
+        try:
+            page = int((query.get("page") or ["1"])[0])
+        except ValueError:
+            return 404, {"detail": "Not found"}
+
+        count = len(items)
+        last = max(1, (count + PAGE_SIZE - 1) // PAGE_SIZE)
+        if page < 1 or page > last:
+            return 404, {"detail": "Not found"}
+
+        def page_url(p: int) -> str:
+            extra = f"&search={quote(search)}" if search else ""
+            return f"{self.base_url}/{resource}/?page={p}{extra}"
+
+        start = (page - 1) * PAGE_SIZE
+        return 200, {
+            "count": count,
+            "next": page_url(page + 1) if page < last else None,
+            "previous": page_url(page - 1) if page > 1 else None,
+            "results": items[start : start + PAGE_SIZE],
+        }
+
+    def route(self, path: str, query: dict[str, list[str]]) -> tuple[int, dict[str, Any]]:
+        m = _DETAIL_RE.match(path)
+        if m and m.group("resource") in self.data:
+            item = self.data[m.group("resource")].get(int(m.group("id")))
+            return (200, item) if item is not None else (404, {"detail": "Not found"})
+
+        m = _LIST_RE.match(path)
+        if m and m.group("resource") in self.data:
+            return self._list(m.group("resource"), query)
+
+        return 404, {"detail": "Not found"}
+
+    def _fault(self) -> tuple[float, int | None]:
+        f = self.faults
+        with self._rng_lock:
+            delay = max(0.0, f.latency(self._rng))
+            if self._rng.random() < f.timeout_rate:
+                return f.timeout_seconds, None
+            if self._rng.random() < f.rate_429:
+                return delay, 429
+            if self._rng.random() < f.rate_5xx:
+                return delay, 503
+        return delay, None
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        emulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, como a SWAPI real
+
+            def do_GET(self) -> None:  # noqa: N802 - API do http.server
+                with emulator._calls_lock:
+                    emulator._calls += 1
+
+                delay, forced_status = emulator._fault()
+                if delay:
+                    time.sleep(delay)
+
+                if forced_status is not None:
+                    status, payload = forced_status, {"detail": "injected"}
+                else:
+                    parts = urlsplit(self.path)
+                    status, payload = emulator.route(parts.path, parse_qs(parts.query))
+
+                body = json.dumps(payload).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # client desistiu (timeout) antes da resposta
+                    pass
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+        return Handler
@@ -0,0 +1,167 @@
+# src/app/admission.py
+# Controle de admissão adaptativo na fronteira do Router (AIMD sobre latência).
+#
+# Quando a SWAPI fica lenta, cada request aceito prende uma thread esperando o
+# upstream; aceitar mais só aumenta a fila e a latência de todo mundo. Aqui o
+# limite de requests simultâneos se ajusta sozinho:
+# - aumento aditivo: com a latência suavizada (EMA) até `tolerance` × a mínima
+#   observada e o limite em uso, cada request concluído soma 1/limit
+#   (~ +1 por "janela" de `limit` requests)
+# - queda multiplicativa: EMA acima da tolerância ou falha upstream (502/504)
+#   multiplica o limite por `backoff` (no máximo 1× por `cooldown`)
+# Só requests que foram ao upstream alimentam a latência: hit de cache é rápido
+# por não esperar a SWAPI e derrubaria a "mínima" de referência.
+# Acima do limite o request volta na hora com 503 + Retry-After.
+#
+# Prioridade: rotas baratas (`/health`, `/metrics`, `/admin/hot*`) nem passam pelo limiter;
+# requests cuja última execução foi servida inteira de cache (0 chamadas
+# upstream) entram pela faixa prioritária, que passa do limite em até
+# `priority_lane` requests simultâneos (a entrada de cache pode ter expirado).
+#
+# Streaming (NDJSON do /export): o lease só é devolvido quando o corpo termina,
+# então o request conta no limite o stream inteiro; a duração dele não vira
+# amostra de latência (cresce com o tamanho da coleção, não com a lentidão da SWAPI).
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping
+
+from observability import metrics
+
+# rotas baratas (sem upstream) e operacionais: precisam responder justamente sob sobrecarga
+BYPASS_ROUTES = frozenset(
+    {"/health", "/health/ready", "/metrics", "/admin/hot", "/admin/hot/manifest", "/admin/hot/pin"}
+)
+# chaves lembradas como "servidas de cache" (LRU)
+CACHED_KEYS = 1024
+
+
+@dataclass
+class AdaptiveLimiter:
+    initial_limit: float = 20.0
+    min_limit: float = 2.0
+    max_limit: float = 200.0
+    backoff: float = 0.9
+    tolerance: float = 2.0
+    # latência mínima é reavaliada a cada `probe_every` amostras (SWAPI pode ficar mais rápida/lenta de vez)
+    probe_every: int = 500
+    cooldown: float = 1.0
+    # requests da faixa prioritária admitidos acima do limite ao mesmo tempo
+    priority_lane: int = 8
+    now_fn: Callable[[], float] = time.monotonic
+
+    limit: float = field(default=0.0, init=False)
+    inflight: int = field(default=0, init=False)
+    priority_inflight: int = field(default=0, init=False)
+    _min_latency: float = field(default=math.inf, init=False, repr=False)
+    _window_min: float = field(default=math.inf, init=False, repr=False)
+    _samples: int = field(default=0, init=False, repr=False)
+    _ema: float = field(default=0.0, init=False, repr=False)
+    _last_drop: float = field(default=-math.inf, init=False, repr=False)
+    _cached: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.limit = self.initial_limit
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> AdaptiveLimiter | None:
+        """ADMISSION=off desliga; ADMISSION_INITIAL/MIN/MAX ajustam o limite, ADMISSION_PRIORITY_LANE a faixa."""
+        if environ.get("ADMISSION", "on").strip().lower() in ("0", "off", "false", "no"):
+            return None
+        return cls(
+            initial_limit=float(environ.get("ADMISSION_INITIAL", "20")),
+            min_limit=float(environ.get("ADMISSION_MIN", "2")),
+            max_limit=float(environ.get("ADMISSION_MAX", "200")),
+            priority_lane=int(environ.get("ADMISSION_PRIORITY_LANE", "8")),
+        )
+
+    # ---------- admissão ----------
+    def bypass(self, template: str) -> bool:
+        return template in BYPASS_ROUTES
+
+    def try_acquire(self, key: str) -> Lease | None:
+        """Lease para o request (ou None = rejeitar); chaves servidas de cache furam o limite."""
+        with self._lock:
+            priority = key in self._cached
+            over = self.inflight >= int(self.limit)
+            if over and (not priority or self.priority_inflight >= self.priority_lane):
+                metrics.ADMISSION_REJECTED.inc()
+                return None
+            self.inflight += 1
+            if over:
+                self.priority_inflight += 1
+        return Lease(self, key, priority, time.perf_counter(), over_limit=over)
+
+    def _release(self, lease: Lease, *, ok: bool, upstream_calls: int | None, streamed: bool = False) -> None:
+        latency = time.perf_counter() - lease.started
+        with self._lock:
+            self.inflight -= 1
+            if lease.over_limit:
+                self.priority_inflight -= 1
+            if upstream_calls is not None:
+                self._remember(lease.key, cached=upstream_calls == 0)
+            if lease.priority or upstream_calls == 0 or streamed:
+                return  # não diz nada sobre a capacidade do upstream
+            self._observe(latency, ok)
+
+    def _remember(self, key: str, *, cached: bool) -> None:
+        if cached:
+            self._cached[key] = None
+            self._cached.move_to_end(key)
+            if len(self._cached) > CACHED_KEYS:
+                self._cached.popitem(last=False)
+        else:
+            self._cached.pop(key, None)
+
+    def _observe(self, latency: float, ok: bool) -> None:
+        self._samples += 1
+        self._ema = latency if self._samples == 1 else 0.9 * self._ema + 0.1 * latency
+        self._window_min = min(self._window_min, latency)
+        self._min_latency = min(self._min_latency, latency)
+        if self._samples % self.probe_every == 0:
+            self._min_latency, self._window_min = self._window_min, math.inf
+
+        if not ok or self._ema > self.tolerance * self._min_latency:
+            now = self.now_fn()
+            if now - self._last_drop >= self.cooldown:
+                self._last_drop = now
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif self.inflight + 1 >= self.limit / 2:
+            # só cresce quando o limite está de fato em uso
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    def retry_after(self) -> int:
+        """Segundos sugeridos ao cliente rejeitado: ~latência média atual, mínimo 1."""
+        return max(1, math.ceil(self._ema))
+
+    def state(self) -> dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "priority_inflight": self.priority_inflight,
+            "min_latency_ms": None if math.isinf(self._min_latency) else round(self._min_latency * 1000, 2),
+            "ema_latency_ms": round(self._ema * 1000, 2),
+            "cached_keys": len(self._cached),
+        }
+
+
+@dataclass
+class Lease:
+    limiter: AdaptiveLimiter
+    key: str
+    priority: bool
+    started: float
+    # admitido pela faixa prioritária acima do limite (ocupa vaga de `priority_lane`)
+    over_limit: bool = False
+
+    def release(self, *, status: int, upstream_calls: int | None = None, streamed: bool = False) -> None:
+        # 502/504: upstream falhou/estourou tempo -> sinal de sobrecarga
+        self.limiter._release(
+            self, ok=status not in (502, 504), upstream_calls=upstream_calls, streamed=streamed
+        )
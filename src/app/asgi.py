@@ -0,0 +1,126 @@
+# src/app/asgi.py
+# Entrypoint ASGI (Starlette) em volta do mesmo Router do `app.main.main`.
+#
+# O entrypoint WSGI (functions-framework) prende uma thread do servidor por
+# request enquanto ela espera a SWAPI. Aqui o servidor (uvicorn) só ocupa o
+# event loop: handlers `async def` rodam nele e os síncronos (httpx.Client)
+# vão para o threadpool do anyio, cujo limite é ASGI_THREADS (default 200)
+# em vez dos poucos threads de um worker WSGI.
+#
+# Mesmo contrato do main(): CORS/preflight, x-request-id, envelope JSON,
+# compressão negociada, Server-Timing, log estruturado e métricas.
+#
+# Uso:
+#   PYTHONPATH=src uvicorn app.asgi:app --workers 4 --port 8080
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from typing import Any, AsyncIterator
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from app.compression import encode_body
+from app.main import _cors_headers, _finish_request, _get_router, _new_request_id, _new_timings
+from clients import fair_queue
+from observability import timing
+from observability.timing import RequestTimings
+
+DEFAULT_THREADS = 200
+
+
+def _dumps(payload: Any) -> bytes:
+    # mesmo formato do jsonify() do Flask fora de debug: chaves ordenadas, compacto, "\n" final
+    return (json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str) + "\n").encode()
+
+
+async def _json_body(request: Request) -> Any:
+    # equivalente ao request.get_json(silent=True): só com Content-Type JSON, None se inválido
+    if "json" not in request.headers.get("content-type", ""):
+        return None
+    raw = await request.body()
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+async def endpoint(request: Request) -> Response:
+    origin = request.headers.get("origin")
+
+    # Preflight CORS
+    if request.method == "OPTIONS":
+        return Response(status_code=204, headers=_cors_headers(origin))
+
+    timings = _new_timings(request.url.path, request.url.query)
+    request_id = request.headers.get("x-request-id") or _new_request_id()
+    # contextvar copiado para o threadpool: o fan-out do handler conta para a x-api-key
+    with timing.activate(timings), fair_queue.activate(request.headers.get("x-api-key")):
+        status, resp = await _handle(request, origin, request_id, timings)
+
+    resp.headers["Server-Timing"] = timings.server_timing()
+    _finish_request(
+        timings,
+        request_id=request_id,
+        method=request.method,
+        path=request.url.path,
+        query=request.url.query,
+        status=status,
+    )
+    return resp
+
+
+async def _handle(
+    request: Request, origin: str | None, request_id: str, timings: RequestTimings
+) -> tuple[int, Response]:
+    router = _get_router()
+
+    status, payload, headers = await router.dispatch_async(
+        method=request.method,
+        path=request.url.path,
+        query=dict(request.query_params),
+        headers=dict(request.headers),
+        body=await _json_body(request),
+        request_id=request_id,
+        run_sync=run_in_threadpool,
+    )
+
+    # headers do handler + CORS
+    merged = dict(headers or {})
+    merged.update(_cors_headers(origin))
+
+    # streaming (ex.: NDJSON de /export): iterador síncrono consumido no threadpool
+    if not isinstance(payload, dict):
+        return status, StreamingResponse(payload, status_code=status, headers=merged)
+
+    with timings.span("serialize"):
+        body, encoding = encode_body(_dumps(payload), request.headers.get("accept-encoding"))
+    if encoding is not None:
+        merged["Content-Encoding"] = encoding
+    merged["Vary"] = "Origin, Accept-Encoding"
+    return status, Response(body, status_code=status, headers=merged)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: Starlette) -> AsyncIterator[None]:
+    import anyio.to_thread
+
+    # handlers síncronos esperando a SWAPI ocupam um token cada
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = int(os.environ.get("ASGI_THREADS", str(DEFAULT_THREADS)))
+    # router (client, caches) nasce antes do 1º request, fora do event loop
+    await run_in_threadpool(_get_router)
+    yield
+
+
+app = Starlette(
+    routes=[Route("/{path:path}", endpoint, methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])],
+    lifespan=lifespan,
+)
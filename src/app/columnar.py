@@ -0,0 +1,321 @@
+# src/app/columnar.py
+# Filtro/ordenação colunar sobre coleções SWAPI inteiras mantidas em memória.
+#
+# Cada recurso vira um `ColumnStore`: colunas numéricas em array('d') com
+# máscara de nulos (bytearray 0/1), colunas texto normalizadas (lower) e os
+# registros originais. Predicados produzem máscaras inteiras de uma vez
+# (map/operator em C, AND via int.from_bytes) em vez de testar dict a dict.
+from __future__ import annotations
+
+import math
+import operator
+import re
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from itertools import compress, repeat
+from typing import Any, Callable, Mapping
+
+from app.concurrency import run_bounded
+from clients.swapi import SwapiClient
+
+UPSTREAM_PAGE_SIZE = 10
+MAX_CLAUSES = 10
+
+# campos que a SWAPI devolve como texto numérico ("1,000", "unknown", "n/a")
+NUMERIC_FIELDS: dict[str, tuple[str, ...]] = {
+    "films": ("episode_id",),
+    "people": ("height", "mass"),
+    "planets": ("rotation_period", "orbital_period", "diameter", "surface_water", "population"),
+    "starships": (
+        "cost_in_credits",
+        "length",
+        "max_atmosphering_speed",
+        "crew",
+        "passengers",
+        "cargo_capacity",
+        "hyperdrive_rating",
+        "MGLT",
+    ),
+}
+
+# campos que o `search=` da SWAPI olha; `q` no modo colunar segue o mesmo contrato
+SEARCH_FIELDS: dict[str, tuple[str, ...]] = {
+    "films": ("title",),
+    "people": ("name",),
+    "planets": ("name",),
+    "starships": ("name", "model"),
+}
+
+# `campo<op>valor`; ops de 2 chars antes dos de 1
+_CLAUSE_RE = re.compile(r"^(?P<field>[A-Za-z_][A-Za-z0-9_]*)(?P<op>>=|<=|!=|[:=~<>])(?P<value>.*)$")
+_NUM_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+
+class FilterError(ValueError):
+    pass
+
+
+def parse_number(value: Any) -> float | None:
+    """'1,000' -> 1000.0; 'unknown'/'n/a'/'' -> None; número já numérico passa direto."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    s = value.strip().replace(",", "")
+    if not _NUM_RE.match(s):
+        return None
+    return float(s)
+
+
+@dataclass(frozen=True)
+class Clause:
+    field: str
+    op: str
+    value: str
+
+
+@dataclass(frozen=True)
+class SortKey:
+    field: str
+    descending: bool
+
+
+def parse_filter(raw: str | None) -> tuple[Clause, ...]:
+    """
+    `filter=climate:arid,population>1000000,name~sky`
+    - `:`/`=` igualdade (texto: case-insensitive; em listas "temperate, arid" casa qualquer item)
+    - `!=`, `~` (contém), `>`, `>=`, `<`, `<=` (só campos numéricos)
+    """
+    if raw is None or str(raw).strip() == "":
+        return ()
+    parts = [p.strip() for p in str(raw).split(",") if p.strip()]
+    if len(parts) > MAX_CLAUSES:
+        raise FilterError(f"filter accepts at most {MAX_CLAUSES} clauses")
+    out = []
+    for part in parts:
+        m = _CLAUSE_RE.match(part)
+        if m is None:
+            raise FilterError(f"invalid filter clause: {part}")
+        op = "=" if m.group("op") == ":" else m.group("op")
+        out.append(Clause(field=m.group("field"), op=op, value=m.group("value").strip()))
+    return tuple(out)
+
+
+def parse_sort(raw: str | None) -> tuple[SortKey, ...]:
+    """`sort=-population,name` (prefixo `-` = decrescente)."""
+    if raw is None or str(raw).strip() == "":
+        return ()
+    keys = []
+    for part in (p.strip() for p in str(raw).split(",")):
+        if not part:
+            continue
+        desc = part.startswith("-")
+        name = part[1:] if desc else part
+        if not re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", name):
+            raise FilterError(f"invalid sort field: {part}")
+        keys.append(SortKey(field=name, descending=desc))
+    if len(keys) > MAX_CLAUSES:
+        raise FilterError(f"sort accepts at most {MAX_CLAUSES} fields")
+    return tuple(keys)
+
+
+def _and(a: bytearray, b: bytearray) -> bytearray:
+    # AND byte a byte em C: máscaras 0/1 viram inteiros grandes
+    n = len(a)
+    return bytearray((int.from_bytes(a, "little") & int.from_bytes(b, "little")).to_bytes(n, "little"))
+
+
+_NUM_OPS: dict[str, Callable[[float, float], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+class ColumnStore:
+    def __init__(self, resource: str, rows: list[dict[str, Any]]) -> None:
+        self.resource = resource
+        self.rows = rows
+        self.size = len(rows)
+        self.numeric: dict[str, tuple[array, bytearray]] = {}
+        self.text: dict[str, list[str]] = {}
+
+        for name in NUMERIC_FIELDS.get(resource, ()):
+            values = array("d", bytes(8 * self.size))
+            valid = bytearray(self.size)
+            for i, row in enumerate(rows):
+                n = parse_number(row.get(name))
+                if n is not None:
+                    values[i] = n
+                    valid[i] = 1
+            self.numeric[name] = (values, valid)
+
+        if rows:
+            numeric = set(self.numeric)
+            for name, sample in rows[0].items():
+                if name in numeric or isinstance(sample, (list, dict)):
+                    continue
+                self.text[name] = [str(r.get(name) if r.get(name) is not None else "").lower() for r in rows]
+
+    @property
+    def fields(self) -> list[str]:
+        return sorted({*self.numeric, *self.text})
+
+    # ---------- filtro ----------
+    def mask(self, clause: Clause) -> bytearray:
+        if clause.field in self.numeric:
+            values, valid = self.numeric[clause.field]
+            op = _NUM_OPS.get(clause.op)
+            if op is None:
+                raise FilterError(f"operator {clause.op} not supported for numeric field {clause.field}")
+            target = parse_number(clause.value)
+            if target is None:
+                raise FilterError(f"{clause.field} expects a number")
+            return _and(bytearray(map(op, values, repeat(target, self.size))), valid)
+
+        col = self.text.get(clause.field)
+        if col is None:
+            raise FilterError(f"unknown filter field: {clause.field}")
+        needle = clause.value.lower()
+        if clause.op == "~":
+            return bytearray(needle in v for v in col)
+        if clause.op in ("=", "!="):
+            hit = bytearray(v == needle or needle in _tokens(v) for v in col)
+            return hit if clause.op == "=" else bytearray(1 - b for b in hit)
+        raise FilterError(f"operator {clause.op} not supported for text field {clause.field}")
+
+    def search(self, q: str) -> bytearray:
+        """Máscara do `q`: substring case-insensitive em qualquer campo de busca."""
+        needle = q.lower()
+        hit = 0
+        for name in SEARCH_FIELDS.get(self.resource, ("name",)):
+            col = self.text.get(name)
+            if col is not None:
+                hit |= int.from_bytes(bytearray(needle in v for v in col), "little")
+        return bytearray(hit.to_bytes(self.size, "little"))
+
+    def select(self, clauses: tuple[Clause, ...], *, q: str | None = None) -> list[int]:
+        masks = [self.mask(c) for c in clauses]
+        if q:
+            masks.append(self.search(q))
+        if not masks:
+            return list(range(self.size))
+        m = masks[0]
+        for other in masks[1:]:
+            m = _and(m, other)
+        return list(compress(range(self.size), m))
+
+    # ---------- ordenação ----------
+    def order(self, indices: list[int], keys: tuple[SortKey, ...]) -> list[int]:
+        """Ordenação estável multi-chave (da última para a primeira); nulos sempre no fim."""
+        out = indices
+        for key in reversed(keys):
+            if key.field in self.numeric:
+                values, valid = self.numeric[key.field]
+                out = sorted(out, key=values.__getitem__, reverse=key.descending)
+                out = sorted(out, key=lambda i, v=valid: 1 - v[i])  # estável: nulos para o fim
+            elif key.field in self.text:
+                out = sorted(out, key=self.text[key.field].__getitem__, reverse=key.descending)
+            else:
+                raise FilterError(f"unknown sort field: {key.field}")
+        return out
+
+    def query(self, clauses: tuple[Clause, ...], keys: tuple[SortKey, ...], *, q: str | None = None) -> list[int]:
+        idx = self.select(clauses, q=q)
+        return self.order(idx, keys) if keys else idx
+
+    def page(
+        self,
+        spec: QuerySpec,
+        *,
+        q: str | None,
+        page: int,
+        page_size: int,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """(janela de registros, total exato de matches) — mesmo contrato de `fetch_window`."""
+        idx = self.query(spec.clauses, spec.sort, q=q)
+        start = (page - 1) * page_size
+        return [self.rows[i] for i in idx[start : start + page_size]], len(idx)
+
+
+def _tokens(value: str) -> list[str]:
+    # "temperate, arid" -> ["temperate", "arid"]
+    return [t.strip() for t in value.split(",")] if "," in value else []
+
+
+def fetch_collection(client: SwapiClient, resource: str, *, max_workers: int = 8) -> list[dict[str, Any]]:
+    """Coleção inteira: página 1 dá o `count`; as demais em paralelo (passam pelo cache de páginas)."""
+    path = f"{resource}/"
+    first = client.get(path, params={"page": 1})
+    rows = list(first.get("results") or [])
+    count = int(first.get("count") or len(rows))
+    last = max(1, math.ceil(count / UPSTREAM_PAGE_SIZE))
+    if last > 1 and first.get("next", True):
+        pages = run_bounded(
+            lambda p: client.get(path, params={"page": int(p)}),
+            [str(p) for p in range(2, last + 1)],
+            max_workers=min(max_workers, last - 1),
+        )
+        for data in pages:
+            rows.extend(data.get("results") or [])
+    return rows
+
+
+@dataclass
+class ColumnarCache:
+    """Um `ColumnStore` por recurso, reconstruído depois de `ttl_seconds`."""
+
+    client: SwapiClient
+    ttl_seconds: float = 300.0
+    now_fn: Callable[[], float] = time.monotonic
+    _stores: dict[str, tuple[float, ColumnStore]] = field(default_factory=dict, init=False, repr=False)
+    _locks: dict[str, threading.Lock] = field(default_factory=dict, init=False, repr=False)
+    _guard: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def put(self, resource: str, rows: list[dict[str, Any]]) -> ColumnStore:
+        """Monta o store a partir de registros já carregados (ex.: snapshot do modo pre-fork)."""
+        store = ColumnStore(resource, rows)
+        self._stores[resource] = (self.now_fn(), store)
+        return store
+
+    def get(self, resource: str) -> ColumnStore:
+        hit = self._stores.get(resource)
+        if hit is not None and self.now_fn() - hit[0] <= self.ttl_seconds:
+            return hit[1]
+
+        with self._guard:
+            lock = self._locks.setdefault(resource, threading.Lock())
+        # um build por recurso de cada vez; quem chega junto espera e reaproveita
+        with lock:
+            hit = self._stores.get(resource)
+            if hit is not None and self.now_fn() - hit[0] <= self.ttl_seconds:
+                return hit[1]
+            store = ColumnStore(resource, fetch_collection(self.client, resource))
+            self._stores[resource] = (self.now_fn(), store)
+            return store
+
+
+@dataclass(frozen=True)
+class QuerySpec:
+    clauses: tuple[Clause, ...]
+    sort: tuple[SortKey, ...]
+    raw: dict[str, str]
+
+    def query(self) -> dict[str, str]:
+        """Params que precisam sobreviver em self/next/prev (extra do build_links)."""
+        return dict(self.raw)
+
+
+def parse_query(query: Mapping[str, Any]) -> QuerySpec | None:
+    """None quando o request não usa filter/sort (handlers seguem o caminho por janela)."""
+    raw = {k: str(query[k]) for k in ("filter", "sort") if query.get(k)}
+    if not raw:
+        return None
+    return QuerySpec(clauses=parse_filter(raw.get("filter")), sort=parse_sort(raw.get("sort")), raw=raw)
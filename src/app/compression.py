@@ -0,0 +1,76 @@
+# src/app/compression.py
+from __future__ import annotations
+
+import gzip
+
+try:  # brotli é opcional: sem o pacote, negociamos só gzip
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+# Abaixo disso o overhead do header/CPU não compensa (envelopes de erro, /health)
+MIN_COMPRESS_BYTES = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # respostas dinâmicas: qualidade média é bem mais barata que 11
+
+
+def _supported() -> tuple[str, ...]:
+    # ordem = preferência do servidor quando o cliente aceita ambos com o mesmo q
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Escolhe o encoding a partir do header Accept-Encoding (com q-values).
+    Retorna None quando nada suportado é aceito (resposta sem compressão).
+    """
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        name = token.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best: str | None = None
+    best_q = 0.0
+    for enc in _supported():
+        q = weights.get(enc, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # mtime=0: mesma entrada => mesmos bytes (ETag/cache estáveis)
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+def encode_body(body: bytes, accept_encoding: str | None) -> tuple[bytes, str | None]:
+    """
+    Comprime o corpo se o cliente aceitar e o tamanho passar do limiar.
+    Retorna (bytes, encoding|None).
+    """
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return body, None
+
+    return compress(body, encoding), encoding
@@ -1,9 +1,12 @@
 # src/app/concurrency.py
 from __future__ import annotations
 
+import contextvars
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Callable, Iterable, TypeVar
 
+from observability import metrics, timing
+
 T = TypeVar("T")
 
 
@@ -16,6 +19,9 @@ def run_bounded(
     """
     Executa fn(item) em paralelo, com limite de threads.
     Mantém a ordem original de 'items' no retorno.
+
+    Cada tarefa roda numa cópia do contexto do chamador (spans do request
+    continuam visíveis nas threads); `fanout` mede o wall time do lote.
     """
     items_list = list(items)
     if not items_list:
@@ -23,10 +29,21 @@ def run_bounded(
 
     results: list[T | None] = [None] * len(items_list)
 
-    with ThreadPoolExecutor(max_workers=max_workers) as ex:
-        future_map = {ex.submit(fn, url): idx for idx, url in enumerate(items_list)}
-        for fut in as_completed(future_map):
-            idx = future_map[fut]
-            results[idx] = fut.result()
+    metrics.FANOUT_WIDTH.observe(len(items_list))
+    metrics.FANOUT_PENDING.inc(n=len(items_list))
+    remaining = len(items_list)
+    try:
+        with timing.span("fanout"), ThreadPoolExecutor(max_workers=max_workers) as ex:
+            future_map = {
+                ex.submit(contextvars.copy_context().run, fn, url): idx for idx, url in enumerate(items_list)
+            }
+            for fut in as_completed(future_map):
+                remaining -= 1
+                metrics.FANOUT_PENDING.dec()
+                idx = future_map[fut]
+                results[idx] = fut.result()
+    finally:
+        # erro no meio do lote: o que sobrou não fica contando como pendente
+        metrics.FANOUT_PENDING.dec(n=remaining)
 
     return [r for r in results if r is not None]
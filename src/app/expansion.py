@@ -0,0 +1,146 @@
+# src/app/expansion.py
+# `expand=homeworld,films`: embute recursos relacionados na própria resposta.
+#
+# Sem isso o consumidor de /people faz 1 request por homeworld/film/species
+# de cada item (N+1 pelo gateway). Aqui as URLs referenciadas pela página
+# inteira são coletadas, deduplicadas pela forma canônica e resolvidas num
+# único fan-out limitado via `get_by_url` (cache por URL); cada URL vira o
+# registro relacionado em forma compacta (id + URLs aninhadas como ids);
+# referência quebrada (404) continua como URL.
+#
+# Profundidade fixa em 1: o objeto embutido não é expandido de novo
+# (`expand=homeworld.residents` é rejeitado) e MAX_EXPAND_URLS limita o lote.
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from app.concurrency import run_bounded
+from app.projection import Projection, apply_projection
+from clients import urls
+from clients.swapi import SwapiClient, SwapiNotFound
+from clients.utils import attach_id
+from observability.timing import timed
+
+MAX_EXPAND = 5
+MAX_EXPAND_URLS = 200
+
+# campos da SWAPI que carregam URL (ou lista de URLs) de outro recurso
+EXPANDABLE = frozenset(
+    {
+        "homeworld",
+        "films",
+        "species",
+        "vehicles",
+        "starships",
+        "characters",
+        "planets",
+        "residents",
+        "pilots",
+        "people",
+    }
+)
+
+_FIELD_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+_COMPACT = Projection(compact=True)
+
+
+class ExpandError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Expansion:
+    fields: tuple[str, ...] = ()
+
+    def query(self) -> dict[str, str]:
+        """Forma canônica para links (campos ordenados)."""
+        return {"expand": ",".join(self.fields)} if self.fields else {}
+
+    def restrict(self, keep: tuple[str, ...] | None) -> Expansion:
+        """Só os campos que sobrevivem ao `fields=` (não resolve o que vai ser descartado)."""
+        if keep is None:
+            return self
+        return Expansion(fields=tuple(f for f in self.fields if f in keep))
+
+
+@timed("validate")
+def parse_expand(query: Mapping[str, Any]) -> Expansion:
+    raw = query.get("expand")
+    if raw is None or str(raw).strip() == "":
+        return Expansion()
+
+    names = {f.strip() for f in str(raw).split(",") if f.strip()}
+    if len(names) > MAX_EXPAND:
+        raise ExpandError(f"expand must have at most {MAX_EXPAND} items")
+    for name in names:
+        if "." in name:
+            raise ExpandError("expand supports depth 1 only")
+        if not _FIELD_RE.match(name) or name not in EXPANDABLE:
+            raise ExpandError(f"field cannot be expanded: {name}")
+    return Expansion(fields=tuple(sorted(names)))
+
+
+def _refs(value: Any) -> list[str]:
+    if isinstance(value, str):
+        return [value] if value.startswith("http") else []
+    if isinstance(value, list):
+        return [v for v in value if isinstance(v, str) and v.startswith("http")]
+    return []
+
+
+def collect_urls(items: list[dict[str, Any]], expansion: Expansion) -> list[str]:
+    """URLs referenciadas pela página inteira, sem repetição (ordem de 1ª aparição, forma canônica)."""
+    seen: dict[str, None] = {}
+    for it in items:
+        for name in expansion.fields:
+            for url in _refs(it.get(name)):
+                seen.setdefault(urls.canonical_url(url), None)
+    return list(seen)
+
+
+@timed("expand")
+def expand_items(
+    client: SwapiClient,
+    items: list[dict[str, Any]],
+    expansion: Expansion,
+    *,
+    max_workers: int = 8,
+) -> list[dict[str, Any]]:
+    """
+    Troca as URLs dos campos de `expansion` pelo registro relacionado (compacto).
+    Referência que a SWAPI não tem (404) fica como a URL original, como o /resolve
+    faz por ref; os demais erros do upstream sobem como no resto do handler
+    (SwapiTimeout etc.).
+    """
+    if not expansion.fields or not items:
+        return items
+
+    wanted = collect_urls(items, expansion)
+    if len(wanted) > MAX_EXPAND_URLS:
+        raise ExpandError(f"expand would resolve {len(wanted)} resources (max {MAX_EXPAND_URLS}); reduce page_size")
+
+    def fetch_one(url: str) -> tuple[str, dict[str, Any] | None]:
+        try:
+            return url, client.get_by_url(url, params=None)
+        except SwapiNotFound:
+            return url, None
+
+    fetched = run_bounded(fetch_one, wanted, max_workers=min(max_workers, max(1, len(wanted))))
+    resolved = {u: apply_projection(attach_id(rec), _COMPACT) for u, rec in fetched if rec is not None}
+
+    def embed(url: str) -> Any:
+        return resolved.get(urls.canonical_url(url), url)
+
+    out = []
+    for it in items:
+        it = dict(it)
+        for name in expansion.fields:
+            value = it.get(name)
+            if isinstance(value, str) and value.startswith("http"):
+                it[name] = embed(value)
+            elif isinstance(value, list):
+                it[name] = [embed(v) if isinstance(v, str) else v for v in value]
+        out.append(it)
+    return out
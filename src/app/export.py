@@ -0,0 +1,109 @@
+# src/app/export.py
+from __future__ import annotations
+
+import contextvars
+import json
+import queue
+import threading
+from typing import Any, Iterable, Iterator
+
+from app.projection import Projection, apply_projection
+from clients.swapi import SwapiClient, SwapiNotFound
+from clients.utils import attach_id
+
+EXPORTABLE_RESOURCES = ("films", "people", "planets", "species", "starships", "vehicles")
+
+# páginas upstream buscadas à frente do writer (memória = prefetch * 10 registros)
+PREFETCH_PAGES = 2
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def iter_upstream_pages(
+    client: SwapiClient,
+    resource: str,
+    *,
+    prefetch: int = PREFETCH_PAGES,
+) -> Iterator[dict[str, Any]]:
+    """
+    Percorre todas as páginas SWAPI de `resource` em uma thread produtora,
+    com fila limitada a `prefetch` páginas (backpressure sobre o upstream).
+
+    Entrega o JSON bruto de cada página. Exceções do upstream são relançadas
+    no consumidor; fechar o gerador encerra a produtora.
+    """
+    q: queue.Queue[Any] = queue.Queue(maxsize=max(1, prefetch))
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        page = 1
+        seen = 0
+        try:
+            while not stop.is_set():
+                try:
+                    data = client.get(resource, params={"page": page})
+                except SwapiNotFound:
+                    # SWAPI responde 404 para página fora do range
+                    if page == 1:
+                        raise
+                    break
+
+                if not put(data):
+                    return
+
+                results = data.get("results") or []
+                seen += len(results)
+                if not results:
+                    break
+                # SWAPI sinaliza a última página com next=null; sem o campo, usa count
+                if "next" in data:
+                    if not data["next"]:
+                        break
+                elif seen >= (data.get("count") or 0):
+                    break
+                page += 1
+        except BaseException as e:  # noqa: BLE001 - repassado ao consumidor
+            put(_Failure(e))
+            return
+        put(_DONE)
+
+    # contexto do request (spans, x-api-key da fila justa) segue para a produtora, como no run_bounded
+    worker = threading.Thread(
+        target=contextvars.copy_context().run, args=(produce,), name=f"export-{resource}", daemon=True
+    )
+    worker.start()
+
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+
+
+def iter_ndjson(pages: Iterable[dict[str, Any]], projection: Projection) -> Iterator[bytes]:
+    """
+    Uma linha JSON por registro (com `id`), aplicando a projeção registro a registro.
+    """
+    for data in pages:
+        for it in data.get("results") or []:
+            record = apply_projection(attach_id(it), projection)
+            yield json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
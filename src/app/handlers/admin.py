@@ -0,0 +1,121 @@
+# src/app/handlers/admin.py
+# Rotas internas (fora do gateway, como /metrics) sobre as chaves quentes.
+# Só existem com ADMIN_TOKEN definido e exigem o mesmo valor em `x-admin-token`:
+# o relatório expõe queries de outros consumidores e o pin desliga TTL.
+from __future__ import annotations
+
+import hmac
+from typing import Any, Callable, Mapping
+
+from app.pagination import build_self_url
+from app.router import RequestContext
+from clients.swapi import SwapiClient
+from observability import heavy_hitters
+from schemas.common import ErrorItem, fail, ok
+
+DEFAULT_TOP = 20
+MAX_TOP = 200
+
+
+def _parse_top(raw: Any) -> int:
+    if raw is None or str(raw).strip() == "":
+        return DEFAULT_TOP
+    s = str(raw).strip()
+    if not s.isdigit() or not 1 <= int(s) <= MAX_TOP:
+        raise ValueError(f"top must be an integer between 1 and {MAX_TOP}")
+    return int(s)
+
+
+def _bad_request(ctx: RequestContext, message: str):
+    status, env = fail(
+        request_id=ctx.headers.get("x-request-id", ""),
+        self_url=build_self_url(ctx.path, ctx.query),
+        status_code=400,
+        errors=[ErrorItem(code="VALIDATION_ERROR", message=message)],
+    )
+    return status, env.model_dump(), {}
+
+
+def _guarded(token: str, handler: Callable[[RequestContext], Any]):
+    expected = token.encode()
+
+    def guarded(ctx: RequestContext):
+        given = (ctx.headers.get("x-admin-token") or "").encode()
+        if not hmac.compare_digest(given, expected):
+            status, env = fail(
+                request_id=ctx.headers.get("x-request-id", ""),
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=401,
+                errors=[ErrorItem(code="UNAUTHORIZED", message="Missing or invalid admin token")],
+            )
+            return status, env.model_dump(), {"Cache-Control": "no-store"}
+        return handler(ctx)
+
+    return guarded
+
+
+def hot_handler(client: SwapiClient, *, token: str):
+    """Top-N de cada tracker (rotas, queries, chaves de cache) + chaves fixadas."""
+
+    def handler(ctx: RequestContext):
+        try:
+            top = _parse_top(ctx.query.get("top"))
+        except ValueError as e:
+            return _bad_request(ctx, str(e))
+
+        report = {name: tracker.snapshot(top) for name, tracker in heavy_hitters.TRACKERS.items()}
+        report["pinned"] = client.pinned()
+        payload = ok(
+            data=report,
+            request_id=ctx.headers.get("x-request-id", ""),
+            self_url=build_self_url(ctx.path, ctx.query),
+        ).model_dump()
+        return 200, payload, {"Cache-Control": "no-store"}
+
+    return _guarded(token, handler)
+
+
+def manifest_handler(*, token: str):
+    """Top-N queries já no formato do warmup_manifest.json (`curl ... > manifest.json`)."""
+
+    def handler(ctx: RequestContext):
+        try:
+            top = _parse_top(ctx.query.get("top"))
+        except ValueError as e:
+            return _bad_request(ctx, str(e))
+        return 200, heavy_hitters.manifest(top), {"Cache-Control": "no-store"}
+
+    return _guarded(token, handler)
+
+
+def pin_handler(client: SwapiClient, *, token: str):
+    """
+    Fixa chaves de cache: `{"top": N}` (as N chaves upstream mais quentes) ou
+    `{"keys": [...]}` (explícitas; lista vazia desfaz). Substitui o conjunto anterior.
+    """
+
+    def handler(ctx: RequestContext):
+        body: Mapping[str, Any] = ctx.body if isinstance(ctx.body, dict) else {}
+        keys = body.get("keys")
+        if keys is not None:
+            if not isinstance(keys, list) or not all(isinstance(k, str) for k in keys):
+                return _bad_request(ctx, "keys must be a list of strings")
+            if len(keys) > MAX_TOP:
+                return _bad_request(ctx, f"keys accepts at most {MAX_TOP} items")
+        else:
+            try:
+                top = _parse_top(body.get("top"))
+            except ValueError as e:
+                return _bad_request(ctx, str(e))
+            keys = [key for key, _ in heavy_hitters.UPSTREAM.top(top)]
+
+        pinned = client.pin(keys)
+        payload = ok(
+            data={"pinned": pinned},
+            request_id=ctx.headers.get("x-request-id", ""),
+            self_url=build_self_url(ctx.path, ctx.query),
+            meta={"count": len(pinned)},
+        ).model_dump()
+        return 200, payload, {"Cache-Control": "no-store"}
+
+    return _guarded(token, handler)
@@ -0,0 +1,107 @@
+# src/app/handlers/export.py
+from __future__ import annotations
+
+import itertools
+import json
+from typing import Any, Iterator
+
+from app.export import EXPORTABLE_RESOURCES, iter_ndjson, iter_upstream_pages
+from app.pagination import build_self_url
+from app.projection import ProjectionError, parse_projection
+from app.router import RequestContext
+from clients.swapi import (
+    SwapiBadResponse,
+    SwapiClient,
+    SwapiError,
+    SwapiNotFound,
+    SwapiTimeout,
+    SwapiUpstreamError,
+)
+from schemas.common import ErrorItem, fail
+
+
+def _guard_stream(lines: Iterator[bytes]) -> Iterator[bytes]:
+    """
+    Depois do primeiro byte o status já foi enviado: erro upstream no meio do
+    stream vira uma última linha `{"error": {...}}` em vez de conexão cortada.
+    """
+    try:
+        yield from lines
+    except SwapiError as e:
+        code = "UPSTREAM_TIMEOUT" if isinstance(e, SwapiTimeout) else "UPSTREAM_ERROR"
+        yield json.dumps({"error": {"code": code, "message": "SWAPI error during export"}}).encode() + b"\n"
+
+
+def export_handler(client: SwapiClient):
+    def handler(ctx: RequestContext):
+        resource = (ctx.path_params.get("resource") or "").lower()
+
+        if resource not in EXPORTABLE_RESOURCES:
+            status, env = fail(
+                request_id=ctx.headers.get("x-request-id", ""),
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=404,
+                errors=[ErrorItem(code="NOT_FOUND", message=f"Unknown resource: {resource}")],
+            )
+            return status, env.model_dump(), {}
+
+        try:
+            projection = parse_projection(ctx.query)
+        except ProjectionError as e:
+            status, env = fail(
+                request_id=ctx.headers.get("x-request-id", ""),
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=400,
+                errors=[ErrorItem(code="VALIDATION_ERROR", message=str(e))],
+            )
+            return status, env.model_dump(), {}
+
+        pages = iter_upstream_pages(client, f"{resource}/")
+
+        # 1ª página síncrona: erros de upstream ainda podem virar status HTTP
+        try:
+            first: dict[str, Any] = next(pages)
+        except StopIteration:
+            first = {"results": []}
+        except SwapiTimeout:
+            status, env = fail(
+                request_id=ctx.headers.get("x-request-id", ""),
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=504,
+                errors=[ErrorItem(code="UPSTREAM_TIMEOUT", message="SWAPI timeout")],
+            )
+            return status, env.model_dump(), {}
+        except SwapiBadResponse:
+            status, env = fail(
+                request_id=ctx.headers.get("x-request-id", ""),
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=502,
+                errors=[ErrorItem(code="UPSTREAM_BAD_RESPONSE", message="Invalid response from SWAPI")],
+            )
+            return status, env.model_dump(), {}
+        except SwapiNotFound:
+            status, env = fail(
+                request_id=ctx.headers.get("x-request-id", ""),
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=404,
+                errors=[ErrorItem(code="UPSTREAM_NOT_FOUND", message="Resource not found on SWAPI")],
+            )
+            return status, env.model_dump(), {}
+        except SwapiUpstreamError:
+            status, env = fail(
+                request_id=ctx.headers.get("x-request-id", ""),
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=502,
+                errors=[ErrorItem(code="UPSTREAM_ERROR", message="SWAPI error")],
+            )
+            return status, env.model_dump(), {}
+
+        headers = {"Content-Type": "application/x-ndjson"}
+        total = first.get("count")
+        if isinstance(total, int):
+            headers["X-Total-Count"] = str(total)
+
+        body = _guard_stream(iter_ndjson(itertools.chain([first], pages), projection))
+        return 200, body, headers
+
+    return handler
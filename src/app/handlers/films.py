@@ -3,7 +3,10 @@ from __future__ import annotations
 
 from typing import Any
 
+from app.columnar import ColumnarCache, FilterError, parse_query
+from app.expansion import ExpandError, expand_items, parse_expand
 from app.pagination import PaginationError, build_links, build_self_url, parse_pagination
+from app.projection import ProjectionError, parse_projection, project_items
 from app.router import RequestContext
 from clients.swapi import (
     SwapiBadResponse,
@@ -16,13 +19,18 @@ from clients.utils import attach_id
 from schemas.common import ErrorItem, fail, ok
 
 
-def list_films_handler(client: SwapiClient):
+def list_films_handler(client: SwapiClient, *, columns: ColumnarCache | None = None):
+    columns = columns or ColumnarCache(client)
+
     def handler(ctx: RequestContext):
         q = ctx.query.get("q")
 
         try:
             page, page_size = parse_pagination(ctx.query)
-        except PaginationError as e:
+            projection = parse_projection(ctx.query)
+            expansion = parse_expand(ctx.query).restrict(projection.fields)
+            spec = parse_query(ctx.query)
+        except (PaginationError, ProjectionError, FilterError, ExpandError) as e:
             status, env = fail(
                 request_id=ctx.headers.get("x-request-id", ""),
                 self_url=build_self_url(ctx.path, ctx.query),
@@ -36,14 +44,22 @@ def list_films_handler(client: SwapiClient):
             params["search"] = q
 
         try:
-            data = client.get("films/", params=params or None)
-            results = data.get("results", []) or []
-            items_all = [attach_id(it) for it in results]
-
-            total = len(items_all)
-            start = (page - 1) * page_size
-            end = start + page_size
-            items = items_all[start:end]
+            extra = {**projection.query(), **expansion.query()}
+            if spec is not None:
+                window, total = columns.get("films").page(spec, q=q, page=page, page_size=page_size)
+                items = [attach_id(it) for it in window]
+                extra = {**extra, **spec.query()}
+            else:
+                data = client.get("films/", params=params or None)
+                results = data.get("results", []) or []
+                items_all = [attach_id(it) for it in results]
+
+                total = len(items_all)
+                start = (page - 1) * page_size
+                end = start + page_size
+                items = items_all[start:end]
+
+            items = project_items(expand_items(client, items, expansion), projection)
 
             links = build_links(
                 ctx.path,
@@ -51,6 +67,7 @@ def list_films_handler(client: SwapiClient):
                 page_size=page_size,
                 q=q,
                 total=total,
+                extra=extra,
             )
 
             env = ok(
@@ -105,4 +122,14 @@ def list_films_handler(client: SwapiClient):
             )
             return status, env.model_dump(), {}
 
+        except (FilterError, ExpandError) as e:
+            # campo de filter/sort inexistente no recurso; expand que resolveria recursos demais
+            status, env = fail(
+                request_id=ctx.headers.get("x-request-id", ""),
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=400,
+                errors=[ErrorItem(code="VALIDATION_ERROR", message=str(e))],
+            )
+            return status, env.model_dump(), {}
+
     return handler
\ No newline at end of file
@@ -0,0 +1,58 @@
+# src/app/handlers/health.py
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from app.pagination import build_self_url
+from app.router import RequestContext
+from clients.swapi import SwapiClient
+from schemas.common import ErrorItem, ok
+
+
+def ready_handler(client: SwapiClient, *, min_cache_entries: int = 0):
+    """
+    Readiness: 503 até o client ter pelo menos `min_cache_entries` entradas em
+    cache (páginas + itens). Depois de pronto fica pronto (latch): expiração de
+    TTL não derruba a instância do balanceamento.
+    """
+    state = {"ready": min_cache_entries <= 0}
+    lock = threading.Lock()
+
+    def handler(ctx: RequestContext):
+        warmth = client.cache_warmth()
+        entries = sum(info["entries"] for info in warmth.values())
+
+        if not state["ready"] and entries >= min_cache_entries:
+            with lock:
+                state["ready"] = True
+        ready = state["ready"]
+
+        report: dict[str, Any] = {
+            "status": "ready" if ready else "warming",
+            "warmup": {"cache_entries": entries, "threshold": min_cache_entries},
+            "caches": warmth,
+            "pool": client.pool_state(),
+            "id_index": client.id_index_state(),
+            "upstream": client.latency_summary(),
+        }
+
+        payload = ok(
+            data=report,
+            request_id=ctx.headers.get("x-request-id", ""),
+            self_url=build_self_url(ctx.path, ctx.query),
+        ).model_dump()
+
+        if not ready:
+            payload["errors"] = [
+                ErrorItem(
+                    code="NOT_READY",
+                    message="Instance is warming up",
+                    details={"cache_entries": entries, "threshold": min_cache_entries},
+                ).model_dump()
+            ]
+            return 503, payload, {"Retry-After": "5", "Cache-Control": "no-store"}
+
+        return 200, payload, {"Cache-Control": "no-store"}
+
+    return handler
@@ -3,7 +3,10 @@ from __future__ import annotations
 from typing import Any
 
 from app.concurrency import run_bounded
+from app.expansion import ExpandError, expand_items, parse_expand
 from app.pagination import PaginationError, build_links, build_self_url, parse_pagination
+from app.prefetch import Prefetcher
+from app.projection import ProjectionError, parse_projection, project_items
 from app.router import RequestContext
 from clients.swapi import (
     RetryConfig,
@@ -17,9 +20,10 @@ from clients.utils import attach_id
 from schemas.common import ErrorItem, fail, ok
 
 
-def list_planet_residents_handler(client: SwapiClient):
+def list_planet_residents_handler(client: SwapiClient, *, prefetch: Prefetcher | None = None):
     # client "fail-fast" só para o fan-out do correlated endpoint
-    client_fast = SwapiClient(
+    # (perfil do mesmo client: reaproveita pool de conexões e cache por URL)
+    client_fast = client.with_profile(
         timeout=2.0,
         retry=RetryConfig(max_retries=0, backoff_base=0.0, backoff_factor=1.0),
     )
@@ -30,7 +34,9 @@ def list_planet_residents_handler(client: SwapiClient):
 
         try:
             page, page_size = parse_pagination(ctx.query)
-        except PaginationError as e:
+            projection = parse_projection(ctx.query)
+            expansion = parse_expand(ctx.query).restrict(projection.fields)
+        except (PaginationError, ProjectionError, ExpandError) as e:
             status, env = fail(
                 request_id=ctx.headers.get("x-request-id", ""),
                 self_url=build_self_url(ctx.path, ctx.query),
@@ -91,6 +97,22 @@ def list_planet_residents_handler(client: SwapiClient):
                 page_urls,
                 max_workers=workers,
             )
+            items = [attach_id(it) for it in people]
+
+            if q:
+                q_low = q.lower()
+                items = [it for it in items if q_low in str(it.get("name", "")).lower()]
+
+            # 4) expand: URLs da página inteira numa 2ª onda (depth 1)
+            items = expand_items(client_fast, items, expansion)
+        except ExpandError as e:
+            status, env = fail(
+                request_id=ctx.headers.get("x-request-id", ""),
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=400,
+                errors=[ErrorItem(code="VALIDATION_ERROR", message=str(e))],
+            )
+            return status, env.model_dump(), {}
         except SwapiTimeout:
             status, env = fail(
                 request_id=ctx.headers.get("x-request-id", ""),
@@ -108,13 +130,16 @@ def list_planet_residents_handler(client: SwapiClient):
             )
             return status, env.model_dump(), {}
 
-        items = [attach_id(it) for it in people]
+        items = project_items(items, projection)
 
-        if q:
-            q_low = q.lower()
-            items = [it for it in items if q_low in str(it.get("name", "")).lower()]
-
-        links = build_links(ctx.path, page=page, page_size=page_size, q=q, total=total)
+        links = build_links(
+            ctx.path,
+            page=page,
+            page_size=page_size,
+            q=q,
+            total=total,
+            extra={**projection.query(), **expansion.query()},
+        )
 
         env = ok(
             data=items,
@@ -130,6 +155,10 @@ def list_planet_residents_handler(client: SwapiClient):
 
         payload = env.model_dump()
         payload["links"] = links
+
+        # URLs filhas da próxima página do mesmo pai, em background
+        if prefetch is not None and links["next"]:
+            prefetch.urls(urls[end : end + page_size])
         return 200, payload, {}
 
     return handler
@@ -1,9 +1,20 @@
 # src/app/handlers/planets.py
 from __future__ import annotations
 
-from app.pagination import PaginationError, build_links, build_self_url, parse_pagination
+from app.columnar import ColumnarCache, FilterError, parse_query
+from app.expansion import ExpandError, expand_items, parse_expand
+from app.pagination import (
+    PaginationError,
+    build_cursor_links,
+    build_links,
+    build_self_url,
+    parse_cursor,
+    parse_pagination,
+)
+from app.prefetch import Prefetcher
+from app.projection import ProjectionError, parse_projection, project_items
 from app.router import RequestContext
-from app.swapi_window import fetch_window
+from app.swapi_window import fetch_cursor_window, fetch_window
 from clients.swapi import (
     SwapiBadResponse,
     SwapiClient,
@@ -15,13 +26,29 @@ from clients.utils import attach_id
 from schemas.common import ErrorItem, fail, ok
 
 
-def list_planets_handler(client: SwapiClient):
+def list_planets_handler(
+    client: SwapiClient,
+    *,
+    columns: ColumnarCache | None = None,
+    prefetch: Prefetcher | None = None,
+):
+    columns = columns or ColumnarCache(client)
+
     def handler(ctx: RequestContext):
         q = ctx.query.get("q")
+        cursor_token = ctx.query.get("cursor")
 
         try:
             page, page_size = parse_pagination(ctx.query)
-        except PaginationError as e:
+            projection = parse_projection(ctx.query)
+            expansion = parse_expand(ctx.query).restrict(projection.fields)
+            spec = parse_query(ctx.query)
+            cursor = None
+            if cursor_token is not None:
+                if spec is not None:
+                    raise FilterError("cursor cannot be combined with filter/sort")
+                cursor = parse_cursor(str(cursor_token), page=page, page_size=page_size, search=q)
+        except (PaginationError, ProjectionError, FilterError, ExpandError) as e:
             status, env = fail(
                 request_id=ctx.headers.get("x-request-id", ""),
                 self_url=build_self_url(ctx.path, ctx.query),
@@ -31,30 +58,54 @@ def list_planets_handler(client: SwapiClient):
             return status, env.model_dump(), {}
 
         try:
-            window, total = fetch_window(
-                client,
-                "planets/",
-                page=page,
-                page_size=page_size,
-                search=q,
-            )
+            next_cursor = None
+            extra = {**projection.query(), **expansion.query()}
+            if spec is not None:
+                # filter/sort: coleção inteira em colunas; total exato de matches
+                window, total = columns.get("planets").page(spec, q=q, page=page, page_size=page_size)
+                extra = {**extra, **spec.query()}
+            elif cursor is not None:
+                window, total, next_cursor = fetch_cursor_window(
+                    client,
+                    "planets/",
+                    cursor=cursor,
+                    page_size=page_size,
+                )
+            else:
+                window, total = fetch_window(
+                    client,
+                    "planets/",
+                    page=page,
+                    page_size=page_size,
+                    search=q,
+                )
 
-            items = [attach_id(it) for it in window]
+            items = project_items(expand_items(client, [attach_id(it) for it in window], expansion), projection)
 
-            links = build_links(
-                ctx.path,
-                page=page,
-                page_size=page_size,
-                q=q,
-                total=total,
-            )
+            if cursor is not None:
+                links = build_cursor_links(
+                    ctx.path,
+                    cursor=cursor,
+                    next_cursor=next_cursor,
+                    page_size=page_size,
+                    extra={**projection.query(), **expansion.query()},
+                )
+            else:
+                links = build_links(
+                    ctx.path,
+                    page=page,
+                    page_size=page_size,
+                    q=q,
+                    total=total,
+                    extra=extra,
+                )
 
             env = ok(
                 data=items,
                 request_id=ctx.headers.get("x-request-id", ""),
                 self_url=links["self"],
                 meta={
-                    "page": page,
+                    "page": page if cursor is None else None,
                     "page_size": page_size,
                     "count": len(items),
                     "total": total,
@@ -63,6 +114,10 @@ def list_planets_handler(client: SwapiClient):
 
             payload = env.model_dump()
             payload["links"] = links
+
+            # próxima janela sequencial em background (cursor/filter não seguem page + 1)
+            if prefetch is not None and spec is None and cursor is None and links["next"]:
+                prefetch.window("planets/", page=page + 1, page_size=page_size, search=q)
             return 200, payload, {}
 
         except SwapiTimeout:
@@ -101,4 +156,15 @@ def list_planets_handler(client: SwapiClient):
             )
             return status, env.model_dump(), {}
 
+        except (PaginationError, FilterError, ExpandError) as e:
+            # cursor emitido sobre um snapshot upstream diferente; campo de filter/sort inexistente;
+            # expand que resolveria recursos demais
+            status, env = fail(
+                request_id=ctx.headers.get("x-request-id", ""),
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=400,
+                errors=[ErrorItem(code="VALIDATION_ERROR", message=str(e))],
+            )
+            return status, env.model_dump(), {}
+
     return handler
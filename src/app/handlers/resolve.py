@@ -0,0 +1,174 @@
+# src/app/handlers/resolve.py
+from __future__ import annotations
+
+from typing import Any
+
+from app.concurrency import run_bounded
+from app.pagination import build_self_url
+from app.projection import ProjectionError, apply_projection, parse_projection
+from app.router import RequestContext
+from clients.swapi import (
+    RetryConfig,
+    SwapiBadResponse,
+    SwapiClient,
+    SwapiNotFound,
+    SwapiTimeout,
+    SwapiUpstreamError,
+)
+from clients.utils import InvalidSwapiUrl, attach_id, parse_ref
+from schemas.common import ErrorItem, fail, ok
+
+MAX_REFS = 50  # mesmo teto do page_size das listagens
+
+
+def _collect_refs(ctx: RequestContext) -> list[str]:
+    """
+    Lê as referências de `?refs=a,b,c` (GET) ou de `{"refs": [...]}` (POST).
+    Mantém a ordem e remove duplicatas exatas.
+    """
+    raw: list[Any] = []
+
+    body = ctx.body
+    if isinstance(body, dict) and isinstance(body.get("refs"), list):
+        raw.extend(body["refs"])
+
+    q_refs = ctx.query.get("refs")
+    if isinstance(q_refs, str):
+        raw.extend(q_refs.split(","))
+
+    refs: list[str] = []
+    seen: set[str] = set()
+    for r in raw:
+        s = str(r).strip() if r is not None else ""
+        if not s or s in seen:
+            continue
+        seen.add(s)
+        refs.append(s)
+    return refs
+
+
+def resolve_handler(client: SwapiClient):
+    # client "fail-fast" para o fan-out (mesma política dos correlacionados)
+    # (perfil do mesmo client: reaproveita pool de conexões e cache por URL)
+    client_fast = client.with_profile(
+        timeout=2.0,
+        retry=RetryConfig(max_retries=0, backoff_base=0.0, backoff_factor=1.0),
+    )
+    base = client.base_url.rstrip("/")
+
+    def handler(ctx: RequestContext):
+        request_id = ctx.headers.get("x-request-id", "")
+        refs = _collect_refs(ctx)
+
+        try:
+            projection = parse_projection(ctx.query)
+        except ProjectionError as e:
+            status, env = fail(
+                request_id=request_id,
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=400,
+                errors=[ErrorItem(code="VALIDATION_ERROR", message=str(e))],
+            )
+            return status, env.model_dump(), {}
+
+        if not refs:
+            status, env = fail(
+                request_id=request_id,
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=400,
+                errors=[ErrorItem(code="VALIDATION_ERROR", message="refs is required")],
+            )
+            return status, env.model_dump(), {}
+
+        if len(refs) > MAX_REFS:
+            status, env = fail(
+                request_id=request_id,
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=400,
+                errors=[ErrorItem(code="VALIDATION_ERROR", message=f"refs must have at most {MAX_REFS} items")],
+            )
+            return status, env.model_dump(), {}
+
+        # 1) normaliza ref -> URL canônica (várias refs podem apontar pro mesmo recurso)
+        ref_to_url: dict[str, str] = {}
+        invalid: list[str] = []
+        for ref in refs:
+            try:
+                resource, item_id = parse_ref(ref)
+            except InvalidSwapiUrl:
+                invalid.append(ref)
+                continue
+            ref_to_url[ref] = f"{base}/{resource}/{item_id}/"
+
+        if invalid:
+            status, env = fail(
+                request_id=request_id,
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=400,
+                errors=[
+                    ErrorItem(
+                        code="VALIDATION_ERROR",
+                        message="invalid refs",
+                        details={"refs": invalid},
+                    )
+                ],
+            )
+            return status, env.model_dump(), {}
+
+        urls = list(dict.fromkeys(ref_to_url.values()))
+
+        # 2) fan-out único sobre as URLs deduplicadas; 404 individual não derruba o lote
+        def fetch_one(url: str) -> tuple[str, dict[str, Any] | None]:
+            try:
+                return url, client_fast.get_by_url(url, params=None)
+            except SwapiNotFound:
+                return url, None
+
+        try:
+            workers = min(16, max(1, len(urls)))
+            resolved = dict(run_bounded(fetch_one, urls, max_workers=workers))
+        except SwapiTimeout:
+            status, env = fail(
+                request_id=request_id,
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=504,
+                errors=[ErrorItem(code="UPSTREAM_TIMEOUT", message="SWAPI timeout")],
+            )
+            return status, env.model_dump(), {}
+        except (SwapiBadResponse, SwapiUpstreamError):
+            status, env = fail(
+                request_id=request_id,
+                self_url=build_self_url(ctx.path, ctx.query),
+                status_code=502,
+                errors=[ErrorItem(code="UPSTREAM_BAD_RESPONSE", message="Invalid response from SWAPI")],
+            )
+            return status, env.model_dump(), {}
+
+        # 3) envelope único indexado pela ref original
+        data: dict[str, dict[str, Any] | None] = {}
+        missing: list[ErrorItem] = []
+        for ref, url in ref_to_url.items():
+            item = resolved.get(url)
+            if item is None:
+                data[ref] = None
+                missing.append(
+                    ErrorItem(
+                        code="UPSTREAM_NOT_FOUND",
+                        message="Resource not found on SWAPI",
+                        details={"ref": ref},
+                    )
+                )
+                continue
+            data[ref] = apply_projection(attach_id(item), projection)
+
+        env = ok(
+            data=data,
+            request_id=request_id,
+            self_url=build_self_url(ctx.path, ctx.query),
+            meta={"count": len(data) - len(missing), "total": len(data)},
+        )
+        payload = env.model_dump()
+        payload["errors"] = [e.model_dump() for e in missing]
+        return 200, payload, {}
+
+    return handler
@@ -1,21 +1,27 @@
 # src/app/main.py
 from __future__ import annotations
 
+import logging
+import os
+import sys
+import threading
 import uuid
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from flask import jsonify, Request, Response  # ✅ trocou make_response por Response
-
-from app.router import Router, RequestContext
+from app.admission import AdaptiveLimiter
+from app.columnar import ColumnarCache
+from app.compression import encode_body
+from app.router import LazyHandler, RequestContext, Router
+from clients import fair_queue
+from clients.fair_queue import FairQueue
 from clients.swapi import SwapiClient
-from app.handlers.films import list_films_handler
-from app.handlers.people import list_people_handler
-from app.handlers.planets import list_planets_handler
-from app.handlers.starships import list_starships_handler
-from app.handlers.film_characters import list_film_characters_handler
-from app.handlers.planet_residents import list_planet_residents_handler
+from observability import heavy_hitters, metrics, timing
+from observability.timing import RequestTimings
 from schemas.common import ok
 
+if TYPE_CHECKING:
+    from flask import Request, Response
+
 
 def _new_request_id() -> str:
     return str(uuid.uuid4())
@@ -30,20 +36,199 @@ def health_handler(ctx: RequestContext) -> tuple[int, dict[str, Any], dict[str,
     return 200, env.model_dump(), {}
 
 
-def create_app_router(swapi_client: SwapiClient | None = None) -> Router:
-    router = Router()
+def metrics_handler(ctx: RequestContext) -> tuple[int, Any, dict[str, str]]:
+    # corpo texto (não envelope): segue pelo caminho de streaming do main()
+    body = metrics.REGISTRY.render().encode()
+    return 200, [body], {"Content-Type": metrics.OPENMETRICS_CONTENT_TYPE}
+
+
+def create_swapi_client() -> SwapiClient:
+    # page_cache_ttl: páginas upstream reaproveitadas entre hops de cursor/paginação sequencial
+    # SWAPI_BASE_URL: aponta para outro upstream (ex.: emulador local do bench/)
+    # SWAPI_HTTP2=1: fan-out multiplexado numa conexão (requer `h2`); SWAPI_MAX_CONNECTIONS,
+    # SWAPI_MAX_KEEPALIVE, SWAPI_KEEPALIVE_EXPIRY: limites do pool compartilhado pelos perfis
+    # SWAPI_IDLE_REAP_AFTER: ociosidade (s) após a qual o pool é esvaziado antes do próximo request
+    # SWAPI_NEGATIVE_TTL: segundos que um 404 do upstream fica guardado (0 = desligado)
+    # SWAPI_CACHE_MAX_ENTRIES: teto (LRU) de entradas por cache do client
+    # FAIR_QUEUE*: fila justa por x-api-key com um slot por conexão do pool (clients.fair_queue)
+    max_connections = int(os.environ.get("SWAPI_MAX_CONNECTIONS", "20"))
+    return SwapiClient(
+        base_url=os.environ.get("SWAPI_BASE_URL", "https://swapi.dev/api"),
+        sleep_fn=lambda _: None,
+        page_cache_ttl=60.0,
+        cache_max_entries=int(os.environ.get("SWAPI_CACHE_MAX_ENTRIES", "5000")),
+        http2=os.environ.get("SWAPI_HTTP2", "0").strip().lower() in ("1", "true", "yes", "on"),
+        max_connections=max_connections,
+        max_keepalive=int(os.environ.get("SWAPI_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=float(os.environ.get("SWAPI_KEEPALIVE_EXPIRY", "30")),
+        idle_reap_after=float(os.environ.get("SWAPI_IDLE_REAP_AFTER", "15")),
+        negative_cache_ttl=float(os.environ.get("SWAPI_NEGATIVE_TTL", "600")),
+        fair_queue=FairQueue.from_env(capacity=max_connections),
+    )
+
+
+def create_app_router(
+    swapi_client: SwapiClient | None = None, *, columns: ColumnarCache | None = None
+) -> Router:
+    # ADMISSION=off desliga o limite adaptativo de requests simultâneos (app.admission)
+    limiter = AdaptiveLimiter.from_env()
+    router = Router(limiter=limiter)
     router.add_route("GET", "/health", health_handler)
+    router.add_route("GET", "/metrics", metrics_handler)
+
+    client = swapi_client or create_swapi_client()
+    metrics.REGISTRY.gauge_func(
+        "swapi_cache_entries",
+        "Entradas nos caches do client",
+        ("cache",),
+        lambda: {(name,): n for name, n in client.cache_entries().items()},
+    )
+    if limiter is not None:
+        metrics.REGISTRY.gauge_func(
+            "admission_limit", "Limite atual de requests simultâneos", (), lambda: {(): limiter.limit}
+        )
+        metrics.REGISTRY.gauge_func(
+            "admission_inflight", "Requests admitidos em andamento", (), lambda: {(): limiter.inflight}
+        )
+    # READY_MIN_CACHE_ENTRIES: entradas em cache exigidas antes de /health/ready responder 200
+    min_entries = int(os.environ.get("READY_MIN_CACHE_ENTRIES", "0"))
+    router.add_route(
+        "GET", "/health/ready", LazyHandler("app.handlers.health", "ready_handler", client, min_cache_entries=min_entries)
+    )
+
+    # filter=/sort= nas listagens: um ColumnStore por recurso, compartilhado entre handlers
+    # COLUMNAR_TTL: segundos até reconstruir as colunas a partir das páginas upstream
+    columns = columns or ColumnarCache(client, ttl_seconds=float(os.environ.get("COLUMNAR_TTL", "300")))
+
+    # PREFETCH=1: próxima página / filhos da próxima página buscados em background, cedendo
+    # ao foreground; PREFETCH_RATE: buscas/s do orçamento; PREFETCH_QUEUE: tamanho da fila
+    prefetch = None
+    if os.environ.get("PREFETCH", "0").strip().lower() in ("1", "true", "yes", "on"):
+        from app.prefetch import Prefetcher
 
-    client = swapi_client or SwapiClient(sleep_fn=lambda _: None)
-    router.add_route("GET", "/films", list_films_handler(client))
-    router.add_route("GET", "/people", list_people_handler(client))
-    router.add_route("GET", "/planets", list_planets_handler(client))
-    router.add_route("GET", "/starships", list_starships_handler(client))
-    router.add_route("GET", "/films/{id}/characters", list_film_characters_handler(client))
-    router.add_route("GET", "/planets/{id}/residents", list_planet_residents_handler(client))
+        prefetch = Prefetcher(
+            client,
+            rate_per_second=float(os.environ.get("PREFETCH_RATE", "5")),
+            max_queue=int(os.environ.get("PREFETCH_QUEUE", "64")),
+        )
+
+    # handlers (e suas dependências) só são importados no 1º request da rota
+    router.add_route(
+        "GET", "/films", LazyHandler("app.handlers.films", "list_films_handler", client, columns=columns)
+    )
+    router.add_route(
+        "GET",
+        "/people",
+        LazyHandler("app.handlers.people", "list_people_handler", client, columns=columns, prefetch=prefetch),
+    )
+    router.add_route(
+        "GET",
+        "/planets",
+        LazyHandler("app.handlers.planets", "list_planets_handler", client, columns=columns, prefetch=prefetch),
+    )
+    router.add_route(
+        "GET",
+        "/starships",
+        LazyHandler(
+            "app.handlers.starships", "list_starships_handler", client, columns=columns, prefetch=prefetch
+        ),
+    )
+    router.add_route(
+        "GET",
+        "/films/{id}/characters",
+        LazyHandler(
+            "app.handlers.film_characters", "list_film_characters_handler", client, prefetch=prefetch
+        ),
+    )
+    router.add_route(
+        "GET",
+        "/planets/{id}/residents",
+        LazyHandler(
+            "app.handlers.planet_residents", "list_planet_residents_handler", client, prefetch=prefetch
+        ),
+    )
+
+    resolve = LazyHandler("app.handlers.resolve", "resolve_handler", client)
+    router.add_route("GET", "/resolve", resolve)
+    router.add_route("POST", "/resolve", resolve)
+    router.add_route("GET", "/export/{resource}", LazyHandler("app.handlers.export", "export_handler", client))
+
+    # chaves quentes (fora do gateway, como /metrics): relatório, manifest de warm-up e pinning.
+    # ADMIN_TOKEN liga as rotas e é exigido em `x-admin-token`; sem ele, 404
+    admin_token = os.environ.get("ADMIN_TOKEN", "").strip()
+    if admin_token:
+        admin = "app.handlers.admin"
+        router.add_route("GET", "/admin/hot", LazyHandler(admin, "hot_handler", client, token=admin_token))
+        router.add_route("GET", "/admin/hot/manifest", LazyHandler(admin, "manifest_handler", token=admin_token))
+        router.add_route("POST", "/admin/hot/pin", LazyHandler(admin, "pin_handler", client, token=admin_token))
     return router
 
 
+# Router (e SwapiClient/caches) vivem por instância, não por request:
+# em warm starts o cache TTL é reaproveitado entre requests.
+_router: Router | None = None
+_router_lock = threading.Lock()
+
+
+def _get_router() -> Router:
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = create_app_router()
+                _start_warmup(_router)
+    return _router
+
+
+def install_router(router: Router) -> None:
+    """Troca o router da instância (ex.: master do modo pre-fork, com snapshot já carregado)."""
+    global _router
+    with _router_lock:
+        _router = router
+
+
+def _start_warmup(router: Router) -> None:
+    """
+    WARMUP=import|first_request dispara o warm-up em background assim que o
+    router existe (no import do módulo ou no 1º request); default: off.
+    WARMUP_MANIFEST / WARMUP_TOP_N escolhem o que aquecer.
+    """
+    if os.environ.get("WARMUP", "off") not in ("import", "first_request"):
+        return
+    from app import warmup
+
+    paths = warmup.load_manifest(
+        os.environ.get("WARMUP_MANIFEST") or None,
+        top_n=int(os.environ.get("WARMUP_TOP_N", str(warmup.DEFAULT_TOP_N))),
+    )
+    if paths:
+        warmup.start_background(router, paths)
+
+
+# --- log estruturado por request ---
+# rotas operacionais: fora do tracking de queries quentes (e do manifest de warm-up)
+_UNTRACKED_PREFIXES = ("/health", "/metrics", "/export", "/admin")
+
+def _configure_request_log() -> None:
+    """
+    Uma linha JSON por request em stdout (Cloud Logging vira jsonPayload).
+    REQUEST_LOG=0 desliga; se já houver handler configurado, respeita.
+    """
+    log = timing.logger
+    if os.environ.get("REQUEST_LOG", "1") == "0":
+        log.disabled = True
+        return
+    if not log.handlers:
+        h = logging.StreamHandler(sys.stdout)
+        h.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(h)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+
+
+_configure_request_log()
+
+
 # --- CORS ---
 def _cors_headers(origin: str | None) -> dict[str, str]:
     """
@@ -56,13 +241,19 @@ def _cors_headers(origin: str | None) -> dict[str, str]:
     return {
         "Access-Control-Allow-Origin": allow_origin,
         "Vary": "Origin",
-        "Access-Control-Allow-Methods": "GET,OPTIONS",
+        "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
         "Access-Control-Allow-Headers": "accept,content-type,x-api-key,x-request-id",
+        # Server-Timing só fica visível ao JS (Resource Timing API) com Timing-Allow-Origin
+        "Timing-Allow-Origin": allow_origin,
         "Access-Control-Max-Age": "3600",
     }
 
 
 def main(request: Request):
+    # Flask fica fora do import do módulo: o functions-framework já o carregou,
+    # e outros entrypoints (ex.: ASGI) não precisam dele
+    from flask import Response
+
     origin = request.headers.get("Origin")
 
     # Preflight CORS
@@ -72,9 +263,62 @@ def main(request: Request):
             resp.headers[k] = v
         return resp
 
-    router = create_app_router()
-
+    timings = _new_timings(request.path, request.query_string.decode("latin-1"))
     request_id = request.headers.get("x-request-id") or _new_request_id()
+    # chamadas upstream do request contam para a x-api-key (fila justa do client)
+    with timing.activate(timings), fair_queue.activate(request.headers.get("x-api-key")):
+        status, resp = _handle(request, origin, request_id, timings)
+
+    resp.headers["Server-Timing"] = timings.server_timing()
+    _finish_request(
+        timings,
+        request_id=request_id,
+        method=request.method,
+        path=request.path,
+        query=request.query_string.decode("latin-1"),
+        status=status,
+    )
+    return resp
+
+
+def _new_timings(path: str, query: str) -> RequestTimings:
+    """Spans do request (comum aos entrypoints WSGI e ASGI), com a query canônica já calculada."""
+    timings = RequestTimings()
+    timings.query_key = heavy_hitters.canonical_query(path, query)
+    return timings
+
+
+def _finish_request(
+    timings: RequestTimings, *, request_id: str, method: str, path: str, query: str, status: int
+) -> None:
+    """Log estruturado + métricas do request (comum aos entrypoints WSGI e ASGI)."""
+    route = timings.route or "unmatched"
+    timing.log_request(
+        timings,
+        request_id=request_id,
+        method=method,
+        path=path,
+        query=query,
+        route=route,
+        status=status,
+    )
+
+    # heavy hitters: rotas e `path?query` canônico (GETs 200 viram candidatos a warm-up)
+    if route != "unmatched":
+        heavy_hitters.ROUTES.add(route)
+    if method == "GET" and status == 200 and not path.startswith(_UNTRACKED_PREFIXES):
+        heavy_hitters.QUERIES.add(timings.query_key or heavy_hitters.canonical_query(path, query))
+
+    metrics.REQUESTS.inc(route, method, str(status))
+    metrics.REQUEST_LATENCY.observe(timings.elapsed_ms() / 1000, route, method)
+    metrics.FLUSHER.maybe_flush()
+
+
+def _handle(request: Request, origin: str | None, request_id: str, timings: RequestTimings) -> tuple[int, Response]:
+    from flask import Response, jsonify
+
+    router = _get_router()
+
     status, payload, headers = router.dispatch(
         method=request.method,
         path=request.path,
@@ -84,13 +328,35 @@ def main(request: Request):
         request_id=request_id,
     )
 
-    resp = jsonify(payload)
-    resp.status_code = status
-
     # headers do handler + CORS
     merged = dict(headers or {})
     merged.update(_cors_headers(origin))
+
+    # streaming (ex.: NDJSON de /export): repassa o gerador sem materializar
+    # (spans cobrem só até o 1º chunk; o resto do stream não entra no Server-Timing)
+    if not isinstance(payload, dict):
+        resp = Response(payload, status=status)
+        for k, v in merged.items():
+            resp.headers[k] = v
+        return status, resp
+
+    with timings.span("serialize"):
+        resp = jsonify(payload)
+        resp.status_code = status
+
+        # compressão negociada (gzip/br) acima do limiar
+        body, encoding = encode_body(resp.get_data(), request.headers.get("Accept-Encoding"))
+        if encoding is not None:
+            resp.set_data(body)
+            merged["Content-Encoding"] = encoding
+    merged["Vary"] = "Origin, Accept-Encoding"
+
     for k, v in merged.items():
         resp.headers[k] = v
 
-    return resp
+    return status, resp
+
+
+# cold start: com WARMUP=import o router (e o warm-up) nasce junto com o módulo
+if os.environ.get("WARMUP") == "import":
+    _get_router()
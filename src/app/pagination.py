@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import base64
+import json
+from dataclasses import dataclass
 from typing import Any, Mapping
 from urllib.parse import urlencode
 
+from observability.timing import timed
+
+CURSOR_VERSION = 1
+UPSTREAM_PAGE_SIZE = 10  # SWAPI é fixa em 10
+
 
 class PaginationError(ValueError):
     pass
@@ -17,6 +25,7 @@ def parse_int(value: Any, *, default: int) -> int:
         raise PaginationError("must be an integer") from e
 
 
+@timed("validate")
 def parse_pagination(query: Mapping[str, Any]) -> tuple[int, int]:
     page = parse_int(query.get("page"), default=1)
     page_size = parse_int(query.get("page_size"), default=10)
@@ -56,8 +65,10 @@ def build_links(
     page_size: int,
     q: str | None,
     total: int | None,
+    extra: Mapping[str, Any] | None = None,
 ) -> dict[str, str | None]:
-    base_query: dict[str, Any] = {"page": page, "page_size": page_size}
+    # extra: params que precisam sobreviver em self/next/prev (ex.: fields, compact)
+    base_query: dict[str, Any] = {**(extra or {}), "page": page, "page_size": page_size}
     if q:
         base_query["q"] = q
 
@@ -79,3 +90,105 @@ def build_links(
             next_url = build_self_url(path, next_q)
 
     return {"self": self_url, "next": next_url, "prev": prev_url}
+
+
+# ---------- cursor (opaco) ----------
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Posição na listagem upstream.
+
+    up_page: página SWAPI onde a próxima janela começa
+    offset: índice dentro dessa página
+    search: termo de busca fixado no cursor
+    snapshot: `count` upstream observado ao emitir o cursor (None no primeiro hop)
+    """
+    up_page: int
+    offset: int
+    search: str | None = None
+    snapshot: int | None = None
+
+    @classmethod
+    def at(cls, position: int, *, search: str | None, snapshot: int | None) -> "Cursor":
+        return cls(
+            up_page=position // UPSTREAM_PAGE_SIZE + 1,
+            offset=position % UPSTREAM_PAGE_SIZE,
+            search=search,
+            snapshot=snapshot,
+        )
+
+    @property
+    def position(self) -> int:
+        return (self.up_page - 1) * UPSTREAM_PAGE_SIZE + self.offset
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    raw = json.dumps(
+        {"v": CURSOR_VERSION, "p": cursor.up_page, "o": cursor.offset, "q": cursor.search, "s": cursor.snapshot},
+        separators=(",", ":"),
+    ).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _token_int(value: Any) -> int:
+    # int(...) aceitaria "3", 3.7 e True vindos do JSON do token
+    if type(value) is not int:
+        raise PaginationError("invalid cursor")
+    return value
+
+
+def decode_cursor(token: str) -> Cursor:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if data.get("v") != CURSOR_VERSION:
+            raise PaginationError("unsupported cursor version")
+        cursor = Cursor(
+            up_page=_token_int(data["p"]),
+            offset=_token_int(data["o"]),
+            search=data.get("q"),
+            snapshot=data.get("s"),
+        )
+        # token vem do cliente: `q` vira params do upstream e chave de cache, `s` é comparado com `count`
+        if cursor.search is not None and not isinstance(cursor.search, str):
+            raise PaginationError("invalid cursor")
+        if cursor.snapshot is not None:
+            _token_int(cursor.snapshot)
+    except PaginationError:
+        raise
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise PaginationError("invalid cursor") from e
+
+    if cursor.up_page < 1 or not (0 <= cursor.offset < UPSTREAM_PAGE_SIZE):
+        raise PaginationError("invalid cursor")
+    return cursor
+
+
+@timed("validate")
+def parse_cursor(token: str, *, page: int, page_size: int, search: str | None) -> Cursor:
+    """
+    `cursor=` vazio inicia o modo cursor a partir de (page, page_size);
+    um token existente fixa posição e busca (q da query é ignorado).
+    """
+    if token == "":
+        return Cursor.at((page - 1) * page_size, search=search, snapshot=None)
+    return decode_cursor(token)
+
+
+def build_cursor_links(
+    path: str,
+    *,
+    cursor: Cursor,
+    next_cursor: Cursor | None,
+    page_size: int,
+    extra: Mapping[str, Any] | None = None,
+) -> dict[str, str | None]:
+    base_query: dict[str, Any] = {**(extra or {}), "page_size": page_size}
+
+    self_url = build_self_url(path, {**base_query, "cursor": encode_cursor(cursor)})
+    next_url: str | None = None
+    if next_cursor is not None:
+        next_url = build_self_url(path, {**base_query, "cursor": encode_cursor(next_cursor)})
+
+    # cursor só anda pra frente
+    return {"self": self_url, "next": next_url, "prev": None}
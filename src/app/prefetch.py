@@ -0,0 +1,142 @@
+# src/app/prefetch.py
+# Prefetch especulativo em background: depois de responder, agenda o que o
+# cliente quase certamente pede em seguida.
+#
+# - listagens: páginas upstream que sustentam `links.next` (page + 1)
+# - correlated endpoints: URLs filhas da próxima página do pai recém-buscado
+#   (characters/residents)
+#
+# As buscas saem por um perfil fail-fast do mesmo SwapiClient (pool e caches
+# compartilhados), numa única thread de baixa prioridade:
+# - cede ao tráfego de foreground: só busca com `client.inflight()` abaixo de
+#   `yield_above`; esperou mais que `max_defer_seconds`, desiste da tarefa
+# - orçamento: token bucket de `rate_per_second` buscas/s
+# - fila limitada: cheia, a tarefa mais antiga (mais provavelmente obsoleta) sai
+# Dado já em cache não gera chamada (get/get_by_url respondem do cache).
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from app.swapi_window import upstream_pages
+from clients.swapi import RetryConfig, SwapiClient, SwapiError
+from observability import metrics
+
+Task = tuple[str, Callable[[], Any]]
+
+
+@dataclass
+class Prefetcher:
+    client: SwapiClient
+    max_queue: int = 64
+    rate_per_second: float = 5.0
+    yield_above: int = 1
+    max_defer_seconds: float = 2.0
+    poll_interval: float = 0.02
+    now_fn: Callable[[], float] = time.monotonic
+    sleep_fn: Callable[[float], None] = time.sleep
+
+    _fast: SwapiClient = field(init=False, repr=False)
+    _queue: deque = field(default_factory=deque, init=False, repr=False)
+    _pending: set = field(default_factory=set, init=False, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, init=False, repr=False)
+    _thread: threading.Thread | None = field(default=None, init=False, repr=False)
+    _busy: bool = field(default=False, init=False, repr=False)
+    _tokens: float = field(default=0.0, init=False, repr=False)
+    _refilled: float = field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._fast = self.client.with_profile(
+            timeout=2.0,
+            retry=RetryConfig(max_retries=0, backoff_base=0.0, backoff_factor=1.0),
+        )
+        self._tokens = max(1.0, self.rate_per_second)
+        self._refilled = self.now_fn()
+
+    # ---------- agendamento (chamado pelos handlers, não bloqueia) ----------
+    def window(self, resource: str, *, page: int, page_size: int, search: str | None = None) -> int:
+        """Páginas upstream da janela (page, page_size), com os mesmos params do fetch_window."""
+        tasks: list[Task] = []
+        for up_page in upstream_pages(page, page_size):
+            params: dict[str, Any] = {"page": up_page}
+            if search:
+                params["search"] = search
+            tasks.append(
+                (f"page:{resource}|{up_page}|{search or ''}", lambda p=params: self._fast.get(resource, params=p))
+            )
+        return self._submit(tasks)
+
+    def urls(self, urls: Iterable[str]) -> int:
+        """Recursos filhos por URL (cache por URL do client)."""
+        return self._submit(
+            [(f"url:{u}", lambda u=u: self._fast.get_by_url(u, params=None)) for u in urls if isinstance(u, str)]
+        )
+
+    def _submit(self, tasks: list[Task]) -> int:
+        added = 0
+        with self._cond:
+            for key, fn in tasks:
+                if key in self._pending:
+                    continue
+                if len(self._queue) >= self.max_queue:
+                    old_key, _ = self._queue.popleft()
+                    self._pending.discard(old_key)
+                    metrics.PREFETCH_TASKS.inc("dropped")
+                self._queue.append((key, fn))
+                self._pending.add(key)
+                added += 1
+            if added:
+                self._ensure_thread()
+                self._cond.notify()
+        return added
+
+    def _ensure_thread(self) -> None:
+        # thread nasce no 1º agendamento (no modo pre-fork: já dentro do worker)
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+            self._thread.start()
+
+    # ---------- worker ----------
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._busy = False
+                    self._cond.notify_all()
+                    self._cond.wait()
+                key, fn = self._queue.popleft()
+                self._busy = True
+            outcome = self._run_one(fn)
+            with self._cond:
+                self._pending.discard(key)
+            metrics.PREFETCH_TASKS.inc(outcome)
+
+    def _run_one(self, fn: Callable[[], Any]) -> str:
+        deadline = self.now_fn() + self.max_defer_seconds
+        while self.client.inflight() >= self.yield_above or not self._take_token():
+            if self.now_fn() >= deadline:
+                return "deferred"
+            self.sleep_fn(self.poll_interval)
+        try:
+            fn()
+        except SwapiError:
+            return "error"
+        return "done"
+
+    def _take_token(self) -> bool:
+        now = self.now_fn()
+        cap = max(1.0, self.rate_per_second)
+        self._tokens = min(cap, self._tokens + (now - self._refilled) * self.rate_per_second)
+        self._refilled = now
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    def join(self, timeout: float = 5.0) -> bool:
+        """Espera a fila esvaziar (testes/bench); False se estourou `timeout`."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout=timeout)
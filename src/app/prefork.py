@@ -0,0 +1,147 @@
+# src/app/prefork.py
+# Modo pre-fork: config do gunicorn + snapshot da SWAPI carregado no master.
+#
+# Com N workers cada um montava os próprios caches (N× memória, N× fetch do
+# mesmo dataset). Aqui o master, antes do fork:
+# 1) lê a SWAPI inteira (páginas + registros) para os caches do client,
+#    monta os ColumnStores de filter/sort e instala o router já aquecido
+# 2) fecha as conexões (socket não atravessa fork) e faz gc.freeze(): os
+#    objetos do snapshot vão para a geração permanente, o GC dos workers não
+#    os varre/escreve e as páginas ficam compartilhadas copy-on-write
+#
+# Refresh coordenado: SIGHUP no master (manual ou a cada
+# PREFORK_REFRESH_SECONDS) recarrega o snapshot no master e o gunicorn
+# re-forka os workers a partir dele, encerrando os antigos com graceful.
+# Se o reload falhar, o snapshot anterior continua valendo.
+#
+# Uso (Procfile `prefork`):
+#   PYTHONPATH=src gunicorn -c python:app.prefork app.asgi:app
+from __future__ import annotations
+
+import gc
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from app import main as app_main
+from app.columnar import NUMERIC_FIELDS, ColumnarCache, fetch_collection
+from app.router import Router
+from clients.utils import SWAPI_RESOURCES
+
+DEFAULT_REFRESH_SECONDS = 3600.0
+
+
+@dataclass(frozen=True)
+class SnapshotReport:
+    records: dict[str, int]
+    seconds: float
+    frozen_objects: int
+
+    def as_log(self) -> dict[str, Any]:
+        return {"records": self.records, "seconds": round(self.seconds, 2), "frozen_objects": self.frozen_objects}
+
+
+def refresh_seconds() -> float:
+    return float(os.environ.get("PREFORK_REFRESH_SECONDS", str(DEFAULT_REFRESH_SECONDS)))
+
+
+def build_router(*, ttl_seconds: float) -> tuple[Router, dict[str, int]]:
+    """
+    Router com client/caches/colunas já preenchidos com a SWAPI inteira.
+    As entradas valem `ttl_seconds` (até o próximo refresh, não o TTL normal).
+    """
+    client = app_main.create_swapi_client()
+    client.page_cache_ttl = ttl_seconds
+    client.by_url_cache_ttl = ttl_seconds
+    columns = ColumnarCache(client, ttl_seconds=ttl_seconds)
+
+    counts: dict[str, int] = {}
+    for resource in sorted(SWAPI_RESOURCES):
+        # páginas passam pelo cache de páginas (mesmas chaves do fetch_window)
+        rows = fetch_collection(client, resource)
+        counts[resource] = client.seed(rows)
+        if resource in NUMERIC_FIELDS:
+            columns.put(resource, rows)
+    client.get("films/")  # films pagina localmente a partir da listagem sem params
+
+    # nada de socket herdado pelos workers: cada um abre o próprio pool
+    client.close()
+    return app_main.create_app_router(swapi_client=client, columns=columns), counts
+
+
+def load_snapshot(*, freeze: bool = True) -> SnapshotReport:
+    """Monta e instala o router do snapshot; com `freeze`, congela o heap para o fork."""
+    t0 = time.perf_counter()
+    refresh = refresh_seconds()
+    # sem refresh periódico o snapshot só sai por SIGHUP
+    ttl = refresh * 2 if refresh > 0 else float("inf")
+    router, counts = build_router(ttl_seconds=ttl)
+    app_main.install_router(router)
+
+    frozen = 0
+    if freeze:
+        # snapshot anterior volta a ser coletável; o novo vai para a geração permanente
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+        frozen = gc.get_freeze_count()
+    return SnapshotReport(records=counts, seconds=time.perf_counter() - t0, frozen_objects=frozen)
+
+
+class _RefreshTimer:
+    """Thread do master que pede o refresh via SIGHUP (o gunicorn serializa o reload no loop dele)."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="prefork-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            os.kill(os.getpid(), signal.SIGHUP)
+
+
+_timer = _RefreshTimer(refresh_seconds())
+
+
+# ---------- config do gunicorn ----------
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = os.environ.get("PREFORK_WORKER_CLASS", "uvicorn_worker.UvicornWorker")
+preload_app = True
+graceful_timeout = 30
+
+
+def on_starting(server: Any) -> None:
+    report = load_snapshot()
+    server.log.info("prefork snapshot loaded: %s", report.as_log())
+
+
+def when_ready(server: Any) -> None:
+    _timer.start()
+
+
+def on_reload(server: Any) -> None:
+    # roda no master antes de o gunicorn subir os workers novos
+    try:
+        report = load_snapshot()
+    except Exception:  # noqa: BLE001 - upstream fora: segue com o snapshot anterior
+        server.log.exception("prefork snapshot refresh failed; keeping previous snapshot")
+        return
+    server.log.info("prefork snapshot refreshed: %s", report.as_log())
+
+
+def on_exit(server: Any) -> None:
+    _timer.stop()
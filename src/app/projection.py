@@ -0,0 +1,109 @@
+# src/app/projection.py
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from clients.urls import InvalidSwapiUrl, bulk_ids, url_ref
+from observability.timing import timed
+
+MAX_FIELDS = 30
+
+_FIELD_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+_TRUE = {"1", "true", "yes"}
+_FALSE = {"0", "false", "no", ""}
+
+# campos sempre mantidos: identidade do registro
+_ALWAYS_KEEP = ("id",)
+
+
+class ProjectionError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Projection:
+    """
+    Projeção aplicada aos itens antes da serialização.
+
+    fields: chaves a manter (None = todas)
+    compact: troca URLs aninhadas da SWAPI por ids inteiros
+    """
+    fields: tuple[str, ...] | None = None
+    compact: bool = False
+
+    def query(self) -> dict[str, str]:
+        """
+        Forma canônica para links e chaves de cache (fields ordenado, compact=1).
+        """
+        out: dict[str, str] = {}
+        if self.fields is not None:
+            out["fields"] = ",".join(self.fields)
+        if self.compact:
+            out["compact"] = "1"
+        return out
+
+
+@timed("validate")
+def parse_projection(query: Mapping[str, Any]) -> Projection:
+    raw_fields = query.get("fields")
+    fields: tuple[str, ...] | None = None
+
+    if raw_fields is not None and str(raw_fields).strip() != "":
+        names = {f.strip() for f in str(raw_fields).split(",") if f.strip()}
+        if len(names) > MAX_FIELDS:
+            raise ProjectionError(f"fields must have at most {MAX_FIELDS} items")
+        for name in names:
+            if not _FIELD_RE.match(name):
+                raise ProjectionError(f"invalid field name: {name}")
+        fields = tuple(sorted(names))
+
+    raw_compact = str(query.get("compact") or "").strip().lower()
+    if raw_compact in _TRUE:
+        compact = True
+    elif raw_compact in _FALSE:
+        compact = False
+    else:
+        raise ProjectionError("compact must be 0 or 1")
+
+    return Projection(fields=fields, compact=compact)
+
+
+def _url_to_id(value: str) -> Any:
+    if not value.startswith("http"):
+        return value
+    ref = url_ref(value)
+    return value if ref is None else ref[1]
+
+
+def _compact_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return _url_to_id(value)
+    if isinstance(value, list):
+        # caso comum (films, residents...): lista só de URLs -> ids numa passada
+        try:
+            return bulk_ids(value).tolist()
+        except InvalidSwapiUrl:
+            return [_url_to_id(v) if isinstance(v, str) else v for v in value]
+    return value
+
+
+def apply_projection(item: dict[str, Any], projection: Projection) -> dict[str, Any]:
+    """
+    Retorna um novo dict projetado. `url` (identidade do registro) nunca é compactada.
+    """
+    if projection.fields is not None:
+        keep = set(projection.fields).union(_ALWAYS_KEEP)
+        item = {k: v for k, v in item.items() if k in keep}
+
+    if projection.compact:
+        item = {k: (v if k == "url" else _compact_value(v)) for k, v in item.items()}
+
+    return item
+
+
+def project_items(items: list[dict[str, Any]], projection: Projection) -> list[dict[str, Any]]:
+    if projection.fields is None and not projection.compact:
+        return items
+    return [apply_projection(it, projection) for it in items]
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import importlib
+import inspect
 import re
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any, Callable, Mapping
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Iterator, Mapping, NamedTuple, Union
 
+from observability import timing
+from observability.timing import RequestTimings
 from schemas.common import ErrorItem, fail
 
+if TYPE_CHECKING:
+    from app.admission import AdaptiveLimiter, Lease
+
 JsonDict = dict[str, Any]
 Headers = dict[str, str]
-Handler = Callable[["RequestContext"], tuple[int, JsonDict, Headers]]
+# envelope (dict) ou corpo em streaming (iterável de bytes, ex.: NDJSON)
+Payload = Union[JsonDict, Iterable[bytes]]
+Handler = Callable[["RequestContext"], tuple[int, Payload, Headers]]
 
 _PARAM_RE = re.compile(r"\{([a-zA-Z_][a-zA-Z0-9_]*)\}")
 
@@ -21,6 +32,14 @@ class RequestContext:
     headers: Mapping[str, str]
     body: Any
     path_params: Mapping[str, str]
+    # spans do request ativo (None fora de main(), ex.: testes chamando o router direto)
+    timings: RequestTimings | None = None
+
+
+class RouteMatch(NamedTuple):
+    handler: Handler
+    template: str
+    path_params: Mapping[str, str]
 
 
 @dataclass(frozen=True)
@@ -50,6 +69,34 @@ def _compile_template(template: str) -> tuple[re.Pattern[str], tuple[str, ...]]:
     return pattern, tuple(names)
 
 
+class LazyHandler:
+    """
+    Handler resolvido no 1º request: importa `module` e chama `factory(*args, **kwargs)`.
+    Registrar rotas não importa os módulos dos handlers (nem suas dependências),
+    o que tira esse custo do cold start de rotas que a instância nunca serve.
+    """
+
+    def __init__(self, module: str, factory: str, *args: Any, **kwargs: Any) -> None:
+        self.module = module
+        self.factory = factory
+        self.args = args
+        self.kwargs = kwargs
+        self._handler: Handler | None = None
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Handler:
+        if self._handler is None:
+            with self._lock:
+                if self._handler is None:
+                    mod = importlib.import_module(self.module)
+                    self._handler = getattr(mod, self.factory)(*self.args, **self.kwargs)
+        return self._handler
+
+    def __call__(self, ctx: "RequestContext") -> tuple[int, Payload, Headers]:
+        handler = self._handler or self.resolve()
+        return handler(ctx)
+
+
 class Router:
     """
     Mini-router testável.
@@ -57,9 +104,11 @@ class Router:
     - Retorna (status, payload_dict, headers_dict).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, limiter: AdaptiveLimiter | None = None) -> None:
         self._static: dict[str, dict[str, Handler]] = {}
         self._dynamic: list[Route] = []
+        # controle de admissão (app.admission); None = aceita tudo
+        self.limiter = limiter
 
     # ---------- normalização ----------
     def _norm_method(self, method: str) -> str:
@@ -95,74 +144,96 @@ class Router:
         )
 
     # ---------- dispatch ----------
-    def dispatch(
+    def match(self, method: str, path: str) -> RouteMatch | int:
+        """Rota + params para (method, path) já normalizados; 404/405 quando não há."""
+        found = self._lookup(method, path)
+        return found if type(found) is int else RouteMatch(*found)
+
+    def _lookup(self, method: str, path: str) -> tuple[Handler, str, Mapping[str, str]] | int:
+        # tupla simples no caminho quente (NamedTuple/dataclass custam µs por request)
+        methods = self._static.get(path)
+        if methods is not None:
+            handler = methods.get(method)
+            return 405 if handler is None else (handler, path, {})
+
+        for r in self._dynamic:
+            mm = r.pattern.match(path)
+            if mm:
+                handler = r.methods.get(method)
+                if handler is None:
+                    return 405
+                return handler, r.template, mm.groupdict()
+        return 404
+
+    def _unmatched(self, status: int, request_id: str, path: str, out_headers: Headers) -> tuple[int, Payload, Headers]:
+        if status == 405:
+            error = ErrorItem(code="METHOD_NOT_ALLOWED", message="Method not allowed")
+        else:
+            error = ErrorItem(code="NOT_FOUND", message="Route not found")
+        status, env = fail(request_id=request_id, self_url=path, status_code=status, errors=[error])
+        return status, env.model_dump(), out_headers
+
+    def _admit(
+        self, method: str, path: str, query: Mapping[str, Any], template: str, timings: RequestTimings | None
+    ) -> Lease | bool:
+        """Lease do limiter; True = sem controle (rota barata/limiter desligado); False = rejeitar."""
+        limiter = self.limiter
+        if limiter is None or limiter.bypass(template):
+            return True
+        # chave só para quem passa pelo limiter; o entrypoint já calculou a query canônica
+        key = timings.query_key if timings is not None else None
+        if key is None:  # router chamado direto (testes, warm-up)
+            from urllib.parse import urlencode
+
+            key = f"{path}?{urlencode(sorted(query.items()))}" if query else path
+        lease = limiter.try_acquire(f"{method} {key}")
+        return False if lease is None else lease
+
+    def _overloaded(self, request_id: str, path: str, out_headers: Headers) -> tuple[int, Payload, Headers]:
+        assert self.limiter is not None
+        status, env = fail(
+            request_id=request_id,
+            self_url=path,
+            status_code=503,
+            errors=[ErrorItem(code="OVERLOADED", message="Server is at capacity, retry later")],
+        )
+        headers = {**out_headers, "Retry-After": str(self.limiter.retry_after()), "Cache-Control": "no-store"}
+        return status, env.model_dump(), headers
+
+    def _prepare(
         self,
-        *,
         method: str,
         path: str,
         query: Mapping[str, Any],
         headers: Mapping[str, str],
         body: Any,
         request_id: str,
-    ) -> tuple[int, JsonDict, Headers]:
+    ) -> tuple[Any, ...]:
+        """
+        Parte comum de dispatch/dispatch_async: normaliza, casa a rota, monta o
+        contexto e passa pela admissão.
+
+        Devolve `(handler, ctx, template, out_headers, lease)` ou, quando não há
+        handler a chamar, a resposta pronta `(status, payload, headers)` (404/405/503).
+        `lease` None = sem controle de admissão.
+        """
         m = self._norm_method(method)
         p = self._norm_path(path)
-
         out_headers: Headers = {"Content-Type": "application/json"}
 
-        # 1) match estático
-        methods = self._static.get(p)
-        if methods is not None:
-            handler = methods.get(m)
-            if handler is None:
-                status, env = fail(
-                    request_id=request_id,
-                    self_url=p,
-                    status_code=405,
-                    errors=[ErrorItem(code="METHOD_NOT_ALLOWED", message="Method not allowed")],
-                )
-                return status, env.model_dump(), out_headers
-
-            ctx = RequestContext(
-                method=m,
-                path=p,
-                query=query,
-                headers=headers,
-                body=body,
-                path_params={},
-            )
-            status, payload, handler_headers = handler(ctx)
-            return status, payload, {**out_headers, **(handler_headers or {})}
-
-        # 2) match dinâmico
-        matched_route: Route | None = None
-        matched_params: dict[str, str] | None = None
+        found = self._lookup(m, p)
+        if type(found) is int:
+            return self._unmatched(found, request_id, p, out_headers)
 
-        for r in self._dynamic:
-            mm = r.pattern.match(p)
-            if mm:
-                matched_route = r
-                matched_params = mm.groupdict()
-                break
-
-        if matched_route is None:
-            status, env = fail(
-                request_id=request_id,
-                self_url=p,
-                status_code=404,
-                errors=[ErrorItem(code="NOT_FOUND", message="Route not found")],
-            )
-            return status, env.model_dump(), out_headers
-
-        handler = matched_route.methods.get(m)
-        if handler is None:
-            status, env = fail(
-                request_id=request_id,
-                self_url=p,
-                status_code=405,
-                errors=[ErrorItem(code="METHOD_NOT_ALLOWED", message="Method not allowed")],
-            )
-            return status, env.model_dump(), out_headers
+        handler, template, path_params = found
+        timings = timing.current()
+        lease: Lease | None = None
+        if self.limiter is not None:
+            admitted = self._admit(m, p, query, template, timings)
+            if admitted is False:
+                return self._overloaded(request_id, p, out_headers)
+            if admitted is not True:
+                lease = admitted
 
         ctx = RequestContext(
             method=m,
@@ -170,7 +241,143 @@ class Router:
             query=query,
             headers=headers,
             body=body,
-            path_params=matched_params or {},
+            path_params=path_params,
+            timings=timings,
         )
-        status, payload, handler_headers = handler(ctx)
+        return handler, ctx, template, out_headers, lease
+
+    def dispatch(
+        self,
+        *,
+        method: str,
+        path: str,
+        query: Mapping[str, Any],
+        headers: Mapping[str, str],
+        body: Any,
+        request_id: str,
+    ) -> tuple[int, Payload, Headers]:
+        t0 = time.perf_counter()
+        prep = self._prepare(method, path, query, headers, body, request_id)
+        if len(prep) == 3:  # resposta pronta
+            return prep
+        handler, ctx, template, out_headers, lease = prep
+        if lease is None:
+            return self._call(handler, ctx, template, t0, out_headers)
+
+        status = 500
+        try:
+            result = self._call(handler, ctx, template, t0, out_headers)
+            status = result[0]
+        except BaseException:
+            _release(lease, status, ctx.timings)
+            raise
+        return _finish(result, lease, ctx.timings)
+
+    async def dispatch_async(
+        self,
+        *,
+        method: str,
+        path: str,
+        query: Mapping[str, Any],
+        headers: Mapping[str, str],
+        body: Any,
+        request_id: str,
+        run_sync: Callable[..., Awaitable[Any]],
+    ) -> tuple[int, Payload, Headers]:
+        """
+        Versão para o adaptador ASGI: handler `async def` é aguardado no event loop;
+        handler síncrono (todos os que fazem I/O com o httpx.Client) roda em
+        `run_sync` (threadpool), sem bloquear o loop.
+        """
+        t0 = time.perf_counter()
+        prep = self._prepare(method, path, query, headers, body, request_id)
+        if len(prep) == 3:  # resposta pronta
+            return prep
+        handler, ctx, template, out_headers, lease = prep
+
+        status = 500
+        try:
+            if isinstance(handler, LazyHandler):
+                # 1º request importa o módulo do handler: fora do event loop
+                handler = handler._handler or await run_sync(handler.resolve)
+
+            _mark_route(ctx.timings, template, t0)
+            with timing.span("handler"):
+                if inspect.iscoroutinefunction(handler):
+                    status, payload, handler_headers = await handler(ctx)
+                else:
+                    status, payload, handler_headers = await run_sync(handler, ctx)
+        except BaseException:
+            if lease is not None:
+                _release(lease, status, ctx.timings)
+            raise
+        result = status, payload, {**out_headers, **(handler_headers or {})}
+        return result if lease is None else _finish(result, lease, ctx.timings)
+
+    def _call(
+        self, handler: Handler, ctx: RequestContext, template: str, t0: float, out_headers: Headers
+    ) -> tuple[int, Payload, Headers]:
+        if ctx.timings is None:
+            result = handler(ctx)
+            if type(result) is not tuple:
+                result = _run_awaitable(result)
+        else:
+            _mark_route(ctx.timings, template, t0)
+            with ctx.timings.span("handler"):
+                result = handler(ctx)
+                if type(result) is not tuple:
+                    result = _run_awaitable(result)
+        status, payload, handler_headers = result
         return status, payload, {**out_headers, **(handler_headers or {})}
+
+
+def _mark_route(timings: RequestTimings | None, template: str, t0: float) -> None:
+    if timings is not None:
+        timings.route = template
+        timings.add("route", (time.perf_counter() - t0) * 1000)
+
+
+def _release(lease: Lease, status: int, timings: RequestTimings | None, *, streamed: bool = False) -> None:
+    lease.release(status=status, upstream_calls=_upstream_calls(timings), streamed=streamed)
+
+
+def _finish(
+    result: tuple[int, Payload, Headers], lease: Lease, timings: RequestTimings | None
+) -> tuple[int, Payload, Headers]:
+    """Envelope: devolve o lease já. Streaming (NDJSON do /export): só quando o corpo termina."""
+    status, payload, headers = result
+    if isinstance(payload, dict):
+        _release(lease, status, timings)
+        return result
+    return status, _leased_body(payload, lease, status, timings), headers
+
+
+def _leased_body(
+    body: Iterable[bytes], lease: Lease, status: int, timings: RequestTimings | None
+) -> Iterator[bytes]:
+    # finally roda no fim do stream, no close() do servidor (cliente desconectou) ou no GC
+    try:
+        yield from body
+    finally:
+        _release(lease, status, timings, streamed=True)
+
+
+def _upstream_calls(timings: RequestTimings | None) -> int | None:
+    # None = sem spans (router chamado direto): não dá para saber se veio de cache
+    if timings is None:
+        return None
+    stat = timings.spans.get("upstream")
+    return 0 if stat is None else stat.count
+
+
+def _run_awaitable(result: Any) -> tuple[int, Payload, Headers]:
+    # handler `async def` servido pelo entrypoint WSGI: roda num loop próprio
+    if not inspect.isawaitable(result):
+        return result
+    import asyncio
+
+    return asyncio.run(_await(result))
+
+
+async def _await(awaitable: Awaitable[Any]) -> Any:
+    return await awaitable
@@ -3,10 +3,9 @@ from __future__ import annotations
 
 from typing import Any
 
+from app.pagination import UPSTREAM_PAGE_SIZE, Cursor, PaginationError
 from clients.swapi import SwapiClient, SwapiNotFound
 
-UPSTREAM_PAGE_SIZE = 10  # SWAPI é fixa em 10
-
 
 def _to_int(v: Any) -> int | None:
     if isinstance(v, int):
@@ -16,6 +15,13 @@ def _to_int(v: Any) -> int | None:
     return None
 
 
+def upstream_pages(page: int, page_size: int) -> range:
+    """Páginas da SWAPI (de 10) que cobrem a janela (page, page_size)."""
+    start = (page - 1) * page_size
+    end = start + page_size
+    return range((start // UPSTREAM_PAGE_SIZE) + 1, ((end - 1) // UPSTREAM_PAGE_SIZE) + 2)
+
+
 def fetch_window(
     client: SwapiClient,
     resource: str,
@@ -33,15 +39,13 @@ def fetch_window(
       Para listagens, isso significa "fim da lista".
     """
     start = (page - 1) * page_size
-    end = start + page_size
-
-    up_start = (start // UPSTREAM_PAGE_SIZE) + 1
-    up_end = ((end - 1) // UPSTREAM_PAGE_SIZE) + 1
+    pages = upstream_pages(page, page_size)
+    up_start = pages.start
 
     collected: list[dict[str, Any]] = []
     total: int | None = None
 
-    for up_page in range(up_start, up_end + 1):
+    for up_page in pages:
         params: dict[str, Any] = {"page": up_page}
         if search:
             params["search"] = search
@@ -66,3 +70,61 @@ def fetch_window(
     offset = start - (up_start - 1) * UPSTREAM_PAGE_SIZE
     window = collected[offset : offset + page_size]
     return window, total
+
+
+def fetch_cursor_window(
+    client: SwapiClient,
+    resource: str,
+    *,
+    cursor: Cursor,
+    page_size: int,
+) -> tuple[list[dict[str, Any]], int | None, Cursor | None]:
+    """
+    Variante por cursor: começa exatamente em (up_page, offset) e devolve
+    (items, total_count, next_cursor). next_cursor é None no fim da lista.
+
+    A página upstream parcialmente consumida volta a ser lida no próximo hop;
+    com o cache de páginas do client (page_cache_ttl) ela não vai ao upstream de novo.
+    """
+    end = cursor.offset + page_size
+    up_end = cursor.up_page + (end - 1) // UPSTREAM_PAGE_SIZE
+
+    collected: list[dict[str, Any]] = []
+    total: int | None = None
+    exhausted = False
+
+    for up_page in range(cursor.up_page, up_end + 1):
+        params: dict[str, Any] = {"page": up_page}
+        if cursor.search:
+            params["search"] = cursor.search
+
+        try:
+            data = client.get(resource, params=params)
+        except SwapiNotFound:
+            if up_page == cursor.up_page:
+                raise
+            exhausted = True
+            break
+
+        if total is None:
+            total = _to_int(data.get("count"))
+            if cursor.snapshot is not None and total is not None and total != cursor.snapshot:
+                raise PaginationError("cursor is stale")
+
+        results = data.get("results") or []
+        collected.extend(results)
+
+        # SWAPI sinaliza a última página com next=null
+        if not results or ("next" in data and not data["next"]):
+            exhausted = True
+            break
+
+    window = collected[cursor.offset : cursor.offset + page_size]
+
+    next_pos = cursor.position + len(window)
+    if not window or (exhausted and cursor.offset + len(window) >= len(collected)):
+        return window, total, None
+    if total is not None and next_pos >= total:
+        return window, total, None
+
+    return window, total, Cursor.at(next_pos, search=cursor.search, snapshot=total)
@@ -0,0 +1,126 @@
+# src/app/warmup.py
+# Warm-up pós cold start: replica in-process os requests mais quentes pelo
+# próprio router, então abre o pool httpx (DNS/TLS) e preenche exatamente os
+# caches que os handlers usam (páginas, recurso pai e fan-out dos correlacionados).
+#
+# Gerar manifest a partir do log de requests (linhas JSON de observability.timing):
+#   PYTHONPATH=src python -m app.warmup requests.log --top 20 > src/app/warmup_manifest.json
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable
+from urllib.parse import parse_qsl, urlsplit
+
+from app.concurrency import run_bounded
+from app.router import Router
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "warmup_manifest.json")
+DEFAULT_TOP_N = 20
+MODES = ("off", "import", "first_request")
+
+
+@dataclass(frozen=True)
+class WarmupReport:
+    attempted: int
+    ok: int
+    failed: int
+    duration_ms: float
+
+
+def load_manifest(path: str | None = None, *, top_n: int = DEFAULT_TOP_N) -> list[str]:
+    """
+    Manifest: `{"paths": [...]}` (ou lista pura), já em ordem de prioridade.
+    Arquivo ausente/inválido => lista vazia (warm-up nunca impede o boot).
+    """
+    try:
+        with open(path or DEFAULT_MANIFEST, encoding="utf-8") as fh:
+            raw = json.load(fh)
+    except (OSError, ValueError):
+        return []
+    paths = raw.get("paths", []) if isinstance(raw, dict) else raw
+    return [p for p in paths if isinstance(p, str) and p.startswith("/")][: max(0, top_n)]
+
+
+def manifest_from_log(lines: Iterable[str], *, top_n: int = DEFAULT_TOP_N) -> list[str]:
+    """Top-N `path?query` de GETs 200 no log estruturado por request."""
+    counts: Counter[str] = Counter()
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(entry, dict) or entry.get("method") != "GET" or entry.get("status") != 200:
+            continue
+        path = entry.get("path")
+        if not isinstance(path, str) or path.startswith(("/health", "/metrics", "/export")):
+            continue
+        query = entry.get("query") or ""
+        counts[f"{path}?{query}" if query else path] += 1
+    return [p for p, _ in counts.most_common(top_n)]
+
+
+def warm(router: Router, paths: Iterable[str], *, max_workers: int = 4) -> WarmupReport:
+    """Despacha cada path pelo router (sem HTTP); erros contam como falha e seguem."""
+    paths = list(paths)
+    t0 = time.perf_counter()
+
+    def one(path: str) -> bool:
+        parts = urlsplit(path)
+        try:
+            status, _, _ = router.dispatch(
+                method="GET",
+                path=parts.path,
+                query=dict(parse_qsl(parts.query)),
+                headers={"x-request-id": "warmup"},
+                body=None,
+                request_id="warmup",
+            )
+        except Exception:  # noqa: BLE001 - warm-up é best effort
+            return False
+        return status < 400
+
+    results = run_bounded(one, paths, max_workers=max_workers) if paths else []
+    ok_count = sum(1 for r in results if r)
+    return WarmupReport(
+        attempted=len(paths),
+        ok=ok_count,
+        failed=len(paths) - ok_count,
+        duration_ms=round((time.perf_counter() - t0) * 1000, 2),
+    )
+
+
+def start_background(router: Router, paths: list[str], *, max_workers: int = 4) -> threading.Thread:
+    """Warm-up em thread daemon: o request/import que disparou não espera."""
+    t = threading.Thread(
+        target=warm, args=(router, paths), kwargs={"max_workers": max_workers}, name="warmup", daemon=True
+    )
+    t.start()
+    return t
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Gera o manifest de warm-up a partir do log de requests")
+    parser.add_argument("log", nargs="?", help="arquivo com uma linha JSON por request (default: stdin)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_N)
+    args = parser.parse_args(argv)
+
+    if args.log:
+        with open(args.log, encoding="utf-8") as fh:
+            paths = manifest_from_log(fh, top_n=args.top)
+    else:
+        paths = manifest_from_log(sys.stdin, top_n=args.top)
+
+    json.dump({"paths": paths}, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,208 @@
+# src/clients/fair_queue.py
+# Fila justa ponderada (por x-api-key) na frente das chamadas à SWAPI.
+#
+# O pool upstream é um só por instância: um consumidor fazendo export ou
+# fan-out largo ocupava todas as conexões e os demais esperavam atrás dele.
+# Aqui cada envio ao upstream pede um slot:
+# - `capacity` slots no total (tipicamente o max_connections do pool)
+# - cada chave tem peso (default 1) e, opcionalmente, um teto de slots simultâneos
+# - com fila, o próximo slot vai para o pedido de menor tag virtual
+#   (tag = max(tempo virtual, última tag da chave) + 1/peso): uma chave com
+#   peso 2 recebe ~2× os slots de uma de peso 1 enquanto ambas têm demanda,
+#   e quem chega atrás de um lote grande não espera o lote inteiro
+# - esperou mais que `max_wait`: SwapiTimeout (vira 504 no handler)
+#
+# A chave vem do request via contextvar (`activate`), herdada pelas threads do
+# fan-out (run_bounded copia o contexto). Hit de cache nunca chega aqui.
+from __future__ import annotations
+
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Mapping
+
+from observability import metrics
+
+ANONYMOUS = "anonymous"
+
+_caller: contextvars.ContextVar[str] = contextvars.ContextVar("swapi_caller", default=ANONYMOUS)
+
+
+def current_caller() -> str:
+    return _caller.get()
+
+
+@contextmanager
+def activate(api_key: str | None) -> Iterator[str]:
+    """Chamadas upstream dentro do bloco contam para `api_key` (vazio/None = anônimo)."""
+    key = (api_key or "").strip() or ANONYMOUS
+    token = _caller.set(key)
+    try:
+        yield key
+    finally:
+        _caller.reset(token)
+
+
+def _parse_map(raw: str | None, cast: type) -> dict:
+    # "chaveA:3,chaveB:0.5" -> {"chaveA": 3, "chaveB": 0.5}
+    out = {}
+    for part in (raw or "").split(","):
+        name, sep, value = part.strip().rpartition(":")
+        if sep and name:
+            out[name] = cast(value)
+    return out
+
+
+class _Ticket:
+    __slots__ = ("tag", "seq", "key", "granted", "cancelled")
+
+    def __init__(self, tag: float, seq: int, key: str) -> None:
+        self.tag = tag
+        self.seq = seq
+        self.key = key
+        self.granted = False
+        self.cancelled = False
+
+    def __lt__(self, other: _Ticket) -> bool:
+        return (self.tag, self.seq) < (other.tag, other.seq)
+
+
+@dataclass
+class FairQueue:
+    capacity: int = 20
+    weights: Mapping[str, float] = field(default_factory=dict)
+    caps: Mapping[str, int] = field(default_factory=dict)
+    default_weight: float = 1.0
+    # teto de slots simultâneos por chave sem entrada em `caps`; None = capacity
+    default_cap: int | None = None
+    max_wait: float = 10.0
+
+    _cond: threading.Condition = field(default_factory=threading.Condition, init=False, repr=False)
+    _active: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _active_total: int = field(default=0, init=False, repr=False)
+    _last_tag: dict[str, float] = field(default_factory=dict, init=False, repr=False)
+    _vtime: float = field(default=0.0, init=False, repr=False)
+    _waiters: list[_Ticket] = field(default_factory=list, init=False, repr=False)
+    _seq: itertools.count = field(default_factory=itertools.count, init=False, repr=False)
+
+    @classmethod
+    def from_env(cls, *, capacity: int, environ: Mapping[str, str] = os.environ) -> FairQueue | None:
+        """FAIR_QUEUE=off desliga; FAIR_QUEUE_WEIGHTS / FAIR_QUEUE_CAPS no formato `chave:valor,...`."""
+        if environ.get("FAIR_QUEUE", "on").strip().lower() in ("0", "off", "false", "no"):
+            return None
+        default_cap = environ.get("FAIR_QUEUE_KEY_CAP")
+        return cls(
+            capacity=capacity,
+            weights=_parse_map(environ.get("FAIR_QUEUE_WEIGHTS"), float),
+            caps=_parse_map(environ.get("FAIR_QUEUE_CAPS"), int),
+            default_cap=int(default_cap) if default_cap else None,
+            max_wait=float(environ.get("FAIR_QUEUE_MAX_WAIT", "10")),
+        )
+
+    def weight(self, key: str) -> float:
+        return max(1e-3, float(self.weights.get(key, self.default_weight)))
+
+    def cap(self, key: str) -> int:
+        cap = self.caps.get(key, self.default_cap)
+        return self.capacity if cap is None else max(1, min(int(cap), self.capacity))
+
+    # ---------- slots ----------
+    @contextmanager
+    def slot(self, key: str | None = None) -> Iterator[None]:
+        key = key or current_caller()
+        self.acquire(key)
+        try:
+            yield
+        finally:
+            self.release(key)
+
+    def acquire(self, key: str) -> None:
+        # import tardio: clients.swapi importa este módulo
+        from clients.swapi import SwapiTimeout
+
+        with self._cond:
+            tag = max(self._vtime, self._last_tag.get(key, 0.0)) + 1.0 / self.weight(key)
+            self._last_tag[key] = tag
+            if not self._waiters and self._has_room(key):
+                self._grant(key, tag)
+                return
+
+            ticket = _Ticket(tag, next(self._seq), key)
+            heapq.heappush(self._waiters, ticket)
+            self._dispatch()
+            t0 = time.monotonic()
+            deadline = t0 + self.max_wait
+            while not ticket.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    ticket.cancelled = True
+                    self._forget_idle(key)
+                    metrics.FAIR_QUEUE_TIMEOUTS.inc()
+                    raise SwapiTimeout("Timed out waiting for upstream capacity")
+                self._cond.wait(remaining)
+            metrics.FAIR_QUEUE_WAIT.observe(time.monotonic() - t0)
+
+    def release(self, key: str) -> None:
+        with self._cond:
+            self._active_total -= 1
+            n = self._active.get(key, 1) - 1
+            if n:
+                self._active[key] = n
+            else:
+                self._active.pop(key, None)
+            self._dispatch()
+            self._forget_idle(key)
+
+    def _forget_idle(self, key: str) -> None:
+        # chave vem de header (input livre): sem slot nem ticket na fila, a última tag não
+        # importa mais (chave "nova" começa no tempo virtual atual) e sai do dict
+        if key in self._active or key not in self._last_tag:
+            return
+        if any(t.key == key and not t.cancelled for t in self._waiters):
+            return
+        del self._last_tag[key]
+
+    def _has_room(self, key: str) -> bool:
+        return self._active_total < self.capacity and self._active.get(key, 0) < self.cap(key)
+
+    def _grant(self, key: str, tag: float) -> None:
+        self._active_total += 1
+        self._active[key] = self._active.get(key, 0) + 1
+        self._vtime = max(self._vtime, tag - 1.0 / self.weight(key))
+
+    def _dispatch(self) -> None:
+        # menor tag primeiro; chave no teto fica na fila sem bloquear as outras
+        held: list[_Ticket] = []
+        granted = False
+        while self._waiters and self._active_total < self.capacity:
+            ticket = heapq.heappop(self._waiters)
+            if ticket.cancelled:
+                continue
+            if not self._has_room(ticket.key):
+                held.append(ticket)
+                continue
+            ticket.granted = True
+            self._grant(ticket.key, ticket.tag)
+            granted = True
+        for ticket in held:
+            heapq.heappush(self._waiters, ticket)
+        if granted:
+            self._cond.notify_all()
+
+    def state(self) -> dict[str, object]:
+        with self._cond:
+            waiting: dict[str, int] = {}
+            for t in self._waiters:
+                if not t.cancelled:
+                    waiting[t.key] = waiting.get(t.key, 0) + 1
+            return {
+                "capacity": self.capacity,
+                "active": self._active_total,
+                "keys": len(self._active),
+                "waiting": sum(waiting.values()),
+            }
@@ -0,0 +1,100 @@
+# src/clients/id_index.py
+# Índice de ids existentes por recurso SWAPI (bitmap), para responder
+# "não existe" sem ir ao upstream.
+#
+# O espaço de ids da SWAPI tem buracos (people/17 não existe) e scanners /
+# links quebrados pedem ids inválidos o tempo todo; cada um custava uma chamada
+# upstream (+ retries) até virar 404. O bitmap é montado com o que já passa pelo
+# client: páginas de listagem sem `search` (trazem `count`), detalhes e seeds.
+#
+# Só responde "não existe" quando o recurso está completo: bits marcados >=
+# `count` da listagem. Antes disso (ou se o `count` mudar) nada é negado.
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from clients.urls import url_ref
+
+_DETAIL_RE = re.compile(r"^/?(?P<resource>[a-z]+)/(?P<id>\d+)/?$")
+_COLLECTION_RE = re.compile(r"^/?(?P<resource>[a-z]+)/?$")
+
+
+def detail_ref(path: str) -> tuple[str, int] | None:
+    """`films/3/` -> ("films", 3); qualquer outra coisa -> None."""
+    m = _DETAIL_RE.match(path)
+    return (m.group("resource"), int(m.group("id"))) if m else None
+
+
+def collection_of(path: str) -> str | None:
+    """`people/` -> "people" (página de listagem); detalhe/outros -> None."""
+    m = _COLLECTION_RE.match(path)
+    return m.group("resource") if m else None
+
+
+@dataclass
+class _Bitmap:
+    expected: int | None = None
+    size: int = 0
+    bits: bytearray = field(default_factory=bytearray)
+
+    def add(self, item_id: int) -> None:
+        byte, bit = divmod(item_id, 8)
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte + 1 - len(self.bits)))
+        mask = 1 << bit
+        if not self.bits[byte] & mask:
+            self.bits[byte] |= mask
+            self.size += 1
+
+    def has(self, item_id: int) -> bool:
+        byte, bit = divmod(item_id, 8)
+        return byte < len(self.bits) and bool(self.bits[byte] & (1 << bit))
+
+    @property
+    def complete(self) -> bool:
+        return self.expected is not None and self.size >= self.expected
+
+
+class IdIndex:
+    def __init__(self) -> None:
+        self._maps: dict[str, _Bitmap] = {}
+        self._lock = threading.Lock()
+
+    def add(self, resource: str, item_id: int) -> None:
+        with self._lock:
+            self._maps.setdefault(resource, _Bitmap()).add(item_id)
+
+    def observe_page(self, resource: str, data: Mapping[str, Any]) -> None:
+        """Página de listagem SEM `search` (o `count` dela é o total do recurso)."""
+        count = data.get("count")
+        with self._lock:
+            bm = self._maps.setdefault(resource, _Bitmap())
+            if isinstance(count, int) and count != bm.expected:
+                # dataset mudou (ou 1ª página vista): recomeça, completo só quando rever tudo
+                if bm.expected is not None:
+                    bm = self._maps[resource] = _Bitmap()
+                bm.expected = count
+            for rec in data.get("results") or []:
+                url = rec.get("url") if isinstance(rec, dict) else None
+                ref = url_ref(url) if isinstance(url, str) else None
+                if ref is not None and ref[0] == resource:
+                    bm.add(ref[1])
+
+    def missing(self, resource: str, item_id: int) -> bool:
+        """True só com o recurso inteiro conhecido e o id fora dele."""
+        bm = self._maps.get(resource)
+        return bm is not None and bm.complete and not bm.has(item_id)
+
+    def state(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {"ids": bm.size, "expected": bm.expected, "complete": bm.complete, "bytes": len(bm.bits)}
+                for name, bm in sorted(self._maps.items())
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._maps.clear()
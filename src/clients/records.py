@@ -0,0 +1,152 @@
+# src/clients/records.py
+# Representação compacta de registros SWAPI guardados nos caches do client.
+#
+# Um dict da SWAPI repete em cada registro as mesmas ~15 chaves e dezenas de
+# URLs absolutas (ex.: "https://swapi.dev/api/films/1/" em toda pessoa). Aqui:
+# - chaves + tipo de cada campo ficam num `RecordShape` compartilhado (internado)
+# - campo URL vira o id (int); lista homogênea de URLs vira array('I') de ids
+# - strings curtas repetidas ("unknown", "male", datas) são internadas
+# A URL é reconstituída só na leitura (`to_dict`), que devolve um dict novo.
+from __future__ import annotations
+
+import re
+import sys
+import threading
+from array import array
+from typing import Any
+
+from clients.utils import SWAPI_RESOURCES
+
+JsonDict = dict[str, Any]
+
+# strings até esse tamanho são internadas (valores categóricos, datas, números como texto)
+INTERN_MAX_LEN = 40
+
+_URL_RE = re.compile(r"^(?P<base>https?://[^?#]+?)/(?P<resource>[a-z]+)/(?P<id>\d+)/$")
+
+# tipo de campo: RAW (valor como veio), URL (id int), URLS (array de ids)
+RAW, URL, URLS = 0, 1, 2
+
+
+class RecordShape:
+    """Chaves + como cada valor está codificado; uma instância por formato distinto."""
+
+    __slots__ = ("base", "keys", "kinds", "resources")
+
+    def __init__(self, base: str, keys: tuple[str, ...], kinds: tuple[int, ...], resources: tuple[str, ...]) -> None:
+        self.base = base
+        self.keys = keys
+        self.kinds = kinds
+        self.resources = resources
+
+
+class CompactRecord:
+    __slots__ = ("shape", "values")
+
+    def __init__(self, shape: RecordShape, values: tuple[Any, ...]) -> None:
+        self.shape = shape
+        self.values = values
+
+    def to_dict(self) -> JsonDict:
+        shape = self.shape
+        base = shape.base
+        out: JsonDict = {}
+        for key, kind, resource, value in zip(shape.keys, shape.kinds, shape.resources, self.values):
+            if kind == URL:
+                out[key] = f"{base}/{resource}/{value}/"
+            elif kind == URLS:
+                prefix = f"{base}/{resource}/"
+                out[key] = [f"{prefix}{i}/" for i in value]
+            elif isinstance(value, list):
+                out[key] = list(value)  # quem recebe pode mutar sem sujar o cache
+            else:
+                out[key] = value
+        return out
+
+
+_shapes: dict[tuple[Any, ...], RecordShape] = {}
+_shapes_lock = threading.Lock()
+
+
+def _shape(base: str, keys: tuple[str, ...], kinds: tuple[int, ...], resources: tuple[str, ...]) -> RecordShape:
+    sig = (base, keys, kinds, resources)
+    shape = _shapes.get(sig)
+    if shape is None:
+        with _shapes_lock:
+            shape = _shapes.setdefault(
+                sig, RecordShape(sys.intern(base), tuple(sys.intern(k) for k in keys), kinds, resources)
+            )
+    return shape
+
+
+def _split_url(value: Any, prefix: str) -> tuple[str, int] | None:
+    """`{prefix}{resource}/{id}/` -> (resource, id); sem regex (roda para todo valor)."""
+    if not isinstance(value, str) or not value.startswith(prefix):
+        return None
+    parts = value[len(prefix) :].split("/")
+    if len(parts) != 3 or parts[2] != "" or not parts[1].isdigit() or parts[0] not in SWAPI_RESOURCES:
+        return None
+    return parts[0], int(parts[1])
+
+
+def pack(record: JsonDict) -> CompactRecord | JsonDict:
+    """
+    Compacta um registro SWAPI (precisa de `url` próprio para saber a base).
+    Qualquer coisa fora do formato esperado volta intacta.
+    """
+    own = record.get("url")
+    m = _URL_RE.match(own) if isinstance(own, str) else None
+    if m is None:
+        return record
+    base = m.group("base")
+    prefix = base + "/"
+
+    keys: list[str] = []
+    kinds: list[int] = []
+    resources: list[str] = []
+    values: list[Any] = []
+    for key, value in record.items():
+        kind, resource, packed = RAW, "", value
+
+        ref = _split_url(value, prefix)
+        if ref is not None:
+            kind, resource, packed = URL, ref[0], ref[1]
+        elif isinstance(value, list) and value:
+            refs = [_split_url(v, prefix) for v in value]
+            if all(r is not None for r in refs) and len({r[0] for r in refs}) == 1:  # type: ignore[index]
+                kind, resource = URLS, refs[0][0]  # type: ignore[index]
+                packed = array("I", (r[1] for r in refs))  # type: ignore[index]
+            else:
+                packed = [sys.intern(v) if isinstance(v, str) and len(v) <= INTERN_MAX_LEN else v for v in value]
+        elif isinstance(value, list):
+            packed = []
+        elif isinstance(value, str) and len(value) <= INTERN_MAX_LEN:
+            packed = sys.intern(value)
+
+        keys.append(key)
+        kinds.append(kind)
+        resources.append(resource)
+        values.append(packed)
+
+    return CompactRecord(_shape(base, tuple(keys), tuple(kinds), tuple(resources)), tuple(values))
+
+
+def compact(payload: Any) -> Any:
+    """Valor a guardar no cache: registro único ou página (`results` compactados)."""
+    if not isinstance(payload, dict):
+        return payload
+    results = payload.get("results")
+    if isinstance(results, list):
+        return {**payload, "results": [pack(r) if isinstance(r, dict) else r for r in results]}
+    return pack(payload)
+
+
+def expand(stored: Any) -> Any:
+    """Inverso de `compact`: sempre devolve estruturas novas (o cache não é mutável por fora)."""
+    if isinstance(stored, CompactRecord):
+        return stored.to_dict()
+    if isinstance(stored, dict):
+        results = stored.get("results")
+        if isinstance(results, list):
+            return {**stored, "results": [expand(r) for r in results]}
+    return stored
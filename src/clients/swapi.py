@@ -1,14 +1,68 @@
 # src/clients/swapi.py
 from __future__ import annotations
 
+import contextlib
+import importlib.util
+import logging
+import re
+import threading
 import time
-from dataclasses import dataclass, field
-from typing import Any, Callable, Mapping
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping
 
-import httpx
+from clients import records, urls
+from clients.fair_queue import FairQueue
+from clients.id_index import IdIndex, collection_of, detail_ref
+from clients.utils import SWAPI_RESOURCES
+from observability import heavy_hitters, metrics, timing
+
+if TYPE_CHECKING:
+    import httpx
 
 JsonDict = dict[str, Any]
 
+_RESOURCE_RE = re.compile(r"(?:^|/)(?P<resource>[a-z]+)/(?:\d+/?)?(?:\?.*)?$")
+
+
+def _resource_label(url_or_path: str) -> str:
+    """Label de métrica com cardinalidade fixa: recurso SWAPI ou 'other'."""
+    m = _RESOURCE_RE.search(url_or_path)
+    resource = m.group("resource") if m else ""
+    return resource if resource in SWAPI_RESOURCES else "other"
+
+
+# janela de chamadas recentes usada em latency_summary()
+RECENT_CALLS = 256
+
+logger = logging.getLogger("swapi.client")
+
+
+def _page_key(path: str, params: Mapping[str, Any] | None) -> str:
+    # path já normalizado ("people/", "films/1/")
+    return f"path=/{path}|params={tuple(sorted((params or {}).items()))}"
+
+
+# métodos que podem ser reenviados sem efeito colateral
+_IDEMPOTENT = frozenset({"GET", "HEAD", "OPTIONS"})
+# trace do httpcore ao abrir conexão (TCP ou unix socket)
+_CONNECT_EVENTS = ("connection.connect_tcp.", "connection.connect_unix_socket.")
+
+
+def _stale_connection_errors() -> tuple[type[Exception], ...]:
+    """
+    Falhas típicas de keep-alive fechado pelo servidor enquanto ocioso: "Server
+    disconnected without sending a response", connection reset/broken pipe.
+    """
+    import httpx
+
+    return (httpx.RemoteProtocolError, httpx.ReadError, httpx.WriteError)
+
+
+def _http2_available() -> bool:
+    # HTTP/2 no httpx depende do pacote opcional `h2` (pip install "httpx[http2]")
+    return importlib.util.find_spec("h2") is not None
+
 
 class SwapiError(Exception):
     """Base para erros do client SWAPI."""
@@ -42,24 +96,77 @@ class RetryConfig:
 class _TtlCache:
     ttl_seconds: float
     now_fn: Callable[[], float]
-    _store: dict[str, tuple[float, JsonDict]] = field(default_factory=dict)
-
-    def get(self, key: str) -> JsonDict | None:
+    name: str = "cache"  # label nas métricas (hits/misses/evictions)
+    # teto de entradas (LRU): chaves vêm de input do usuário (search, ids); None = sem teto
+    max_entries: int | None = None
+    # valor guardado: JsonDict ou forma compacta (clients.records), conforme o client;
+    # OrderedDict (ordem de uso) só com teto, sem teto fica o dict puro do hot path
+    _store: dict[str, tuple[float, Any]] = field(default_factory=dict)
+    # chaves fixadas (hot keys): não expiram por TTL nem saem pelo LRU
+    pinned: frozenset[str] = frozenset()
+
+    def __post_init__(self) -> None:
+        if self.max_entries is not None:
+            self._store = OrderedDict(self._store)
+
+    def get(self, key: str) -> Any | None:
         item = self._store.get(key)
         if not item:
             return None
         ts, val = item
-        if (self.now_fn() - ts) > self.ttl_seconds:
+        if (self.now_fn() - ts) > self.ttl_seconds and key not in self.pinned:
             self._store.pop(key, None)
+            metrics.CACHE_EVICTIONS.inc(self.name)
             return None
+        if self.max_entries is not None:
+            try:
+                self._store.move_to_end(key)  # type: ignore[attr-defined]
+            except KeyError:  # removida por outra thread no meio do caminho
+                pass
         return val
 
-    def set(self, key: str, val: JsonDict) -> None:
+    def set(self, key: str, val: Any) -> None:
         self._store[key] = (self.now_fn(), val)
+        if self.max_entries is None:
+            return
+        try:
+            self._store.move_to_end(key)  # type: ignore[attr-defined]
+        except KeyError:
+            pass
+        self._evict_lru()
+
+    def _evict_lru(self) -> None:
+        store: OrderedDict[str, tuple[float, Any]] = self._store  # type: ignore[assignment]
+        skipped = 0
+        while len(store) > self.max_entries and skipped < len(store):
+            try:
+                key, item = store.popitem(last=False)
+            except KeyError:  # esvaziada por outra thread
+                return
+            if key in self.pinned:
+                store[key] = item  # fixada: volta para o fim
+                skipped += 1
+                continue
+            metrics.CACHE_EVICTIONS.inc(self.name)
+
+    def discard(self, key: str) -> None:
+        self._store.pop(key, None)
 
     def clear(self) -> None:
         self._store.clear()
 
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def timestamps(self) -> list[tuple[str, float]]:
+        """
+        Snapshot (key, ts de gravação) das entradas ainda válidas, para relatórios;
+        list(dict.items()) é atômico sob o GIL. Expiradas (não lidas desde então) ficam de fora.
+        """
+        oldest = self.now_fn() - self.ttl_seconds
+        pinned = self.pinned
+        return [(k, ts) for k, (ts, _) in list(self._store.items()) if ts >= oldest or k in pinned]
+
 
 @dataclass
 class SwapiClient:
@@ -70,49 +177,386 @@ class SwapiClient:
 
     # cache TTL (em segundos) para get_by_url (characters/residents)
     by_url_cache_ttl: float = 300.0  # 5 min (ajuste)
+    # cache TTL para get (páginas de listagem / recurso pai); 0 = desligado
+    page_cache_ttl: float = 0.0
+    # 404 do upstream guardados por esse tempo (get e get_by_url); 0 = desligado
+    negative_cache_ttl: float = 600.0
+    # guarda registros em forma compacta (clients.records): ~1/3 da memória, custo de
+    # reconstituir o dict a cada hit
+    compact_cache: bool = True
+    # teto de entradas por cache (LRU); `search` e ids de /resolve são input livre do usuário
+    cache_max_entries: int = 5000
     now_fn: Callable[[], float] = time.time
 
+    # pool de conexões: HTTP/2 multiplexa o fan-out numa conexão (precisa de `h2`;
+    # sem ele cai para HTTP/1.1); limites explícitos em vez dos defaults do httpx
+    http2: bool = False
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    # sem tráfego upstream por esse tempo (s), conexões ociosas são fechadas antes do próximo
+    # request em vez de arriscar um socket que o servidor já derrubou; 0 = desligado
+    idle_reap_after: float = 15.0
+    # fila justa por x-api-key na frente dos envios (clients.fair_queue); perfis compartilham
+    fair_queue: FairQueue | None = None
+
     _http: httpx.Client | None = field(default=None, init=False, repr=False)
+    # perfis (with_profile) apontam para o client raiz: pool, caches e janela de latência são dele
+    _root: SwapiClient | None = field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    # monotonic do fim da última chamada upstream (base do reaping por ociosidade)
+    _last_activity: float = field(default=0.0, init=False, repr=False, compare=False)
+    # chamadas lógicas em andamento (todos os perfis); o prefetch cede quando há tráfego
+    _inflight: int = field(default=0, init=False, repr=False, compare=False)
+    _pinned: frozenset[str] = field(default=frozenset(), init=False, repr=False, compare=False)
     _by_url_cache: _TtlCache | None = field(default=None, init=False, repr=False)
+    _page_cache: _TtlCache | None = field(default=None, init=False, repr=False)
+    _negative_cache: _TtlCache | None = field(default=None, init=False, repr=False)
+    # ids existentes por recurso (clients.id_index): "não existe" sem ir ao upstream
+    _ids: IdIndex = field(default_factory=IdIndex, init=False, repr=False, compare=False)
+    # últimas chamadas upstream (monotonic, segundos, outcome) para o readiness
+    _recent: deque = field(default_factory=lambda: deque(maxlen=RECENT_CALLS), init=False, repr=False)
+
+    def with_profile(self, *, timeout: float | None = None, retry: RetryConfig | None = None) -> SwapiClient:
+        """
+        Mesmo upstream, outra política (ex.: fail-fast do fan-out): compartilha pool de
+        conexões, caches e métricas do client raiz; só timeout/retry mudam.
+        """
+        root = self._root or self
+        profile = replace(
+            root,
+            timeout=root.timeout if timeout is None else timeout,
+            retry=root.retry if retry is None else retry,
+        )
+        profile._root = root
+        profile._recent = root._recent
+        return profile
 
     def _get_client(self) -> httpx.Client:
+        if self._root is not None:
+            return self._root._get_client()
         if self._http is None:
-            self._http = httpx.Client(
-                base_url=self.base_url.rstrip("/"),
-                timeout=httpx.Timeout(self.timeout),
-                headers={"Accept": "application/json"},
-            )
+            with self._lock:  # 1º request do fan-out: várias threads chegam juntas
+                if self._http is None:
+                    self._http = self._build_http()
         return self._http
 
+    def _build_http(self) -> httpx.Client:
+        # httpx (+ certifi/ssl) só entra na 1ª chamada upstream, não no import
+        import httpx
+
+        http2 = self.http2
+        if http2 and not _http2_available():
+            logger.warning("http2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        return httpx.Client(
+            base_url=self.base_url.rstrip("/"),
+            timeout=httpx.Timeout(self.timeout),
+            headers={"Accept": "application/json"},
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+
+    def pin(self, keys: Iterable[str]) -> list[str]:
+        """
+        Fixa chaves de cache (página `path=...|params=...` ou URL canônica): entradas
+        presentes ou futuras com essas chaves não expiram. Substitui o conjunto anterior.
+        """
+        if self._root is not None:
+            return self._root.pin(keys)
+        pinned = frozenset(keys)
+        self._get_by_url_cache().pinned = pinned
+        page = self._get_page_cache()
+        if page is not None:
+            page.pinned = pinned
+        self._pinned = pinned
+        return sorted(pinned)
+
+    def pinned(self) -> list[str]:
+        return sorted((self._root or self)._pinned)
+
+    def inflight(self) -> int:
+        """Chamadas upstream em andamento no client raiz (inclui perfis)."""
+        return (self._root or self)._inflight
+
+    def _track_inflight(self, delta: int) -> None:
+        root = self._root or self
+        with root._lock:
+            root._inflight += delta
+
+    def cache_entries(self) -> dict[str, int]:
+        """Entradas atuais por cache (inclusive expiradas ainda não removidas)."""
+        if self._root is not None:
+            return self._root.cache_entries()
+        page = self._page_cache
+        negative = self._negative_cache
+        return {
+            "by_url": len(self._by_url_cache) if self._by_url_cache is not None else 0,
+            "page": len(page) if page is not None else 0,
+            "negative": len(negative) if negative is not None else 0,
+        }
+
+    def id_index_state(self) -> dict[str, dict[str, Any]]:
+        """Por recurso: ids conhecidos, `count` esperado e se o bitmap já nega ids."""
+        return (self._root or self)._ids.state()
+
+    def cache_warmth(self) -> dict[str, dict[str, Any]]:
+        """
+        Por recurso SWAPI: entradas válidas em cache (páginas + itens por URL) e idade
+        da mais antiga/mais nova, em segundos. O scan é limitado por `cache_max_entries`.
+        """
+        if self._root is not None:
+            return self._root.cache_warmth()
+        now = self.now_fn()
+        out: dict[str, dict[str, Any]] = {}
+        for cache in (self._page_cache, self._by_url_cache):
+            if cache is None:
+                continue
+            for key, ts in cache.timestamps():
+                # página: "path=/people/|params=..."; item: URL canônica (clients.urls.cache_key)
+                target = key.split("|", 1)[0].removeprefix("path=")
+                info = out.setdefault(
+                    _resource_label(target), {"entries": 0, "oldest_age_s": 0.0, "newest_age_s": None}
+                )
+                age = round(max(0.0, now - ts), 3)
+                info["entries"] += 1
+                info["oldest_age_s"] = max(info["oldest_age_s"], age)
+                info["newest_age_s"] = age if info["newest_age_s"] is None else min(info["newest_age_s"], age)
+        return out
+
+    def pool_state(self) -> dict[str, Any]:
+        """Estado do pool de conexões do httpx (best effort: usa internals do httpcore)."""
+        if self._root is not None:
+            return self._root.pool_state()
+        limits = {"max_connections": self.max_connections, "max_keepalive": self.max_keepalive}
+        if self._http is None:
+            return {"open": False, "connections": 0, "idle": 0, "http2": False, **limits}
+        pool = getattr(getattr(self._http, "_transport", None), "_pool", None)
+        conns = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for c in conns if getattr(c, "is_idle", lambda: False)())
+        http2 = bool(getattr(pool, "_http2", False))
+        return {"open": True, "connections": len(conns), "idle": idle, "http2": http2, **limits}
+
+    def reap_idle(self) -> int:
+        """
+        Fecha as conexões ociosas do pool (best effort: internals do httpcore); as
+        ocupadas seguem intactas. Retorna quantas foram fechadas.
+        """
+        if self._root is not None:
+            return self._root.reap_idle()
+        pool = getattr(getattr(self._http, "_transport", None), "_pool", None)
+        conns = getattr(pool, "_connections", None)
+        if conns is None:
+            return 0
+        with getattr(pool, "_optional_thread_lock", None) or contextlib.nullcontext():
+            idle = [c for c in list(conns) if c.is_idle()]
+            for c in idle:
+                conns.remove(c)
+        for c in idle:
+            try:
+                c.close()
+            except Exception:  # noqa: BLE001 - socket já morto do outro lado
+                pass
+        if idle:
+            metrics.POOL_REAPED.inc(n=len(idle))
+        return len(idle)
+
+    def _reap_if_idle(self) -> None:
+        root = self._root or self
+        last = root._last_activity
+        if root.idle_reap_after > 0 and last and time.monotonic() - last > root.idle_reap_after:
+            root.reap_idle()
+
+    def latency_summary(self) -> dict[str, Any]:
+        """p50/p95/max (ms) e taxa de erro das últimas RECENT_CALLS chamadas upstream."""
+        recent = list(self._recent)
+        if not recent:
+            return {"count": 0, "p50_ms": None, "p95_ms": None, "max_ms": None, "error_rate": None}
+        lat = sorted(sec * 1000 for _, sec, _ in recent)
+        errors = sum(1 for _, _, outcome in recent if outcome not in ("ok", "not_found"))
+
+        def pct(p: float) -> float:
+            return round(lat[min(len(lat) - 1, int(p * (len(lat) - 1) + 0.5))], 2)
+
+        return {
+            "count": len(lat),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(lat[-1], 2),
+            "error_rate": round(errors / len(lat), 4),
+        }
+
     def close(self) -> None:
-        if self._http is not None:
+        # perfil não fecha o pool do raiz
+        if self._root is None and self._http is not None:
             self._http.close()
             self._http = None
 
     def _get_by_url_cache(self) -> _TtlCache:
+        if self._root is not None:
+            return self._root._get_by_url_cache()
         if self._by_url_cache is None:
-            self._by_url_cache = _TtlCache(ttl_seconds=self.by_url_cache_ttl, now_fn=self.now_fn)
+            self._by_url_cache = _TtlCache(
+                ttl_seconds=self.by_url_cache_ttl, now_fn=self.now_fn, name="by_url", max_entries=self.cache_max_entries
+            )
         return self._by_url_cache
 
+    def _get_page_cache(self) -> _TtlCache | None:
+        if self._root is not None:
+            return self._root._get_page_cache()
+        if self.page_cache_ttl <= 0:
+            return None
+        if self._page_cache is None:
+            self._page_cache = _TtlCache(
+                ttl_seconds=self.page_cache_ttl, now_fn=self.now_fn, name="page", max_entries=self.cache_max_entries
+            )
+        return self._page_cache
+
+    def _get_negative_cache(self) -> _TtlCache | None:
+        if self._root is not None:
+            return self._root._get_negative_cache()
+        if self.negative_cache_ttl <= 0:
+            return None
+        if self._negative_cache is None:
+            self._negative_cache = _TtlCache(
+                ttl_seconds=self.negative_cache_ttl,
+                now_fn=self.now_fn,
+                name="negative",
+                max_entries=self.cache_max_entries,
+            )
+        return self._negative_cache
+
     def get(self, resource: str, params: Mapping[str, Any] | None = None) -> JsonDict:
         # normaliza: nunca depender do caller passar / no início
         path = (resource or "").strip().lstrip("/")
         if not path.endswith("/"):
             path += "/"
-        return self._request("GET", f"/{path}", params=params, absolute=False)
+
+        key = _page_key(path, params)
+        heavy_hitters.UPSTREAM.add(key)
+        self._raise_if_known_missing(key, detail_ref(path))
+
+        cache = self._get_page_cache()
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                timing.incr("cache_hit")
+                metrics.CACHE_HITS.inc("page")
+                return self._load(cached)
+            timing.incr("cache_miss")
+            metrics.CACHE_MISSES.inc("page")
+
+        data = self._request_remembering_404(key, "GET", f"/{path}", params=params, absolute=False)
+        self._observe_ids(path, params, data)
+        if cache is not None:
+            cache.set(key, self._store_value(data))
+        return data
 
     def get_by_url(self, url: str, params: Mapping[str, Any] | None = None) -> JsonDict:
-        # cache por URL absoluta + params (params quase sempre None aqui)
+        # cache por URL canônica (+ params, quase sempre None aqui): http/https, alias de
+        # host e trailing slash caem na mesma entrada
         cache = self._get_by_url_cache()
-        key = f"url={url}|params={tuple(sorted((params or {}).items()))}"
+        key = urls.cache_key(url, params)
+        heavy_hitters.UPSTREAM.add(key)
+        ref = urls.url_ref(url)
+        self._raise_if_known_missing(key, ref)
         cached = cache.get(key)
         if cached is not None:
-            return cached
-
-        data = self._request("GET", url, params=params, absolute=True)
-        cache.set(key, data)
+            timing.incr("cache_hit")
+            metrics.CACHE_HITS.inc("by_url")
+            return self._load(cached)
+
+        timing.incr("cache_miss")
+        metrics.CACHE_MISSES.inc("by_url")
+        data = self._request_remembering_404(key, "GET", url, params=params, absolute=True)
+        if ref is not None:
+            (self._root or self)._ids.add(*ref)
+            self._forget_missing(*ref)
+        cache.set(key, self._store_value(data))
         return data
 
+    def _raise_if_known_missing(self, key: str, ref: tuple[str, int] | None) -> None:
+        # bitmap completo do recurso sem o id, ou 404 recente da mesma chave: nada de upstream
+        if ref is not None and (self._root or self)._ids.missing(*ref):
+            metrics.CACHE_HITS.inc("id_index")
+            raise SwapiNotFound(f"SWAPI has no {ref[0]}/{ref[1]}")
+        negative = self._get_negative_cache()
+        if negative is not None and negative.get(key) is not None:
+            metrics.CACHE_HITS.inc("negative")
+            raise SwapiNotFound(f"SWAPI 404 (cached) for {key}")
+
+    def _request_remembering_404(self, key: str, method: str, url_or_path: str, **kwargs: Any) -> JsonDict:
+        try:
+            return self._request(method, url_or_path, **kwargs)
+        except SwapiNotFound:
+            negative = self._get_negative_cache()
+            if negative is not None:
+                negative.set(key, True)
+            raise
+
+    def _forget_missing(self, resource: str, item_id: int) -> None:
+        # o id existe (resposta mais nova que o 404): derruba a entrada negativa nas duas formas de chave
+        negative = self._get_negative_cache()
+        if negative is None or not len(negative):
+            return
+        path = f"{resource}/{item_id}/"
+        negative.discard(_page_key(path, None))
+        negative.discard(urls.cache_key(f"{self.base_url.rstrip('/')}/{path}"))
+
+    def _observe_ids(self, path: str, params: Mapping[str, Any] | None, data: JsonDict) -> None:
+        ids = (self._root or self)._ids
+        ref = detail_ref(path)
+        if ref is not None:
+            ids.add(*ref)
+            self._forget_missing(*ref)
+            return
+        resource = collection_of(path)
+        if resource is None:
+            return
+        # com `search` o `count` é o dos matches, não o do recurso
+        if not (params or {}).get("search"):
+            ids.observe_page(resource, data)
+        negative = self._get_negative_cache()
+        if negative is not None and len(negative):
+            for rec in data.get("results") or []:
+                url = rec.get("url") if isinstance(rec, dict) else None
+                item = urls.url_ref(url) if isinstance(url, str) else None
+                if item is not None:
+                    self._forget_missing(*item)
+
+    def seed(self, records: Iterable[JsonDict]) -> int:
+        """
+        Grava registros já conhecidos (ex.: vindos de páginas) no cache por URL e, com o
+        cache de páginas ligado, como `get("<resource>/<id>/")`; retorna quantos.
+        """
+        by_url = self._get_by_url_cache()
+        pages = self._get_page_cache()
+        n = 0
+        for rec in records:
+            url = rec.get("url")
+            if not isinstance(url, str):
+                continue
+            stored = self._store_value(rec)
+            by_url.set(urls.cache_key(url), stored)
+            ref = urls.url_ref(url)
+            if ref is not None:
+                (self._root or self)._ids.add(*ref)
+                self._forget_missing(*ref)
+            if pages is not None and ref is not None:
+                pages.set(_page_key(f"{ref[0]}/{ref[1]}/", None), stored)
+            n += 1
+        return n
+
+    def _store_value(self, data: JsonDict) -> Any:
+        return records.compact(data) if self.compact_cache else data
+
+    def _load(self, stored: Any) -> JsonDict:
+        return records.expand(stored) if self.compact_cache else stored
+
     def _request(
         self,
         method: str,
@@ -121,12 +565,71 @@ class SwapiClient:
         params: Mapping[str, Any] | None,
         absolute: bool = False,
     ) -> JsonDict:
+        # uma entrada por chamada lógica (retries inclusos): duração, tentativas, último status
+        stats: dict[str, Any] = {"attempts": 0, "status": None, "timeouts": 0, "replays": 0, "outcome": "error"}
+        self._reap_if_idle()
+        self._track_inflight(1)
+        t0 = time.perf_counter()
+        try:
+            data = self._request_with_retries(method, url_or_path, params=params, stats=stats)
+            stats["outcome"] = "ok"
+            return data
+        except SwapiNotFound:
+            stats["outcome"] = "not_found"
+            raise
+        except SwapiTimeout:
+            stats["outcome"] = "timeout"
+            raise
+        except SwapiBadResponse:
+            stats["outcome"] = "bad_response"
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._track_inflight(-1)
+            (self._root or self)._last_activity = time.monotonic()
+            self._recent.append((time.monotonic(), elapsed, stats["outcome"]))
+            resource = _resource_label(url_or_path)
+            metrics.UPSTREAM_CALLS.inc(resource, stats["outcome"])
+            metrics.UPSTREAM_LATENCY.observe(elapsed, resource)
+            if stats["attempts"] > 1:
+                metrics.UPSTREAM_RETRIES.inc(resource, n=stats["attempts"] - 1)
+            if stats["timeouts"]:
+                metrics.UPSTREAM_TIMEOUTS.inc(resource, n=stats["timeouts"])
+            if stats["replays"]:
+                metrics.UPSTREAM_REPLAYS.inc(resource, n=stats["replays"])
+
+            timings = timing.current()
+            if timings is not None:
+                timings.add_upstream_call(
+                    url=url_or_path,
+                    status=stats["status"],
+                    attempts=stats["attempts"],
+                    ms=elapsed * 1000,
+                )
+
+    def _request_with_retries(
+        self,
+        method: str,
+        url_or_path: str,
+        *,
+        params: Mapping[str, Any] | None,
+        stats: dict[str, Any],
+    ) -> JsonDict:
+        import httpx
+
+        stale_errors = _stale_connection_errors()
         last_exc: Exception | None = None
 
         for attempt in range(0, self.retry.max_retries + 1):
+            stats["attempts"] = attempt + 1
+            stats["status"] = None
             try:
-                c = self._get_client()
-                resp = c.request(method, url_or_path, params=params)
+                try:
+                    resp = self._send(method, url_or_path, params=params, stats=stats)
+                except stale_errors as e:
+                    # conexão nova falhou (direto ou no replay): vira erro de upstream (entra no retry)
+                    raise SwapiUpstreamError("Connection error calling SWAPI") from e
+                stats["status"] = resp.status_code
 
                 if resp.status_code == 404:
                     raise SwapiNotFound(f"SWAPI 404 for {resp.request.url}")
@@ -144,6 +647,7 @@ class SwapiClient:
 
             except httpx.TimeoutException as e:
                 last_exc = e
+                stats["timeouts"] += 1
                 if attempt >= self.retry.max_retries:
                     raise SwapiTimeout("Timeout calling SWAPI") from e
 
@@ -160,3 +664,40 @@ class SwapiClient:
                 self.sleep_fn(delay)
 
         raise SwapiError("Unexpected SWAPI client failure") from last_exc
+
+    def _send(
+        self,
+        method: str,
+        url_or_path: str,
+        *,
+        params: Mapping[str, Any] | None,
+        stats: dict[str, Any],
+    ) -> httpx.Response:
+        """
+        Um envio, com replay único (fora do orçamento de retry) quando a conexão
+        reaproveitada do pool já estava morta: o pool perde as ociosas e o replay
+        sai numa conexão nova. Só para métodos idempotentes, uma vez por chamada lógica,
+        e só se o envio não abriu conexão: falha numa conexão nova é falha do upstream
+        e segue para o retry/backoff de `_request_with_retries`.
+        """
+        c = self._get_client()
+        connected: list[str] = []
+
+        def trace(event: str, info: Mapping[str, Any]) -> None:
+            # eventos do httpcore: "connection.connect_tcp.started" = conexão nova para este envio
+            if event.startswith(_CONNECT_EVENTS):
+                connected.append(event)
+
+        # slot da fila justa só durante o envio (backoff entre retries não segura slot)
+        with self.fair_queue.slot() if self.fair_queue is not None else contextlib.nullcontext():
+            try:
+                # timeout por request: perfis compartilham o httpx.Client do raiz
+                return c.request(
+                    method, url_or_path, params=params, timeout=self.timeout, extensions={"trace": trace}
+                )
+            except _stale_connection_errors():
+                if connected or stats["replays"] or method.upper() not in _IDEMPOTENT:
+                    raise
+                stats["replays"] += 1
+                self.reap_idle()
+                return c.request(method, url_or_path, params=params, timeout=self.timeout)
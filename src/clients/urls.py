@@ -0,0 +1,116 @@
+# src/clients/urls.py
+# Canonicalização de URLs da SWAPI + tabela URL -> (resource, id) memoizada.
+#
+# As mesmas URLs ("https://swapi.dev/api/people/1/") voltam em toda resposta e
+# em todo request: extract_id/attach_id, chaves do cache de get_by_url e a
+# projeção `compact` repetiam regex + formatação por item. Aqui cada URL é
+# resolvida uma vez (memo limitado, LRU) e o resultado é compartilhado.
+#
+# Forma canônica (só para identidade/chave; o request sai com a URL original):
+# - esquema sempre https (http e https são o mesmo recurso)
+# - host em minúsculas, alias trocado pelo host canônico (HOST_ALIASES)
+# - path sempre com trailing slash, sem query/fragment vazios
+from __future__ import annotations
+
+import re
+import sys
+from array import array
+from functools import lru_cache
+from typing import Any, Iterable, Mapping
+from urllib.parse import urlencode
+
+# entradas no memo de cada função (URLs distintas da SWAPI inteira: ~300)
+MEMO_SIZE = 4096
+
+# host alternativo -> host canônico
+HOST_ALIASES: dict[str, str] = {
+    "www.swapi.dev": "swapi.dev",
+}
+
+# Ex.: https://swapi.dev/api/people/1/  |  http://swapi.dev/api/films/2
+_ID_RE = re.compile(r"/api/(?P<resource>[a-zA-Z_]+)/(?P<id>\d+)/?$")
+_URL_RE = re.compile(r"^(?P<scheme>https?)://(?P<host>[^/?#]+)(?P<path>[^?#]*)(?P<rest>[?#].*)?$", re.IGNORECASE)
+
+
+class InvalidSwapiUrl(ValueError):
+    """URL da SWAPI inválida para extração de ID."""
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def canonical_url(url: str) -> str:
+    """
+    Forma canônica de uma URL absoluta (ver cabeçalho); qualquer coisa que não
+    seja http(s) volta só sem espaços nas pontas.
+    """
+    raw = url.strip()
+    m = _URL_RE.match(raw)
+    if m is None:
+        return raw
+    host = m.group("host").lower()
+    host = HOST_ALIASES.get(host, host)
+    path = m.group("path") or "/"
+    if not path.endswith("/"):
+        path += "/"
+    rest = m.group("rest") or ""
+    if rest in ("?", "#"):
+        rest = ""
+    return sys.intern(f"https://{host}{path}{rest}")
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def url_ref(url: str) -> tuple[str, int] | None:
+    """URL -> (resource, id) ou None; resource internado (tupla compartilhada pelo memo)."""
+    m = _ID_RE.search(url.strip())
+    if m is None:
+        return None
+    return sys.intern(m.group("resource")), int(m.group("id"))
+
+
+def extract_id(url: str) -> int:
+    """
+    Extrai o ID numérico do campo `url` retornado pela SWAPI.
+
+    Regras:
+    - aceita com ou sem trailing slash
+    - exige padrão /api/<resource>/<id>[/]
+    - retorna int (não str)
+    """
+    if not url or not isinstance(url, str):
+        raise InvalidSwapiUrl("URL must be a non-empty string")
+
+    ref = url_ref(url)
+    if ref is None:
+        raise InvalidSwapiUrl(f"Cannot extract id from url: {url}")
+    return ref[1]
+
+
+def bulk_ids(urls: Iterable[str]) -> array:
+    """
+    Lista de URLs -> array('I') de ids numa passada (falha na 1ª inválida).
+    Ex.: `characters` de um filme inteiro vira ids sem N chamadas a extract_id.
+    """
+    ref = url_ref
+    out = array("I")
+    append = out.append
+    for url in urls:
+        r = ref(url) if isinstance(url, str) else None
+        if r is None:
+            raise InvalidSwapiUrl(f"Cannot extract id from url: {url}")
+        append(r[1])
+    return out
+
+
+def cache_key(url: str, params: Mapping[str, Any] | None = None) -> str:
+    """Chave de cache por recurso: URL canônica (+ query ordenada, quando houver params)."""
+    canon = canonical_url(url)
+    if not params:
+        return canon
+    return f"{canon}?{urlencode(sorted((str(k), str(v)) for k, v in params.items()))}"
+
+
+def memo_info() -> dict[str, Any]:
+    """Ocupação/hit rate dos memos (debug e bench)."""
+    return {
+        name: fn.cache_info()._asdict()
+        for name, fn in (("canonical_url", canonical_url), ("url_ref", url_ref))
+    }
@@ -3,33 +3,8 @@ from __future__ import annotations
 
 import re
 
-
-# Ex.: https://swapi.dev/api/people/1/
-# Ex.: http://swapi.dev/api/films/2
-_ID_RE = re.compile(r"/api/(?P<resource>[a-zA-Z_]+)/(?P<id>\d+)/?$")
-
-
-class InvalidSwapiUrl(ValueError):
-    """URL da SWAPI inválida para extração de ID."""
-
-
-def extract_id(url: str) -> int:
-    """
-    Extrai o ID numérico do campo `url` retornado pela SWAPI.
-
-    Regras:
-    - aceita com ou sem trailing slash
-    - exige padrão /api/<resource>/<id>[/]
-    - retorna int (não str)
-    """
-    if not url or not isinstance(url, str):
-        raise InvalidSwapiUrl("URL must be a non-empty string")
-
-    m = _ID_RE.search(url.strip())
-    if not m:
-        raise InvalidSwapiUrl(f"Cannot extract id from url: {url}")
-
-    return int(m.group("id"))
+# extract_id/InvalidSwapiUrl vivem em clients.urls (memo compartilhado); reexportados aqui
+from clients.urls import InvalidSwapiUrl, extract_id, url_ref  # noqa: F401
 
 
 def attach_id(item: dict) -> dict:
@@ -43,3 +18,34 @@ def attach_id(item: dict) -> dict:
     url = item.get("url")
     item_id = extract_id(url)
     return {**item, "id": item_id}
+
+
+# Recursos expostos pela SWAPI (usado para validar referências curtas)
+SWAPI_RESOURCES = frozenset({"films", "people", "planets", "species", "starships", "vehicles"})
+
+# Ex.: people/1, /people/1/
+_REF_RE = re.compile(r"^/?(?P<resource>[a-zA-Z_]+)/(?P<id>\d+)/?$")
+
+
+def parse_ref(ref: str) -> tuple[str, int]:
+    """
+    Normaliza uma referência de recurso para (resource, id).
+
+    Aceita:
+    - referência curta: "people/1" ou "/people/1/"
+    - URL absoluta da SWAPI: "https://swapi.dev/api/people/1/"
+    """
+    if not ref or not isinstance(ref, str):
+        raise InvalidSwapiUrl("Reference must be a non-empty string")
+
+    raw = ref.strip()
+    m = _REF_RE.match(raw)
+    parsed = (m.group("resource"), int(m.group("id"))) if m else url_ref(raw)
+    if parsed is None:
+        raise InvalidSwapiUrl(f"Cannot parse reference: {ref}")
+
+    resource = parsed[0].lower()
+    if resource not in SWAPI_RESOURCES:
+        raise InvalidSwapiUrl(f"Unknown SWAPI resource: {resource}")
+
+    return resource, parsed[1]
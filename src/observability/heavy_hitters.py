@@ -0,0 +1,147 @@
+# src/observability/heavy_hitters.py
+# Chaves quentes (heavy hitters) em memória fixa: Count-Min Sketch + top-K.
+#
+# Contar tudo num dict cresce com a cardinalidade (cada `q=` distinto vira uma
+# chave). O sketch usa `depth` linhas de `width` contadores: cada chave soma 1
+# em uma célula por linha e a estimativa é o mínimo delas (nunca subestima;
+# superestima no máximo ~total*e/width com alta probabilidade). Só as K chaves
+# de maior estimativa ficam guardadas por nome, num min-heap.
+#
+# Três trackers do processo (mesmo padrão do REGISTRY de métricas):
+# - ROUTES:   template da rota (`/films/{id}/characters`)
+# - QUERIES:  `path?query` canônico (params ordenados) de GETs 200 -> manifest de warm-up
+# - UPSTREAM: chaves dos caches do client (página ou URL canônica) -> pinning
+from __future__ import annotations
+
+import heapq
+import threading
+from array import array
+from typing import Iterable
+
+DEFAULT_WIDTH = 2048
+DEFAULT_DEPTH = 4
+DEFAULT_K = 50
+
+_MASK = (1 << 64) - 1
+
+
+class CountMinSketch:
+    def __init__(self, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH) -> None:
+        self.width = width
+        self.depth = depth
+        self._cells = array("Q", bytes(8 * width * depth))
+
+    def _slots(self, key: str) -> list[int]:
+        # double hashing: h1 + i*h2 dá `depth` índices com 2 hashes
+        h1 = hash(key) & _MASK
+        h2 = (hash((key, 0x9E3779B9)) & _MASK) | 1
+        w = self.width
+        return [row * w + (h1 + row * h2) % w for row in range(self.depth)]
+
+    def add(self, key: str, n: int = 1) -> int:
+        """Soma `n` e devolve a nova estimativa da chave."""
+        cells = self._cells
+        est = None
+        for i in self._slots(key):
+            cells[i] += n
+            v = cells[i]
+            est = v if est is None or v < est else est
+        return est or 0
+
+    def estimate(self, key: str) -> int:
+        cells = self._cells
+        return min(cells[i] for i in self._slots(key))
+
+    def clear(self) -> None:
+        self._cells = array("Q", bytes(8 * self.width * self.depth))
+
+
+class HeavyHitters:
+    """Count-Min Sketch + as K chaves de maior estimativa (min-heap com entradas preguiçosas)."""
+
+    def __init__(self, name: str, *, k: int = DEFAULT_K, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH) -> None:
+        self.name = name
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.total = 0
+        self._top: dict[str, int] = {}
+        # (estimativa, chave); entradas cuja estimativa não bate mais com _top são lixo
+        self._heap: list[tuple[int, str]] = []
+        self._lock = threading.Lock()
+
+    def add(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.total += n
+            est = self.sketch.add(key, n)
+            top = self._top
+            if key in top:
+                top[key] = est
+                heapq.heappush(self._heap, (est, key))
+            elif len(top) < self.k:
+                top[key] = est
+                heapq.heappush(self._heap, (est, key))
+            else:
+                floor_est, floor_key = self._floor()
+                if est > floor_est:
+                    heapq.heappop(self._heap)
+                    del top[floor_key]
+                    top[key] = est
+                    heapq.heappush(self._heap, (est, key))
+            if len(self._heap) > 4 * self.k:
+                self._heap = [(v, k) for k, v in top.items()]
+                heapq.heapify(self._heap)
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def _floor(self) -> tuple[int, str]:
+        # menor membro atual do top-K (descarta entradas velhas do heap)
+        heap, top = self._heap, self._top
+        while heap[0][1] not in top or top[heap[0][1]] != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def estimate(self, key: str) -> int:
+        with self._lock:
+            return self.sketch.estimate(key)
+
+    def top(self, n: int | None = None) -> list[tuple[str, int]]:
+        """Top-N por estimativa (desempate pela chave, para saída estável)."""
+        with self._lock:
+            items = sorted(self._top.items(), key=lambda kv: (-kv[1], kv[0]))
+        return items[: n if n is not None else self.k]
+
+    def snapshot(self, n: int | None = None) -> dict:
+        return {
+            "total": self.total,
+            "top": [{"key": key, "count": est} for key, est in self.top(n)],
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self.sketch.clear()
+            self.total = 0
+            self._top.clear()
+            self._heap.clear()
+
+
+ROUTES = HeavyHitters("routes")
+QUERIES = HeavyHitters("queries")
+UPSTREAM = HeavyHitters("upstream", k=200)
+
+TRACKERS = {t.name: t for t in (ROUTES, QUERIES, UPSTREAM)}
+
+
+def canonical_query(path: str, query: str) -> str:
+    """`path?query` com params ordenados (mesma forma das linhas do manifest de warm-up)."""
+    if not query:
+        return path
+    from urllib.parse import parse_qsl, urlencode
+
+    return f"{path}?{urlencode(sorted(parse_qsl(query, keep_blank_values=True)))}"
+
+
+def manifest(n: int) -> dict[str, list[str]]:
+    """Top-N queries no formato do `warmup_manifest.json`."""
+    return {"paths": [key for key, _ in QUERIES.top(n)]}
@@ -0,0 +1,365 @@
+# src/observability/metrics.py
+# Registry de métricas in-process com exposição OpenMetrics (texto).
+#
+# Escrita sem lock: cada thread incrementa o próprio shard (threading.local),
+# a coleta soma os shards. O custo de um inc() é um lookup de thread-local +
+# soma num dict; só a coleta (/metrics, flush) paga a agregação.
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+import weakref
+from typing import Callable, Iterable, Mapping
+
+LabelValues = tuple[str, ...]
+
+# segundos: cobre cache hit (sub-ms) até fan-out lento com retries
+DEFAULT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WIDTH_BUCKETS: tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _fmt(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class _ShardOwner:
+    # vive no threading.local da thread dona do shard; coletado quando a thread termina
+    __slots__ = ("__weakref__",)
+
+
+class _Sharded:
+    """
+    Base: um dict por thread; `shard()` devolve o da thread atual. Quando a thread
+    termina (ex.: executor descartado a cada fan-out), o shard dela é somado em
+    `_base` e sai da lista: o número de shards acompanha as threads vivas.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:  # noqa: A002
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._base: dict = {}  # shards de threads já encerradas
+        self._shards_lock = threading.Lock()  # só no 1º uso por thread e na coleta
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            owner = self._local.owner = _ShardOwner()
+            with self._shards_lock:
+                self._shards.append(shard)
+            weakref.finalize(owner, self._retire, shard)
+        return shard
+
+    def _retire(self, shard: dict) -> None:
+        # a thread dona já terminou: ninguém mais escreve nesse shard
+        with self._shards_lock:
+            for i, s in enumerate(self._shards):
+                if s is shard:
+                    del self._shards[i]
+                    break
+            self._merge(self._base, shard)
+
+    def _merge(self, into: dict, shard: dict) -> None:
+        # valor escalar por série (Counter/UpDownGauge); Histogram soma bucket a bucket
+        for k, v in shard.items():
+            into[k] = into.get(k, 0.0) + v
+
+    def _snapshots(self) -> list[dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+            base = self._base.copy()
+        # dict.copy() é atômico sob o GIL: não vê escrita pela metade
+        return [base, *(s.copy() for s in shards)]
+
+    def _check(self, labels: LabelValues) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {labels}")
+        return labels
+
+
+class Counter(_Sharded):
+    type = "counter"
+
+    def inc(self, *labels: str, n: float = 1.0) -> None:
+        shard = self._shard()
+        key = self._check(labels)
+        shard[key] = shard.get(key, 0.0) + n
+
+    def values(self) -> dict[LabelValues, float]:
+        out: dict[LabelValues, float] = {}
+        for snap in self._snapshots():
+            for k, v in snap.items():
+                out[k] = out.get(k, 0.0) + v
+        return out
+
+    def render(self) -> list[str]:
+        return [f"{self.name}_total{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in sorted(self.values().items())]
+
+
+class UpDownGauge(Counter):
+    """Gauge por soma de deltas (ex.: tarefas pendentes): inc/dec de qualquer thread."""
+
+    type = "gauge"
+
+    def dec(self, *labels: str, n: float = 1.0) -> None:
+        self.inc(*labels, n=-n)
+
+    def render(self) -> list[str]:
+        return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in sorted(self.values().items())]
+
+
+class GaugeFunc:
+    """Gauge lido na coleta via callback (ex.: tamanho de cache, estado de pool)."""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,  # noqa: A002
+        labelnames: Iterable[str],
+        fn: Callable[[], Mapping[LabelValues, float]],
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+
+    def values(self) -> dict[LabelValues, float]:
+        return dict(self.fn())
+
+    def render(self) -> list[str]:
+        return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in sorted(self.values().items())]
+
+
+class Histogram(_Sharded):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,  # noqa: A002
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        key = self._check(labels)
+        state = shard.get(key)
+        if state is None:
+            # [contagem por bucket (não cumulativa)..., +Inf, sum]
+            state = [0.0] * (len(self.buckets) + 2)
+        else:
+            state = list(state)
+        i = 0
+        for i, bound in enumerate(self.buckets):  # noqa: B007 - poucos buckets, linear é mais barato que bisect
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        state[i] += 1
+        state[-1] += value
+        # troca a lista inteira: a coleta nunca vê bucket e sum de versões diferentes
+        shard[key] = state
+
+    def _merge(self, into: dict, shard: dict) -> None:
+        for k, state in shard.items():
+            cur = into.get(k)
+            into[k] = list(state) if cur is None else [a + b for a, b in zip(cur, state)]
+
+    def values(self) -> dict[LabelValues, tuple[list[float], float, float]]:
+        """{labels: (contagens cumulativas por bucket + +Inf, count, sum)}"""
+        acc: dict[LabelValues, list[float]] = {}
+        for snap in self._snapshots():
+            for k, state in snap.items():
+                cur = acc.setdefault(k, [0.0] * len(state))
+                for i, v in enumerate(state):
+                    cur[i] += v
+        out = {}
+        for k, state in acc.items():
+            cumulative, running = [], 0.0
+            for v in state[:-1]:
+                running += v
+                cumulative.append(running)
+            out[k] = (cumulative, running, state[-1])
+        return out
+
+    def render(self) -> list[str]:
+        lines: list[str] = []
+        bounds = [*self.buckets, math.inf]
+        for k, (cumulative, count, total) in sorted(self.values().items()):
+            for bound, c in zip(bounds, cumulative):
+                le = 'le="' + _fmt(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, k, le)} {_fmt(c)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, k)} {_fmt(count)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, k)} {_fmt(total)}")
+        return lines
+
+
+Metric = Counter | Histogram | GaugeFunc
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            # idempotente para counters/histogramas (módulos recarregados, vários routers);
+            # GaugeFunc é substituído: o callback aponta para o client mais recente
+            if existing is not None and not isinstance(metric, GaugeFunc):
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"metric {metric.name} already registered with another shape")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:  # noqa: A002
+        return self._register(Counter(name, help, labelnames))  # type: ignore[return-value]
+
+    def updown(self, name: str, help: str, labelnames: Iterable[str] = ()) -> UpDownGauge:  # noqa: A002
+        return self._register(UpDownGauge(name, help, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help: str,  # noqa: A002
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))  # type: ignore[return-value]
+
+    def gauge_func(
+        self,
+        name: str,
+        help: str,  # noqa: A002
+        labelnames: Iterable[str],
+        fn: Callable[[], Mapping[LabelValues, float]],
+    ) -> GaugeFunc:
+        return self._register(GaugeFunc(name, help, labelnames, fn))  # type: ignore[return-value]
+
+    def get(self, name: str) -> Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Exposição OpenMetrics 1.0 (text/plain também aceito pelo Prometheus)."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: list[str] = []
+        for m in metrics:
+            lines.append(f"# TYPE {m.name} {m.type}")
+            lines.append(f"# HELP {m.name} {_escape(m.help)}")
+            lines.extend(m.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+# ---------- métricas do serviço ----------
+REQUESTS = REGISTRY.counter("http_requests", "Requests servidos", ("route", "method", "status"))
+REQUEST_LATENCY = REGISTRY.histogram("http_request_duration_seconds", "Latência por rota", ("route", "method"))
+
+UPSTREAM_CALLS = REGISTRY.counter("swapi_upstream_requests", "Chamadas lógicas à SWAPI", ("resource", "outcome"))
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "swapi_upstream_duration_seconds", "Latência por chamada lógica à SWAPI (retries inclusos)", ("resource",)
+)
+UPSTREAM_RETRIES = REGISTRY.counter("swapi_upstream_retries", "Retries de chamadas à SWAPI", ("resource",))
+UPSTREAM_TIMEOUTS = REGISTRY.counter("swapi_upstream_timeouts", "Tentativas que estouraram timeout", ("resource",))
+UPSTREAM_REPLAYS = REGISTRY.counter(
+    "swapi_upstream_replays", "Replays após conexão keep-alive morta (fora do orçamento de retry)", ("resource",)
+)
+POOL_REAPED = REGISTRY.counter("swapi_pool_reaped_connections", "Conexões ociosas fechadas antes do reuso")
+
+CACHE_HITS = REGISTRY.counter("swapi_cache_hits", "Hits nos caches do client", ("cache",))
+CACHE_MISSES = REGISTRY.counter("swapi_cache_misses", "Misses nos caches do client", ("cache",))
+CACHE_EVICTIONS = REGISTRY.counter("swapi_cache_evictions", "Entradas removidas por TTL/limite", ("cache",))
+
+FANOUT_WIDTH = REGISTRY.histogram("fanout_width", "Itens por lote de fan-out", (), WIDTH_BUCKETS)
+FANOUT_PENDING = REGISTRY.updown("fanout_pending_tasks", "Tarefas de fan-out submetidas e não concluídas")
+
+FAIR_QUEUE_WAIT = REGISTRY.histogram("fair_queue_wait_seconds", "Espera por slot upstream (só quem entrou na fila)")
+FAIR_QUEUE_TIMEOUTS = REGISTRY.counter("fair_queue_timeouts", "Chamadas upstream que desistiram esperando slot")
+
+ADMISSION_REJECTED = REGISTRY.counter("admission_rejected", "Requests recusados com 503 pelo limite adaptativo")
+
+PREFETCH_TASKS = REGISTRY.counter(
+    "prefetch_tasks", "Buscas especulativas em background (done/error/dropped/deferred)", ("outcome",)
+)
+
+
+# ---------- push/flush (serverless) ----------
+class _Flusher:
+    """
+    Em Cloud Functions não há scrape confiável (instâncias somem): se
+    METRICS_PUSH_URL estiver definido, o texto OpenMetrics é enviado por POST
+    no máximo a cada METRICS_PUSH_INTERVAL segundos, em thread daemon.
+    """
+
+    def __init__(self, registry: MetricsRegistry, now_fn: Callable[[], float] = time.monotonic) -> None:
+        self.registry = registry
+        self.now_fn = now_fn
+        self._last = now_fn()
+        self._lock = threading.Lock()
+
+    def flush(self, push_fn: Callable[[str], None] | None = None) -> bool:
+        if push_fn is None and not os.environ.get("METRICS_PUSH_URL"):
+            return False
+        (push_fn or _http_push)(self.registry.render())
+        return True
+
+    def maybe_flush(self) -> bool:
+        if not os.environ.get("METRICS_PUSH_URL"):
+            return False
+        interval = float(os.environ.get("METRICS_PUSH_INTERVAL", "60"))
+        now = self.now_fn()
+        with self._lock:
+            if now - self._last < interval:
+                return False
+            self._last = now
+        threading.Thread(target=self.flush, name="metrics-flush", daemon=True).start()
+        return True
+
+
+def _http_push(body: str) -> None:
+    url = os.environ["METRICS_PUSH_URL"]
+    import httpx  # só quem faz push paga o import
+
+    try:
+        httpx.post(url, content=body.encode(), headers={"Content-Type": OPENMETRICS_CONTENT_TYPE}, timeout=2.0)
+    except httpx.HTTPError:
+        pass  # métrica perdida não pode derrubar request
+
+
+FLUSHER = _Flusher(REGISTRY)
+
+
+def flush(push_fn: Callable[[str], None] | None = None) -> bool:
+    """Push imediato (ex.: antes de a instância congelar)."""
+    return FLUSHER.flush(push_fn)
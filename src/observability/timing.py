@@ -0,0 +1,178 @@
+# src/observability/timing.py
+# Spans/contadores por request, sem dependência de framework.
+#
+# O request ativo vive num ContextVar: o SwapiClient (que não recebe o
+# RequestContext) grava nele direto, e `run_bounded` propaga o contexto para
+# as threads do fan-out. Fora de um request tudo vira no-op.
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, TypeVar
+
+logger = logging.getLogger("swapi.request")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# limite de chamadas upstream detalhadas no log (o agregado continua exato)
+MAX_LOGGED_CALLS = 50
+
+
+@dataclass
+class SpanStat:
+    total_ms: float = 0.0
+    count: int = 0
+
+
+class RequestTimings:
+    """
+    Acumula, por nome, a duração total e o nº de ocorrências de cada span,
+    além de contadores (ex.: cache_hit) e do detalhe de cada chamada upstream.
+    Thread-safe: o fan-out grava de várias threads no mesmo objeto.
+    """
+
+    def __init__(self, now_fn: Callable[[], float] = time.perf_counter) -> None:
+        self._now = now_fn
+        self._lock = threading.Lock()
+        self._started = now_fn()
+        # template da rota casada (ex.: /films/{id}/characters); label de baixa cardinalidade
+        self.route: str | None = None
+        self.spans: dict[str, SpanStat] = {}
+        self.counters: dict[str, int] = {}
+        self.upstream_calls: list[dict[str, Any]] = []
+        # `path?query` canônico (heavy_hitters.canonical_query), calculado uma vez pelo entrypoint:
+        # chave da admissão e das queries quentes
+        self.query_key: str | None = None
+
+    def elapsed_ms(self) -> float:
+        return (self._now() - self._started) * 1000
+
+    def add(self, name: str, ms: float) -> None:
+        with self._lock:
+            stat = self.spans.get(name)
+            if stat is None:
+                stat = self.spans[name] = SpanStat()
+            stat.total_ms += ms
+            stat.count += 1
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_upstream_call(self, *, url: str, status: int | None, attempts: int, ms: float) -> None:
+        self.add("upstream", ms)
+        if attempts > 1:
+            self.incr("upstream_retries", attempts - 1)
+        with self._lock:
+            if len(self.upstream_calls) < MAX_LOGGED_CALLS:
+                self.upstream_calls.append(
+                    {"url": url, "status": status, "attempts": attempts, "ms": round(ms, 2)}
+                )
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        t0 = self._now()
+        try:
+            yield
+        finally:
+            self.add(name, (self._now() - t0) * 1000)
+
+    # ---------- saída ----------
+    def server_timing(self) -> str:
+        """
+        Header Server-Timing (RFC W3C): `nome;dur=ms[;desc="..."]`.
+        `upstream` soma todas as chamadas; comparado com `fanout` (wall time)
+        mostra quanto o paralelismo está rendendo.
+        """
+        with self._lock:
+            spans = list(self.spans.items())
+            counters = dict(self.counters)
+
+        parts: list[str] = []
+        for name, stat in spans:
+            entry = f"{name};dur={stat.total_ms:.2f}"
+            if stat.count > 1:
+                entry += f';desc="{stat.count}x"'
+            parts.append(entry)
+
+        hits, misses = counters.get("cache_hit", 0), counters.get("cache_miss", 0)
+        if hits or misses:
+            parts.append(f'cache;desc="hit={hits} miss={misses}"')
+
+        parts.append(f"total;dur={self.elapsed_ms():.2f}")
+        return ", ".join(parts)
+
+    def as_log(self, **fields: Any) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **fields,
+                "duration_ms": round(self.elapsed_ms(), 2),
+                "spans": {
+                    name: {"ms": round(stat.total_ms, 2), "count": stat.count}
+                    for name, stat in self.spans.items()
+                },
+                "counters": dict(self.counters),
+                "upstream_calls": list(self.upstream_calls),
+            }
+
+
+_current: contextvars.ContextVar[RequestTimings | None] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def current() -> RequestTimings | None:
+    return _current.get()
+
+
+@contextmanager
+def activate(timings: RequestTimings) -> Iterator[RequestTimings]:
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    with timings.span(name):
+        yield
+
+
+def incr(name: str, n: int = 1) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.incr(name, n)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator: cada chamada vira uma ocorrência do span `name`."""
+
+    def deco(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            timings = _current.get()
+            if timings is None:
+                return fn(*args, **kwargs)
+            with timings.span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return deco
+
+
+def log_request(timings: RequestTimings, **fields: Any) -> None:
+    """Uma linha JSON por request (Cloud Logging indexa o JSON como jsonPayload)."""
+    logger.info(json.dumps(timings.as_log(**fields), separators=(",", ":")))
@@ -45,11 +45,18 @@ class Envelope(BaseModel, Generic[T]):
     errors: list[ErrorItem] = Field(default_factory=list)
 
 
+# Parametrizações prontas no import: `Envelope[T]` por chamada custa um lookup
+# no cache de generics do Pydantic (µs) e a 1ª `Envelope[None]` monta o schema
+# inteiro (ms) dentro do primeiro request de erro.
+_EnvelopeAny = Envelope[Any]
+_EnvelopeNone = Envelope[None]
+
+
 def ok(*, data: T, request_id: str, self_url: str, meta: Optional[dict[str, Any]] = None,
        next_url: Optional[str] = None, prev_url: Optional[str] = None) -> Envelope[T]:
     meta_obj = Meta(request_id=request_id, **(meta or {}))
     links_obj = Links(self=self_url, next=next_url, prev=prev_url)
-    return Envelope[T](data=data, meta=meta_obj, links=links_obj, errors=[])
+    return _EnvelopeAny(data=data, meta=meta_obj, links=links_obj, errors=[])
 
 
 def fail(*, request_id: str, self_url: str, status_code: int,
@@ -59,5 +66,5 @@ def fail(*, request_id: str, self_url: str, status_code: int,
     """
     meta_obj = Meta(request_id=request_id, **(meta or {}))
     links_obj = Links(self=self_url)
-    env = Envelope[None](data=None, meta=meta_obj, links=links_obj, errors=errors)
+    env = _EnvelopeNone(data=None, meta=meta_obj, links=links_obj, errors=errors)
     return status_code, env
@@ -0,0 +1,141 @@
+import threading
+
+from app.admission import AdaptiveLimiter
+from app.router import Router
+from observability import timing
+from observability.timing import RequestTimings
+
+
+def _ok(ctx):
+    return 200, {"ok": True}, {}
+
+
+def _dispatch(router, path, query=None):
+    with timing.activate(RequestTimings()):
+        return router.dispatch(method="GET", path=path, query=query or {}, headers={}, body=None, request_id="rid")
+
+
+def test_rejects_above_limit_and_releases():
+    limiter = AdaptiveLimiter(initial_limit=2)
+    a, b = limiter.try_acquire("k1"), limiter.try_acquire("k2")
+    assert a is not None and b is not None
+    assert limiter.try_acquire("k3") is None
+
+    a.release(status=200)
+    assert limiter.inflight == 1
+    assert limiter.try_acquire("k3") is not None
+
+
+def test_aimd_grows_on_good_latency_and_backs_off_on_slow_or_failed_upstream():
+    clock = {"t": 0.0}
+    limiter = AdaptiveLimiter(initial_limit=10, cooldown=1.0, now_fn=lambda: clock["t"])
+
+    for _ in range(50):
+        limiter.inflight = 9  # limite em uso
+        limiter._observe(0.05, ok=True)
+    grown = limiter.limit
+    assert grown > 12
+
+    for _ in range(20):
+        limiter._observe(0.5, ok=True)  # EMA passa de 2x a mínima
+    dropped = limiter.limit
+    assert grown * 0.85 < dropped < grown  # no máximo uma queda por cooldown
+
+    clock["t"] += 1.5
+    limiter._observe(0.05, ok=False)
+    assert limiter.limit == dropped * 0.9
+    assert limiter.retry_after() >= 1
+
+
+def test_router_sheds_overflow_with_503_but_keeps_health_and_cached_hits():
+    limiter = AdaptiveLimiter(initial_limit=1, min_limit=1)
+    router = Router(limiter=limiter)
+    started, release = threading.Event(), threading.Event()
+
+    def slow(ctx):
+        started.set()
+        release.wait(5)
+        return 200, {"ok": True}, {}
+
+    router.add_route("GET", "/slow", slow)
+    router.add_route("GET", "/cached", _ok)
+    router.add_route("GET", "/health", _ok)
+
+    # 1ª execução de /cached sem upstream: passa a entrar pela faixa prioritária
+    assert _dispatch(router, "/cached", {"page": "1"})[0] == 200
+
+    t = threading.Thread(target=_dispatch, args=(router, "/slow"))
+    t.start()
+    assert started.wait(5)
+    try:
+        status, payload, headers = _dispatch(router, "/slow")
+        assert status == 503
+        assert payload["errors"][0]["code"] == "OVERLOADED"
+        assert int(headers["Retry-After"]) >= 1
+
+        assert _dispatch(router, "/health")[0] == 200
+        assert _dispatch(router, "/cached", {"page": "1"})[0] == 200
+        assert _dispatch(router, "/cached", {"page": "2"})[0] == 503
+    finally:
+        release.set()
+        t.join()
+    assert limiter.inflight == 0
+
+
+def test_priority_lane_admits_only_a_bounded_number_above_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=1, min_limit=1, priority_lane=2)
+    limiter._remember("GET /cached", cached=True)
+    held = limiter.try_acquire("GET /slow")
+    assert held is not None
+
+    extra = [limiter.try_acquire("GET /cached") for _ in range(3)]
+    assert extra[0] is not None and extra[1] is not None
+    assert extra[2] is None  # entrada de cache pode ter expirado: a faixa não é ilimitada
+
+    extra[0].release(status=200)
+    assert limiter.try_acquire("GET /cached") is not None
+    assert limiter.priority_inflight == 2
+
+
+def test_streamed_body_holds_the_lease_until_it_is_consumed():
+    limiter = AdaptiveLimiter(initial_limit=5)
+    router = Router(limiter=limiter)
+
+    def export(ctx):
+        ctx.timings.add("upstream", 5.0)  # stream que foi ao upstream
+        return 200, iter([b"a\n", b"b\n"]), {}
+
+    router.add_route("GET", "/export/{resource}", export)
+
+    timings = RequestTimings()
+    timings.query_key = "/export/people"
+    with timing.activate(timings):
+        status, body, _ = router.dispatch(
+            method="GET", path="/export/people", query={}, headers={}, body=None, request_id="rid"
+        )
+        assert status == 200
+        assert limiter.inflight == 1  # handler já voltou, corpo ainda não foi produzido
+        assert b"".join(body) == b"a\nb\n"
+    assert limiter.inflight == 0
+    assert limiter._samples == 0  # duração do stream não é amostra de latência
+    assert limiter._cached == {}  # nem vira chave "servida de cache"
+
+
+def test_admission_key_reuses_the_canonical_query_from_the_entrypoint():
+    limiter = AdaptiveLimiter(initial_limit=5)
+    router = Router(limiter=limiter)
+    router.add_route("GET", "/people", _ok)
+
+    timings = RequestTimings()
+    timings.query_key = "/people?page=2&q=sky"
+    with timing.activate(timings):
+        router.dispatch(
+            method="GET", path="/people", query={"q": "sky", "page": "2"}, headers={}, body=None, request_id="r"
+        )
+    assert list(limiter._cached) == ["GET /people?page=2&q=sky"]
+
+
+def test_limiter_can_be_disabled_from_env():
+    assert AdaptiveLimiter.from_env({"ADMISSION": "off"}) is None
+    limiter = AdaptiveLimiter.from_env({"ADMISSION_INITIAL": "5"})
+    assert limiter is not None and limiter.limit == 5
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+import respx
+
+pytest.importorskip("starlette")
+
+from starlette.testclient import TestClient  # noqa: E402
+
+from app import main as app_main  # noqa: E402
+from app.asgi import app  # noqa: E402
+from app.main import create_app_router  # noqa: E402
+from app.router import Router  # noqa: E402
+from clients.swapi import RetryConfig, SwapiClient  # noqa: E402
+
+BASE = "https://swapi.dev/api"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    router = create_app_router(swapi_client=SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None))
+    monkeypatch.setattr(app_main, "_router", router)
+    with TestClient(app) as c:
+        yield c
+
+
+def test_preflight_and_cors_match_wsgi_entrypoint(client):
+    resp = client.options("/films", headers={"Origin": "http://localhost:5173"})
+    assert resp.status_code == 204
+    assert resp.headers["access-control-allow-origin"] == "http://localhost:5173"
+    assert "x-api-key" in resp.headers["access-control-allow-headers"]
+
+
+def test_envelope_request_id_and_server_timing(client):
+    with respx.mock(assert_all_mocked=False) as mock:
+        mock.get(f"{BASE}/planets/", params={"page": 1}).respond(
+            200, json={"count": 1, "results": [{"name": "Tatooine", "url": f"{BASE}/planets/1/"}]}
+        )
+        resp = client.get("/planets", headers={"x-request-id": "rid-asgi", "Origin": "http://x"})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["meta"]["request_id"] == "rid-asgi"
+    assert body["data"][0]["id"] == 1
+    assert resp.headers["access-control-allow-origin"] == "http://x"
+    assert "handler" in resp.headers["server-timing"]
+
+
+def test_unknown_route_is_enveloped_404(client):
+    resp = client.get("/nope")
+    assert resp.status_code == 404
+    assert resp.json()["errors"][0]["code"] == "NOT_FOUND"
+
+
+def test_large_payload_is_compressed(client, monkeypatch):
+    big = {"data": ["x" * 50] * 200}
+    router = Router()
+    router.add_route("GET", "/big", lambda ctx: (200, big, {}))
+    monkeypatch.setattr(app_main, "_router", router)
+
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.json() == big
+
+
+def test_async_handlers_run_on_both_entrypoints():
+    async def handler(ctx):
+        await asyncio.sleep(0)
+        return 200, {"async": True, "id": ctx.path_params["id"]}, {}
+
+    router = Router()
+    router.add_route("GET", "/things/{id}", handler)
+    kw = dict(method="GET", path="/things/7", query={}, headers={}, body=None, request_id="rid")
+
+    async def run_sync(fn, *args):
+        raise AssertionError("async handler must not go to the threadpool")
+
+    assert asyncio.run(router.dispatch_async(**kw, run_sync=run_sync))[1] == {"async": True, "id": "7"}
+    assert router.dispatch(**kw)[1] == {"async": True, "id": "7"}
@@ -0,0 +1,129 @@
+import pytest
+import respx
+
+from app.columnar import ColumnStore, FilterError, parse_filter, parse_number, parse_query, parse_sort
+from app.main import create_app_router
+from clients.swapi import RetryConfig, SwapiClient
+
+BASE = "https://swapi.dev/api"
+
+
+def _planet(i, name, climate, population):
+    return {"name": name, "climate": climate, "population": population, "url": f"{BASE}/planets/{i}/"}
+
+
+PLANETS = [
+    _planet(1, "Tatooine", "arid", "200000"),
+    _planet(2, "Alderaan", "temperate", "2,000,000,000"),
+    _planet(3, "Yavin IV", "temperate, tropical", "1000"),
+    _planet(4, "Hoth", "frozen", "unknown"),
+    _planet(5, "Dagobah", "murky", "unknown"),
+    _planet(6, "Bespin", "temperate", "6000000"),
+    _planet(7, "Endor", "temperate", "30000000"),
+    _planet(8, "Naboo", "temperate", "4,500,000,000"),
+    _planet(9, "Coruscant", "temperate", "1000000000000"),
+    _planet(10, "Kamino", "temperate", "1000000000"),
+    _planet(11, "Geonosis", "temperate, arid", "100000000000"),
+    _planet(12, "Utapau", "temperate, arid, windy", "95000000"),
+]
+
+
+def _router():
+    respx.get(f"{BASE}/planets/", params={"page": 1}).respond(
+        200, json={"count": 12, "next": f"{BASE}/planets/?page=2", "results": PLANETS[:10]}
+    )
+    respx.get(f"{BASE}/planets/", params={"page": 2}).respond(
+        200, json={"count": 12, "next": None, "results": PLANETS[10:]}
+    )
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    return create_app_router(swapi_client=client)
+
+
+def _get(router, query):
+    return router.dispatch(method="GET", path="/planets", query=query, headers={}, body=None, request_id="rid")
+
+
+def test_parse_number_handles_swapi_strings():
+    assert parse_number("1,000") == 1000.0
+    assert parse_number("2.5") == 2.5
+    assert parse_number(7) == 7.0
+    for raw in ("unknown", "n/a", "none", "", None, "30-165"):
+        assert parse_number(raw) is None
+
+
+def test_parse_filter_and_sort():
+    clauses = parse_filter("climate:arid, population>=1000,name~oo")
+    assert [(c.field, c.op, c.value) for c in clauses] == [
+        ("climate", "=", "arid"),
+        ("population", ">=", "1000"),
+        ("name", "~", "oo"),
+    ]
+    assert [(k.field, k.descending) for k in parse_sort("-population,name")] == [
+        ("population", True),
+        ("name", False),
+    ]
+    with pytest.raises(FilterError):
+        parse_filter("population")
+    assert parse_query({"q": "x"}) is None
+
+
+def test_store_filters_numeric_and_text_columns():
+    store = ColumnStore("planets", PLANETS)
+
+    assert store.numeric["population"][1][3] == 0  # "unknown" fica fora da máscara
+
+    names = lambda idx: [store.rows[i]["name"] for i in idx]  # noqa: E731
+    assert names(store.select(parse_filter("population>1000000000"))) == ["Alderaan", "Naboo", "Coruscant", "Geonosis"]
+    assert names(store.select(parse_filter("climate:arid"))) == ["Tatooine", "Geonosis", "Utapau"]
+    assert names(store.select(parse_filter("climate=ARID,population<1000000"))) == ["Tatooine"]
+    assert names(store.select(parse_filter("climate!=temperate,climate~r"))) == ["Tatooine", "Hoth", "Dagobah"]
+    assert names(store.select((), q="oo")) == ["Tatooine", "Naboo"]
+
+    with pytest.raises(FilterError):
+        store.select(parse_filter("population~1"))
+    with pytest.raises(FilterError):
+        store.select(parse_filter("gravity:1"))
+
+
+def test_store_sort_is_stable_multi_key_with_nulls_last():
+    store = ColumnStore("planets", PLANETS)
+    idx = store.query(parse_filter("population<=200000"), parse_sort("-population"))
+    assert [store.rows[i]["name"] for i in idx] == ["Tatooine", "Yavin IV"]
+
+    idx = store.query((), parse_sort("-population,name"))
+    tail = [store.rows[i]["name"] for i in idx[-2:]]
+    assert tail == ["Dagobah", "Hoth"]
+
+    idx = store.query((), parse_sort("climate,-name"))
+    assert [store.rows[i]["name"] for i in idx[:3]] == ["Tatooine", "Hoth", "Dagobah"]
+
+
+@respx.mock
+def test_list_handler_filters_sorts_and_links_with_exact_total():
+    router = _router()
+
+    status, payload, _ = _get(router, {"filter": "climate:temperate", "sort": "-population", "page_size": "3"})
+
+    assert status == 200
+    assert payload["meta"]["total"] == 9  # "temperate, arid" também casa
+    assert [p["name"] for p in payload["data"]] == ["Coruscant", "Geonosis", "Naboo"]
+    assert payload["data"][0]["id"] == 9
+    assert "filter=climate%3Atemperate" in payload["links"]["next"]
+    assert "sort=-population" in payload["links"]["next"]
+    assert "page=2" in payload["links"]["next"]
+
+    status, payload, _ = _get(router, {"filter": "climate:temperate", "sort": "-population", "page_size": "3", "page": "3"})
+    assert [p["name"] for p in payload["data"]] == ["Endor", "Bespin", "Yavin IV"]
+    assert payload["links"]["next"] is None
+
+
+@respx.mock
+def test_list_handler_rejects_bad_filters():
+    router = _router()
+
+    status, payload, _ = _get(router, {"filter": "gravity>1"})
+    assert status == 400
+    assert payload["errors"][0]["code"] == "VALIDATION_ERROR"
+
+    status, payload, _ = _get(router, {"sort": "name", "cursor": "abc"})
+    assert status == 400
@@ -0,0 +1,84 @@
+import gzip
+import json
+
+import pytest
+from flask import Flask
+
+import app.main as app_main
+from app.compression import MIN_COMPRESS_BYTES, encode_body, negotiate_encoding
+from app.router import Router
+from schemas.common import ok
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("deflate, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "gzip" if negotiate_encoding("br") is None else "br"),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_encode_body_skips_small_bodies():
+    body = b"{}"
+    out, enc = encode_body(body, "gzip")
+    assert out is body
+    assert enc is None
+
+
+def test_encode_body_gzip_roundtrip():
+    body = json.dumps([{"name": "Luke", "url": "https://swapi.dev/api/people/1/"}] * 50).encode()
+    assert len(body) >= MIN_COMPRESS_BYTES
+
+    out, enc = encode_body(body, "gzip")
+    assert enc == "gzip"
+    assert len(out) < len(body)
+    assert gzip.decompress(out) == body
+
+
+def _big_router() -> Router:
+    router = Router()
+
+    def handler(ctx):
+        env = ok(data=[{"name": f"P{i}", "url": f"https://swapi.dev/api/people/{i}/"} for i in range(100)],
+                 request_id="rid", self_url=ctx.path)
+        return 200, env.model_dump(), {}
+
+    router.add_route("GET", "/people", handler)
+    return router
+
+
+def test_main_compresses_when_client_accepts_gzip(monkeypatch):
+    monkeypatch.setattr(app_main, "_router", _big_router())
+    flask_app = Flask(__name__)
+
+    with flask_app.test_request_context("/people", headers={"Accept-Encoding": "gzip"}):
+        from flask import request
+
+        resp = app_main.main(request)
+
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    payload = json.loads(gzip.decompress(resp.get_data()))
+    assert len(payload["data"]) == 100
+
+
+def test_main_keeps_identity_without_accept_encoding(monkeypatch):
+    monkeypatch.setattr(app_main, "_router", _big_router())
+    flask_app = Flask(__name__)
+
+    with flask_app.test_request_context("/people"):
+        from flask import request
+
+        resp = app_main.main(request)
+
+    assert "Content-Encoding" not in resp.headers
+    assert len(json.loads(resp.get_data())["data"]) == 100
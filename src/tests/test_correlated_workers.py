@@ -19,6 +19,10 @@ class FakeClient:
         self.by_url_calls.append(url)
         return {"name": "X", "url": url}
 
+    def with_profile(self, **_):
+        # perfil fail-fast compartilha o mesmo client
+        return self
+
 
 def test_film_characters_uses_dynamic_workers_and_fast_client(monkeypatch):
     calls = {"max_workers": None, "used_fast": False}
@@ -0,0 +1,145 @@
+import base64
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import respx
+
+from app.main import create_app_router
+from app.pagination import Cursor, PaginationError, decode_cursor, encode_cursor, parse_cursor
+from clients.swapi import RetryConfig, SwapiClient
+
+TOTAL = 25
+
+
+def mock_people_pages(respx_mock, total: int = TOTAL):
+    routes = {}
+    last = (total + 9) // 10
+    for page in range(1, last + 1):
+        start = (page - 1) * 10 + 1
+        end = min(page * 10, total)
+        routes[page] = respx_mock.get("https://swapi.dev/api/people/", params={"page": page}).respond(
+            200,
+            json={
+                "count": total,
+                "next": None if page == last else f"https://swapi.dev/api/people/?page={page + 1}",
+                "results": [
+                    {"name": f"P{i}", "url": f"https://swapi.dev/api/people/{i}/"}
+                    for i in range(start, end + 1)
+                ],
+            },
+        )
+    return routes
+
+
+def _cursor_of(link: str) -> str:
+    return parse_qs(urlsplit(link).query)["cursor"][0]
+
+
+def test_cursor_roundtrip_is_opaque_and_stable():
+    c = Cursor(up_page=3, offset=5, search="sky", snapshot=82)
+    token = encode_cursor(c)
+    assert "=" not in token
+    assert decode_cursor(token) == c
+
+
+def _raw_token(**fields) -> str:
+    raw = json.dumps({"v": 1, "p": 1, "o": 0, **fields}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not-a-cursor",
+        "e30",
+        encode_cursor(Cursor(up_page=0, offset=0)),
+        _raw_token(q=["sky"]),
+        _raw_token(q={"x": 1}),
+        _raw_token(s="82"),
+        _raw_token(p="2"),
+        _raw_token(o=1.5),
+        _raw_token(p=True),
+    ],
+)
+def test_decode_cursor_invalid(token):
+    with pytest.raises(PaginationError):
+        decode_cursor(token)
+
+
+def test_empty_cursor_starts_at_page_position():
+    c = parse_cursor("", page=2, page_size=15, search="luke")
+    assert (c.up_page, c.offset, c.search) == (2, 5, "luke")
+
+
+@respx.mock
+def test_people_cursor_walk_fetches_each_upstream_page_once():
+    routes = mock_people_pages(respx)
+
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None, page_cache_ttl=60.0)
+    router = create_app_router(swapi_client=client)
+
+    names: list[str] = []
+    query = {"cursor": "", "page_size": "7"}
+    hops = 0
+    while True:
+        status, payload, _ = router.dispatch(
+            method="GET",
+            path="/people",
+            query=query,
+            headers={"x-request-id": f"rid-c{hops}"},
+            body=None,
+            request_id=f"rid-c{hops}",
+        )
+        assert status == 200
+        assert payload["meta"]["page"] is None
+        assert payload["meta"]["total"] == TOTAL
+        assert payload["links"]["prev"] is None
+        names.extend(it["name"] for it in payload["data"])
+        hops += 1
+
+        if payload["links"]["next"] is None:
+            break
+        query = {"cursor": _cursor_of(payload["links"]["next"]), "page_size": "7"}
+
+    assert names == [f"P{i}" for i in range(1, TOTAL + 1)]
+    assert hops == 4
+    assert all(r.call_count == 1 for r in routes.values())
+
+
+@respx.mock
+def test_people_stale_cursor_returns_400():
+    mock_people_pages(respx)
+
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    router = create_app_router(swapi_client=client)
+
+    stale = encode_cursor(Cursor(up_page=1, offset=0, snapshot=TOTAL + 1))
+    status, payload, _ = router.dispatch(
+        method="GET",
+        path="/people",
+        query={"cursor": stale},
+        headers={},
+        body=None,
+        request_id="rid-stale",
+    )
+
+    assert status == 400
+    assert payload["errors"][0]["message"] == "cursor is stale"
+
+
+def test_people_rejects_cursor_with_non_string_search():
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    router = create_app_router(swapi_client=client)
+
+    status, payload, _ = router.dispatch(
+        method="GET",
+        path="/people",
+        query={"cursor": _raw_token(q=["sky"])},
+        headers={"x-request-id": "rid-c9"},
+        body=None,
+        request_id="rid-c9",
+    )
+
+    assert status == 400
+    assert payload["errors"][0]["code"] == "VALIDATION_ERROR"
@@ -0,0 +1,124 @@
+import pytest
+import respx
+
+from app.expansion import ExpandError, Expansion, collect_urls, parse_expand
+from app.main import create_app_router
+from clients.swapi import RetryConfig, SwapiClient
+
+BASE = "https://swapi.dev/api"
+
+
+def _person(i, homeworld, films):
+    return {
+        "name": f"P{i}",
+        "homeworld": f"{BASE}/planets/{homeworld}/",
+        "films": [f"{BASE}/films/{f}/" for f in films],
+        "url": f"{BASE}/people/{i}/",
+    }
+
+
+PEOPLE = [_person(1, 1, [1, 2]), _person(2, 1, [1]), _person(3, 2, [2])]
+
+
+def _router():
+    respx.get(f"{BASE}/people/", params={"page": 1}).respond(200, json={"count": 3, "results": PEOPLE})
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    return create_app_router(swapi_client=client)
+
+
+def _mock_related():
+    routes = {}
+    for i, name in ((1, "Tatooine"), (2, "Alderaan")):
+        routes[f"planets/{i}"] = respx.get(f"{BASE}/planets/{i}/").respond(
+            200, json={"name": name, "residents": [f"{BASE}/people/1/"], "url": f"{BASE}/planets/{i}/"}
+        )
+    for i in (1, 2):
+        routes[f"films/{i}"] = respx.get(f"{BASE}/films/{i}/").respond(
+            200, json={"title": f"F{i}", "url": f"{BASE}/films/{i}/"}
+        )
+    return routes
+
+
+def _get(router, path, query):
+    return router.dispatch(method="GET", path=path, query=query, headers={}, body=None, request_id="rid")
+
+
+def test_parse_expand_normalizes_and_limits_depth():
+    assert parse_expand({"expand": "films, homeworld,films"}).fields == ("films", "homeworld")
+    assert parse_expand({}).query() == {}
+    with pytest.raises(ExpandError):
+        parse_expand({"expand": "homeworld.residents"})
+    with pytest.raises(ExpandError):
+        parse_expand({"expand": "name"})
+    assert Expansion(fields=("films", "homeworld")).restrict(("homeworld", "name")).fields == ("homeworld",)
+
+
+def test_collect_urls_dedupes_canonical_forms():
+    items = [
+        {"homeworld": f"{BASE}/planets/1/"},
+        {"homeworld": "http://swapi.dev/api/planets/1"},
+        {"homeworld": None},
+    ]
+    assert collect_urls(items, Expansion(fields=("homeworld",))) == [f"{BASE}/planets/1/"]
+
+
+@respx.mock
+def test_people_expand_resolves_each_url_once_and_inlines_compact_objects():
+    router = _router()
+    routes = _mock_related()
+
+    status, payload, _ = _get(router, "/people", {"expand": "homeworld,films"})
+
+    assert status == 200
+    first = payload["data"][0]
+    assert first["homeworld"] == {"id": 1, "name": "Tatooine", "residents": [1], "url": f"{BASE}/planets/1/"}
+    assert [f["title"] for f in first["films"]] == ["F1", "F2"]
+    assert payload["data"][2]["homeworld"]["name"] == "Alderaan"
+    assert all(r.call_count == 1 for r in routes.values())
+    assert "expand=films%2Chomeworld" in payload["links"]["self"]
+
+
+@respx.mock
+def test_expand_rejects_bad_fields_and_skips_projected_out_fields():
+    router = _router()
+    routes = _mock_related()
+
+    status, payload, _ = _get(router, "/people", {"expand": "homeworld.residents"})
+    assert status == 400
+    assert payload["errors"][0]["code"] == "VALIDATION_ERROR"
+
+    status, payload, _ = _get(router, "/people", {"expand": "homeworld,films", "fields": "name,homeworld"})
+    assert status == 200
+    assert payload["data"][0]["homeworld"]["name"] == "Tatooine"
+    assert routes["films/1"].call_count == 0
+
+
+@respx.mock
+def test_missing_homeworld_keeps_its_url_instead_of_failing_the_page():
+    router = _router()
+    respx.get(f"{BASE}/planets/1/").respond(200, json={"name": "Tatooine", "url": f"{BASE}/planets/1/"})
+    respx.get(f"{BASE}/planets/2/").respond(404, json={"detail": "Not found"})
+
+    status, payload, _ = _get(router, "/people", {"expand": "homeworld"})
+
+    assert status == 200
+    assert payload["data"][0]["homeworld"]["name"] == "Tatooine"
+    assert payload["data"][2]["homeworld"] == f"{BASE}/planets/2/"
+
+
+@respx.mock
+def test_missing_reference_in_the_middle_does_not_shift_the_others():
+    people = [_person(1, 1, []), _person(2, 2, []), _person(3, 3, [])]
+    respx.get(f"{BASE}/people/", params={"page": 1}).respond(200, json={"count": 3, "results": people})
+    respx.get(f"{BASE}/planets/1/").respond(404, json={"detail": "Not found"})
+    respx.get(f"{BASE}/planets/2/").respond(200, json={"name": "Tatooine", "url": f"{BASE}/planets/2/"})
+    respx.get(f"{BASE}/planets/3/").respond(200, json={"name": "Naboo", "url": f"{BASE}/planets/3/"})
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+
+    status, payload, _ = _get(create_app_router(swapi_client=client), "/people", {"expand": "homeworld"})
+
+    assert status == 200
+    first, second, third = (p["homeworld"] for p in payload["data"])
+    assert first == f"{BASE}/planets/1/"
+    assert second["name"] == "Tatooine"
+    assert third["name"] == "Naboo"
@@ -0,0 +1,128 @@
+import json
+
+import httpx
+import respx
+from flask import Flask
+
+import app.main as app_main
+from app.main import create_app_router
+from clients.swapi import RetryConfig, SwapiClient
+
+
+def mock_people_pages(respx_mock, total: int = 23):
+    last = (total + 9) // 10
+    routes = []
+    for page in range(1, last + 1):
+        start = (page - 1) * 10 + 1
+        end = min(page * 10, total)
+        routes.append(
+            respx_mock.get("https://swapi.dev/api/people/", params={"page": page}).respond(
+                200,
+                json={
+                    "count": total,
+                    "next": None if page == last else f"https://swapi.dev/api/people/?page={page + 1}",
+                    "results": [
+                        {
+                            "name": f"P{i}",
+                            "homeworld": "https://swapi.dev/api/planets/1/",
+                            "url": f"https://swapi.dev/api/people/{i}/",
+                        }
+                        for i in range(start, end + 1)
+                    ],
+                },
+            )
+        )
+    return routes
+
+
+def _dispatch(router, path, query=None):
+    return router.dispatch(
+        method="GET",
+        path=path,
+        query=query or {},
+        headers={"x-request-id": "rid-exp"},
+        body=None,
+        request_id="rid-exp",
+    )
+
+
+@respx.mock
+def test_export_streams_every_record_as_ndjson():
+    routes = mock_people_pages(respx)
+
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    router = create_app_router(swapi_client=client)
+
+    status, body, headers = _dispatch(router, "/export/people", {"compact": "1"})
+
+    assert status == 200
+    assert headers["Content-Type"] == "application/x-ndjson"
+    assert headers["X-Total-Count"] == "23"
+
+    lines = [json.loads(line) for line in b"".join(body).splitlines()]
+    assert [r["id"] for r in lines] == list(range(1, 24))
+    assert lines[0]["homeworld"] == 1
+    assert all(r.call_count == 1 for r in routes)
+
+
+@respx.mock
+def test_export_upstream_error_on_first_page_maps_to_status():
+    respx.get("https://swapi.dev/api/people/", params={"page": 1}).side_effect = httpx.ReadTimeout("boom")
+
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    router = create_app_router(swapi_client=client)
+
+    status, payload, _ = _dispatch(router, "/export/people")
+
+    assert status == 504
+    assert payload["errors"][0]["code"] == "UPSTREAM_TIMEOUT"
+
+
+@respx.mock
+def test_export_error_mid_stream_ends_with_error_line():
+    respx.get("https://swapi.dev/api/people/", params={"page": 1}).respond(
+        200,
+        json={
+            "count": 20,
+            "next": "https://swapi.dev/api/people/?page=2",
+            "results": [{"name": "P1", "url": "https://swapi.dev/api/people/1/"}],
+        },
+    )
+    respx.get("https://swapi.dev/api/people/", params={"page": 2}).respond(500)
+
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    router = create_app_router(swapi_client=client)
+
+    status, body, _ = _dispatch(router, "/export/people")
+    lines = [json.loads(line) for line in b"".join(body).splitlines()]
+
+    assert status == 200
+    assert lines[0]["id"] == 1
+    assert lines[-1]["error"]["code"] == "UPSTREAM_ERROR"
+
+
+def test_export_unknown_resource_returns_404():
+    router = create_app_router(swapi_client=SwapiClient(sleep_fn=lambda _: None))
+
+    status, payload, _ = _dispatch(router, "/export/droids")
+
+    assert status == 404
+    assert payload["errors"][0]["code"] == "NOT_FOUND"
+
+
+@respx.mock
+def test_main_streams_export_without_compression(monkeypatch):
+    mock_people_pages(respx, total=3)
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    monkeypatch.setattr(app_main, "_router", create_app_router(swapi_client=client))
+
+    with Flask(__name__).test_request_context("/export/people", headers={"Accept-Encoding": "gzip"}):
+        from flask import request
+
+        resp = app_main.main(request)
+        assert resp.is_streamed
+        data = b"".join(resp.response)
+
+    assert resp.headers["Content-Type"] == "application/x-ndjson"
+    assert "Content-Encoding" not in resp.headers
+    assert len(data.splitlines()) == 3
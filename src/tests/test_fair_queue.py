@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+import respx
+
+from app.main import create_app_router
+from clients import fair_queue
+from clients.fair_queue import FairQueue
+from clients.swapi import RetryConfig, SwapiClient, SwapiTimeout
+
+BASE = "https://swapi.dev/api"
+
+
+def _wait_for(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_backlog_is_served_in_proportion_to_weights():
+    q = FairQueue(capacity=1, weights={"b": 2.0})
+    q.acquire("holder")
+    order: list[str] = []
+    lock = threading.Lock()
+
+    def worker(key):
+        with q.slot(key):
+            with lock:
+                order.append(key)
+
+    threads = []
+    for key in ["a"] * 4 + ["b"] * 4:
+        t = threading.Thread(target=worker, args=(key,))
+        t.start()
+        threads.append(t)
+        _wait_for(lambda n=len(threads): len(q._waiters) == n)
+
+    q.release("holder")
+    for t in threads:
+        t.join(5)
+
+    assert sorted(order) == ["a"] * 4 + ["b"] * 4
+    assert order[:6].count("b") == 4  # peso 2 -> ~2x os slots enquanto os dois têm fila
+
+
+def test_per_key_cap_does_not_block_other_keys():
+    q = FairQueue(capacity=3, caps={"heavy": 1})
+    q.acquire("heavy")
+    done = threading.Event()
+
+    def second_heavy():
+        with q.slot("heavy"):
+            done.set()
+
+    t = threading.Thread(target=second_heavy)
+    t.start()
+    _wait_for(lambda: len(q._waiters) == 1)
+
+    q.acquire("light")  # passa na frente: "heavy" está no teto
+    assert not done.is_set()
+    q.release("heavy")
+    t.join(5)
+    assert done.is_set()
+    q.release("light")
+    assert q.state()["active"] == 0
+
+
+def test_waiting_past_max_wait_times_out():
+    q = FairQueue(capacity=1, max_wait=0.05)
+    q.acquire("a")
+    with pytest.raises(SwapiTimeout):
+        q.acquire("b")
+    q.release("a")
+    q.acquire("b")  # ticket cancelado não ocupa slot
+
+
+def test_cache_hits_bypass_the_queue_and_caller_comes_from_context():
+    q = FairQueue(capacity=1, max_wait=0.05)
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None, fair_queue=q)
+    client.seed([{"name": "Luke", "url": f"{BASE}/people/1/"}])
+    q.acquire("someone-else")
+
+    with fair_queue.activate("key-1") as key:
+        assert key == fair_queue.current_caller() == "key-1"
+        assert client.get_by_url(f"{BASE}/people/1/")["name"] == "Luke"
+        with pytest.raises(SwapiTimeout):
+            client.get_by_url(f"{BASE}/people/2/")
+    assert fair_queue.current_caller() == fair_queue.ANONYMOUS
+
+
+def test_from_env_parses_weights_and_caps():
+    q = FairQueue.from_env(
+        capacity=10,
+        environ={"FAIR_QUEUE_WEIGHTS": "gold:4, free:0.5", "FAIR_QUEUE_CAPS": "free:2", "FAIR_QUEUE_KEY_CAP": "6"},
+    )
+    assert q is not None
+    assert q.weight("gold") == 4 and q.weight("other") == 1
+    assert q.cap("free") == 2 and q.cap("other") == 6
+    assert FairQueue.from_env(capacity=10, environ={"FAIR_QUEUE": "off"}) is None
+
+
+class _RecordingQueue(FairQueue):
+    def acquire(self, key: str) -> None:
+        self.seen.append(key)
+        super().acquire(key)
+
+
+def test_idle_keys_are_forgotten():
+    q = FairQueue(capacity=1, max_wait=0.01)
+    for i in range(100):  # x-api-key é input livre: cada valor novo não pode ficar para sempre
+        with q.slot(f"key-{i}"):
+            pass
+    assert q._last_tag == {}
+
+    q.acquire("holder")
+    with pytest.raises(SwapiTimeout):
+        q.acquire("gave-up")
+    q.release("holder")
+    assert q._last_tag == {}
+
+
+@respx.mock
+def test_export_producer_thread_charges_the_callers_key():
+    for page in (1, 2):
+        respx.get(f"{BASE}/people/", params={"page": page}).respond(
+            200,
+            json={
+                "count": 2,
+                "next": f"{BASE}/people/?page=2" if page == 1 else None,
+                "results": [{"name": f"P{page}", "url": f"{BASE}/people/{page}/"}],
+            },
+        )
+    q = _RecordingQueue(capacity=2)
+    q.seen = []
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None, fair_queue=q)
+    router = create_app_router(swapi_client=client)
+
+    with fair_queue.activate("exporter"):
+        status, body, _ = router.dispatch(
+            method="GET", path="/export/people", query={}, headers={}, body=None, request_id="rid"
+        )
+    assert status == 200
+    assert len(b"".join(body).splitlines()) == 2
+    assert q.seen == ["exporter", "exporter"]
@@ -0,0 +1,89 @@
+import httpx
+import respx
+
+from app.handlers.health import ready_handler
+from app.main import create_app_router
+from app.router import Router
+from clients.swapi import RetryConfig, SwapiClient
+
+
+def _ready_router(client: SwapiClient, min_entries: int) -> Router:
+    router = Router()
+    router.add_route("GET", "/health/ready", ready_handler(client, min_cache_entries=min_entries))
+    return router
+
+
+def _get(router: Router):
+    return router.dispatch(
+        method="GET", path="/health/ready", query={}, headers={"x-request-id": "rid"}, body=None, request_id="rid"
+    )
+
+
+@respx.mock
+def test_ready_is_503_until_threshold_then_latches():
+    respx.get("https://swapi.dev/api/people/1/").respond(200, json={"name": "Luke"})
+    respx.get("https://swapi.dev/api/people/2/").respond(200, json={"name": "C-3PO"})
+
+    now = [1000.0]
+    client = SwapiClient(sleep_fn=lambda _: None, by_url_cache_ttl=10.0, now_fn=lambda: now[0])
+    router = _ready_router(client, min_entries=2)
+
+    status, payload, headers = _get(router)
+    assert status == 503
+    assert headers["Retry-After"] == "5"
+    assert payload["data"]["status"] == "warming"
+    assert payload["errors"][0]["code"] == "NOT_READY"
+
+    client.get_by_url("https://swapi.dev/api/people/1/")
+    now[0] += 3
+    client.get_by_url("https://swapi.dev/api/people/2/")
+
+    status, payload, _ = _get(router)
+    assert status == 200
+    assert payload["errors"] == []
+    data = payload["data"]
+    assert data["status"] == "ready"
+    assert data["caches"]["people"] == {"entries": 2, "oldest_age_s": 3.0, "newest_age_s": 0.0}
+    assert data["pool"]["open"] is True
+    assert data["upstream"]["count"] == 2
+    assert data["upstream"]["error_rate"] == 0.0
+
+    # TTL expira sem ninguém reler as chaves: não conta como cache quente, mas continua pronto (latch)
+    now[0] += 60
+    status, payload, _ = _get(router)
+    assert status == 200
+    assert payload["data"]["caches"] == {}
+    assert payload["data"]["warmup"]["cache_entries"] == 0
+
+
+@respx.mock
+def test_ready_reports_upstream_errors_in_summary():
+    respx.get("https://swapi.dev/api/films/").side_effect = httpx.ReadTimeout("boom")
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    try:
+        client.get("films/")
+    except Exception:
+        pass
+
+    status, payload, _ = _get(_ready_router(client, min_entries=0))
+    assert status == 200
+    summary = payload["data"]["upstream"]
+    assert summary["count"] == 1
+    assert summary["error_rate"] == 1.0
+
+
+def test_ready_route_is_registered_with_env_threshold(monkeypatch):
+    monkeypatch.setenv("READY_MIN_CACHE_ENTRIES", "5")
+    router = create_app_router(SwapiClient(sleep_fn=lambda _: None))
+
+    status, payload, _ = _get(router)
+    assert status == 503
+    assert payload["data"]["warmup"] == {"cache_entries": 0, "threshold": 5}
+    assert payload["data"]["pool"] == {
+        "open": False,
+        "connections": 0,
+        "idle": 0,
+        "http2": False,
+        "max_connections": 20,
+        "max_keepalive": 10,
+    }
@@ -0,0 +1,107 @@
+import random
+
+import pytest
+import respx
+
+from app.main import _finish_request, create_app_router
+from clients.swapi import RetryConfig, SwapiClient
+from observability import heavy_hitters
+from observability.heavy_hitters import CountMinSketch, HeavyHitters
+from observability.timing import RequestTimings
+
+BASE = "https://swapi.dev/api"
+
+
+@pytest.fixture(autouse=True)
+def _clean_trackers():
+    for tracker in heavy_hitters.TRACKERS.values():
+        tracker.clear()
+    yield
+
+
+def test_sketch_never_underestimates_and_memory_is_fixed():
+    cms = CountMinSketch(width=64, depth=4)
+    size = len(cms._cells)
+    truth: dict[str, int] = {}
+    rng = random.Random(7)
+    for _ in range(5000):
+        key = f"k{rng.randint(0, 500)}"
+        truth[key] = truth.get(key, 0) + 1
+        cms.add(key)
+
+    assert len(cms._cells) == size
+    assert all(cms.estimate(k) >= n for k, n in truth.items())
+
+
+def test_top_k_finds_heavy_keys_in_skewed_stream():
+    hh = HeavyHitters("t", k=5, width=512)
+    rng = random.Random(1)
+    stream = [f"/hot/{i}" for i in range(3) for _ in range(300)]
+    stream += [f"/cold/{rng.randint(0, 2000)}" for _ in range(3000)]
+    rng.shuffle(stream)
+    hh.add_many(stream)
+
+    top = [key for key, _ in hh.top(3)]
+    assert sorted(top) == ["/hot/0", "/hot/1", "/hot/2"]
+    assert len(hh._top) <= 5
+    assert hh.total == len(stream)
+
+
+def test_finish_request_tracks_routes_and_canonical_queries():
+    timings = RequestTimings()
+    timings.route = "/people"
+    for query in ("page=2&q=sky", "q=sky&page=2"):
+        _finish_request(timings, request_id="r", method="GET", path="/people", query=query, status=200)
+    _finish_request(timings, request_id="r", method="GET", path="/health", query="", status=200)
+
+    assert heavy_hitters.QUERIES.top(1) == [("/people?page=2&q=sky", 2)]
+    assert heavy_hitters.manifest(5) == {"paths": ["/people?page=2&q=sky"]}
+    assert heavy_hitters.ROUTES.estimate("/people") == 3
+
+
+@respx.mock
+def test_admin_routes_report_and_pin_hot_upstream_keys(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+    clock = {"t": 0.0}
+    respx.get(f"{BASE}/people/1/").respond(200, json={"name": "Luke", "url": f"{BASE}/people/1/"})
+    route = respx.get(f"{BASE}/people/2/").respond(200, json={"name": "C-3PO", "url": f"{BASE}/people/2/"})
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None, now_fn=lambda: clock["t"])
+    router = create_app_router(swapi_client=client)
+
+    for _ in range(3):
+        client.get_by_url(f"{BASE}/people/2/")
+    client.get_by_url(f"{BASE}/people/1/")
+
+    def call(method, path, query=None, body=None, token="s3cret"):
+        return router.dispatch(
+            method=method, path=path, query=query or {}, headers={"x-admin-token": token}, body=body, request_id="rid"
+        )
+
+    assert call("GET", "/admin/hot", token="")[0] == 401
+    status, payload, _ = call("POST", "/admin/hot/pin", body={"top": 1}, token="wrong")
+    assert status == 401 and payload["errors"][0]["code"] == "UNAUTHORIZED"
+    assert client.pinned() == []
+
+    status, payload, _ = call("GET", "/admin/hot", {"top": "1"})
+    assert status == 200
+    assert payload["data"]["upstream"]["top"] == [{"key": f"{BASE}/people/2/", "count": 3}]
+    assert call("GET", "/admin/hot", {"top": "0"})[0] == 400
+
+    status, payload, _ = call("POST", "/admin/hot/pin", body={"top": 1})
+    assert status == 200 and payload["data"]["pinned"] == [f"{BASE}/people/2/"]
+
+    # entrada fixada sobrevive ao TTL; a outra expira e volta ao upstream
+    clock["t"] += client.by_url_cache_ttl + 1
+    client.get_by_url(f"{BASE}/people/2/")
+    assert route.call_count == 1
+
+    assert call("POST", "/admin/hot/pin", body={"keys": []})[1]["data"]["pinned"] == []
+    assert call("POST", "/admin/hot/pin", body={"keys": "x"})[0] == 400
+
+
+def test_admin_routes_do_not_exist_without_admin_token(monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    router = create_app_router(swapi_client=SwapiClient(sleep_fn=lambda _: None))
+    for method, path in (("GET", "/admin/hot"), ("GET", "/admin/hot/manifest"), ("POST", "/admin/hot/pin")):
+        status, _, _ = router.dispatch(method=method, path=path, query={}, headers={}, body={}, request_id="rid")
+        assert status == 404
@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+
+from app.router import LazyHandler, RequestContext, Router
+from bench.importtime import parse_importtime
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_entrypoint_defers_handlers_and_httpx():
+    code = (
+        "import json, sys; import main; "
+        "print(json.dumps({'handlers': sorted(m for m in sys.modules if m.startswith('app.handlers.')), "
+        "'httpx': 'httpx' in sys.modules, 'flask': 'flask' in sys.modules}))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": SRC, "WARMUP": "off"},
+        check=True,
+    )
+    loaded = json.loads(out.stdout)
+    assert loaded == {"handlers": [], "httpx": False, "flask": False}
+
+
+def test_lazy_handler_imports_and_builds_once(monkeypatch):
+    built = []
+
+    def factory(tag, *, suffix):
+        built.append(tag)
+        return lambda ctx: (200, {"tag": tag + suffix, "path": ctx.path}, {})
+
+    fake_module = type(sys)("fake_lazy_handlers")
+    fake_module.make = factory
+    monkeypatch.setitem(sys.modules, "fake_lazy_handlers", fake_module)
+
+    lazy = LazyHandler("fake_lazy_handlers", "make", "films", suffix="!")
+    assert built == []
+
+    router = Router()
+    router.add_route("GET", "/films", lazy)
+    for _ in range(2):
+        status, payload, _ = router.dispatch(
+            method="GET", path="/films", query={}, headers={}, body=None, request_id="rid"
+        )
+        assert status == 200
+        assert payload == {"tag": "films!", "path": "/films"}
+
+    assert built == ["films"]
+    assert lazy(RequestContext("GET", "/x", {}, {}, None, {}))[1]["path"] == "/x"
+
+
+def test_parse_importtime_reads_self_cumulative_and_depth():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     app.pagination",
+            "import time:      1500 |       1620 |   app.router",
+            "import time:       200 |       1820 | main",
+        ]
+    )
+    entries = parse_importtime(stderr)
+    assert [(e.name, e.self_us, e.cumulative_us, e.depth) for e in entries] == [
+        ("app.pagination", 120, 120, 2),
+        ("app.router", 1500, 1620, 1),
+        ("main", 200, 1820, 0),
+    ]
@@ -0,0 +1,130 @@
+import threading
+
+import httpx
+import pytest
+import respx
+from flask import Flask
+
+import app.main as app_main
+from app.main import create_app_router
+from clients.swapi import RetryConfig, SwapiClient, SwapiTimeout
+from observability import metrics
+from observability.metrics import MetricsRegistry
+
+
+def test_counter_sums_per_thread_shards():
+    reg = MetricsRegistry()
+    c = reg.counter("hits", "h", ("route",))
+
+    def work() -> None:
+        for _ in range(1000):
+            c.inc("/films")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert c.values() == {("/films",): 8000.0}
+
+
+def test_shards_of_finished_threads_are_folded_not_accumulated():
+    from app.concurrency import run_bounded
+
+    reg = MetricsRegistry()
+    c = reg.counter("calls", "c", ("resource",))
+    h = reg.histogram("lat_seconds", "l", buckets=(0.1, 1.0))
+
+    def work(item: str) -> str:
+        c.inc("people")
+        h.observe(0.05)
+        return item
+
+    for _ in range(100):  # executor novo a cada fan-out, como nos handlers
+        run_bounded(work, ["a", "b", "c", "d"], max_workers=4)
+
+    assert len(c._shards) <= 8 and len(h._shards) <= 8
+    assert c.values() == {("people",): 400.0}
+    assert h.values()[()][1] == 400.0
+
+
+def test_histogram_renders_cumulative_buckets():
+    reg = MetricsRegistry()
+    h = reg.histogram("lat_seconds", "l", ("route",), buckets=(0.1, 1.0))
+    h.observe(0.05, "/a")
+    h.observe(0.5, "/a")
+    h.observe(3.0, "/a")
+
+    text = reg.render()
+    assert '# TYPE lat_seconds histogram' in text
+    assert 'lat_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'lat_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'lat_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'lat_seconds_count{route="/a"} 3' in text
+    assert 'lat_seconds_sum{route="/a"} 3.55' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_registry_is_idempotent_but_rejects_other_shapes():
+    reg = MetricsRegistry()
+    a = reg.counter("x", "x", ("a",))
+    assert reg.counter("x", "x", ("a",)) is a
+    with pytest.raises(ValueError):
+        reg.histogram("x", "x", ("a",))
+    with pytest.raises(ValueError):
+        a.inc()
+
+
+@respx.mock
+def test_client_records_upstream_outcomes_and_timeouts():
+    respx.get("https://swapi.dev/api/vehicles/").side_effect = httpx.ReadTimeout("boom")
+    client = SwapiClient(retry=RetryConfig(max_retries=1), sleep_fn=lambda _: None)
+
+    calls_before = metrics.UPSTREAM_CALLS.values().get(("vehicles", "timeout"), 0)
+    timeouts_before = metrics.UPSTREAM_TIMEOUTS.values().get(("vehicles",), 0)
+    retries_before = metrics.UPSTREAM_RETRIES.values().get(("vehicles",), 0)
+
+    with pytest.raises(SwapiTimeout):
+        client.get("vehicles/")
+
+    assert metrics.UPSTREAM_CALLS.values()[("vehicles", "timeout")] == calls_before + 1
+    assert metrics.UPSTREAM_TIMEOUTS.values()[("vehicles",)] == timeouts_before + 2
+    assert metrics.UPSTREAM_RETRIES.values()[("vehicles",)] == retries_before + 1
+
+
+@respx.mock
+def test_metrics_route_exposes_request_and_cache_metrics(monkeypatch):
+    respx.get("https://swapi.dev/api/films/").respond(200, json={"count": 0, "results": []})
+    client = SwapiClient(sleep_fn=lambda _: None, page_cache_ttl=60.0)
+    monkeypatch.setattr(app_main, "_router", create_app_router(client))
+    flask_app = Flask(__name__)
+
+    for _ in range(2):
+        with flask_app.test_request_context("/films"):
+            from flask import request
+
+            app_main.main(request)
+
+    with flask_app.test_request_context("/metrics"):
+        from flask import request
+
+        resp = app_main.main(request)
+
+    assert resp.status_code == 200
+    assert resp.headers["Content-Type"].startswith("application/openmetrics-text")
+    text = resp.get_data(as_text=True)
+    assert 'http_requests_total{route="/films",method="GET",status="200"}' in text
+    assert 'http_request_duration_seconds_count{route="/films",method="GET"}' in text
+    assert 'swapi_cache_entries{cache="page"} 1' in text
+    assert 'swapi_cache_hits_total{cache="page"}' in text
+
+
+def test_flush_pushes_rendered_text_and_maybe_flush_needs_url(monkeypatch):
+    pushed: list[str] = []
+    monkeypatch.delenv("METRICS_PUSH_URL", raising=False)
+
+    assert metrics.flush() is False
+    assert metrics.flush(pushed.append) is True
+    assert pushed[0].endswith("# EOF\n")
+    assert metrics.FLUSHER.maybe_flush() is False
@@ -0,0 +1,25 @@
+import json
+
+from bench import micro
+
+
+def test_all_cases_run_once():
+    cases = micro.build_cases()
+    assert len({c.name for c in cases}) == len(cases)
+    for case in cases:
+        case.fn()
+
+
+def test_check_flags_regression_against_baseline(tmp_path, monkeypatch):
+    baseline = tmp_path / "micro.json"
+    # baseline absurdamente rápida para o case filtrado => regressão garantida
+    baseline.write_text(json.dumps({"ns_per_op": {"utils.extract_id": 0.001}}))
+    monkeypatch.setattr(micro, "measure", lambda fn, rounds=7: 100.0)
+
+    assert micro.main(["-k", "extract_id", "--baseline", str(baseline)]) == 1
+    assert micro.main(["-k", "extract_id", "--baseline", str(baseline), "--threshold", "1e9"]) == 0
+
+    assert micro.main(["-k", "extract_id", "--baseline", str(baseline), "--save"]) == 0
+    saved = json.loads(baseline.read_text())["ns_per_op"]
+    assert saved["utils.extract_id"] == 100.0
+    assert saved["_reference"] == 100.0
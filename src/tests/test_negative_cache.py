@@ -0,0 +1,131 @@
+import pytest
+import respx
+
+from app.main import create_app_router
+from clients.id_index import IdIndex
+from clients.swapi import RetryConfig, SwapiClient, SwapiNotFound
+
+BASE = "https://swapi.dev/api"
+
+
+def _client(clock):
+    return SwapiClient(
+        retry=RetryConfig(max_retries=0),
+        sleep_fn=lambda _: None,
+        page_cache_ttl=60.0,
+        negative_cache_ttl=30.0,
+        now_fn=lambda: clock["t"],
+    )
+
+
+def _page(count, ids, resource="people"):
+    return {"count": count, "results": [{"name": f"X{i}", "url": f"{BASE}/{resource}/{i}/"} for i in ids]}
+
+
+@respx.mock
+def test_404_is_cached_with_its_own_ttl():
+    clock = {"t": 0.0}
+    client = _client(clock)
+    route = respx.get(f"{BASE}/people/17/").respond(404)
+
+    for _ in range(3):
+        with pytest.raises(SwapiNotFound):
+            client.get_by_url(f"{BASE}/people/17/")
+    assert route.call_count == 1
+    assert client.cache_entries()["negative"] == 1
+
+    # mesma entrada para a forma não canônica
+    with pytest.raises(SwapiNotFound):
+        client.get_by_url("http://swapi.dev/api/people/17")
+    assert route.call_count == 1
+
+    clock["t"] += 31
+    with pytest.raises(SwapiNotFound):
+        client.get_by_url(f"{BASE}/people/17/")
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_complete_bitmap_answers_missing_ids_without_upstream():
+    client = _client({"t": 0.0})
+    respx.get(f"{BASE}/people/", params={"page": 1}).respond(200, json=_page(3, [1, 2, 4]))
+    missing = respx.get(f"{BASE}/people/3/").respond(404)
+    present = respx.get(f"{BASE}/people/4/").respond(200, json={"name": "X4", "url": f"{BASE}/people/4/"})
+
+    client.get("people/", params={"page": 1})
+    assert client.id_index_state()["people"] == {"ids": 3, "expected": 3, "complete": True, "bytes": 1}
+
+    with pytest.raises(SwapiNotFound):
+        client.get_by_url(f"{BASE}/people/3/")
+    with pytest.raises(SwapiNotFound):
+        client.get("people/999/")
+    assert missing.call_count == 0
+
+    assert client.get_by_url(f"{BASE}/people/4/")["name"] == "X4"
+    assert present.call_count == 1
+
+
+def test_incomplete_or_changed_collections_never_deny():
+    index = IdIndex()
+    index.observe_page("people", _page(5, [1, 2, 3]))
+    assert not index.missing("people", 9)
+
+    index.observe_page("people", _page(5, [4, 6]))
+    assert index.missing("people", 5) and not index.missing("people", 6)
+
+    # count mudou: recomeça até rever o recurso inteiro
+    index.observe_page("people", _page(6, [1]))
+    assert not index.missing("people", 5)
+    assert not index.missing("films", 1)
+
+
+@respx.mock
+def test_invalid_film_returns_404_without_upstream_after_listing():
+    client = _client({"t": 0.0})
+    respx.get(f"{BASE}/films/").respond(200, json=_page(2, [1, 2], resource="films"))
+    film = respx.get(f"{BASE}/films/999/").respond(404)
+    router = create_app_router(swapi_client=client)
+
+    def get(path):
+        return router.dispatch(method="GET", path=path, query={}, headers={}, body=None, request_id="rid")
+
+    assert get("/films")[0] == 200
+    status, payload, _ = get("/films/999/characters")
+    assert status == 404
+    assert payload["errors"][0]["code"] == "UPSTREAM_NOT_FOUND"
+    assert film.call_count == 0
+
+
+@respx.mock
+def test_negative_cache_is_bounded_for_a_stream_of_distinct_missing_ids():
+    respx.get(url__regex=rf"{BASE}/people/\d+/").respond(404)
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None, cache_max_entries=10)
+
+    for i in range(1000, 1100):
+        with pytest.raises(SwapiNotFound):
+            client.get_by_url(f"{BASE}/people/{i}/")
+
+    assert client.cache_entries()["negative"] == 10
+
+
+@respx.mock
+def test_later_page_or_seed_showing_the_id_drops_the_negative_entry():
+    clock = {"t": 0.0}
+    client = _client(clock)
+    respx.get(f"{BASE}/people/17/").respond(404)
+    respx.get(f"{BASE}/people/99/").respond(404)
+    with pytest.raises(SwapiNotFound):
+        client.get_by_url(f"{BASE}/people/17/")
+    with pytest.raises(SwapiNotFound):
+        client.get("people/17/")  # 2ª forma de chave do mesmo id
+    with pytest.raises(SwapiNotFound):
+        client.get_by_url(f"{BASE}/people/99/")
+    assert client.cache_entries()["negative"] == 3
+
+    respx.get(f"{BASE}/people/", params={"page": 2}).respond(200, json=_page(90, [17, 18]))
+    client.get("people/", params={"page": 2})
+    assert client.cache_entries()["negative"] == 1
+
+    client.seed([{"name": "X99", "url": f"{BASE}/people/99/"}])
+    assert client.cache_entries()["negative"] == 0
+    assert client.get_by_url(f"{BASE}/people/99/")["name"] == "X99"
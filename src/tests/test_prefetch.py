@@ -0,0 +1,73 @@
+import pytest
+
+from app.main import create_app_router
+from app.prefetch import Prefetcher
+from bench.swapi_emulator import SwapiEmulator
+from clients.swapi import RetryConfig, SwapiClient
+
+
+@pytest.fixture
+def emulator():
+    with SwapiEmulator() as emu:
+        yield emu
+
+
+def _client(emu):
+    return SwapiClient(
+        base_url=emu.base_url,
+        retry=RetryConfig(max_retries=0),
+        sleep_fn=lambda _: None,
+        page_cache_ttl=60.0,
+    )
+
+
+def _get(router, path, query):
+    return router.dispatch(method="GET", path=path, query=query, headers={}, body=None, request_id="rid")
+
+
+def test_next_page_and_next_children_are_served_from_cache(emulator, monkeypatch):
+    monkeypatch.setenv("PREFETCH", "1")
+    client = _client(emulator)
+    router = create_app_router(swapi_client=client)
+    prefetch = router.match("GET", "/people").handler.kwargs["prefetch"]
+
+    assert _get(router, "/people", {"page": "1", "page_size": "10"})[0] == 200
+    assert _get(router, "/films/1/characters", {"page": "1", "page_size": "5"})[0] == 200
+    assert prefetch.join()
+
+    emulator.reset_calls()
+    status, payload, _ = _get(router, "/people", {"page": "2", "page_size": "10"})
+    assert status == 200 and payload["data"][0]["id"] == 11
+    status, payload, _ = _get(router, "/films/1/characters", {"page": "2", "page_size": "5"})
+    assert status == 200 and len(payload["data"]) == 5
+    assert emulator.calls == 0
+
+
+def test_prefetch_yields_to_foreground_and_gives_up_after_deadline(emulator):
+    client = _client(emulator)
+    clock = {"t": 0.0}
+
+    def sleep(s):
+        clock["t"] += s
+
+    prefetch = Prefetcher(client, max_defer_seconds=1.0, now_fn=lambda: clock["t"], sleep_fn=sleep)
+    client._inflight = 1  # request de foreground em andamento
+
+    prefetch.window("people/", page=2, page_size=10)
+    assert prefetch.join()
+    assert emulator.calls == 0
+    assert clock["t"] >= 1.0
+
+
+def test_queue_is_bounded_and_dedupes(emulator):
+    client = _client(emulator)
+    prefetch = Prefetcher(client, max_queue=2)
+    client._inflight = 1  # segura o worker enquanto a fila enche
+
+    urls = [f"{emulator.base_url}/people/{i}/" for i in (1, 2, 3)]
+    assert prefetch.urls(urls[:1] + urls[:1]) == 1
+    # worker pode já ter tirado o 1º da fila; a fila nunca passa do limite
+    prefetch.urls(urls[1:])
+    assert len(prefetch._queue) <= 2
+    client._inflight = 0
+    assert prefetch.join()
@@ -0,0 +1,53 @@
+import pytest
+
+from app import main as app_main
+from app import prefork
+from bench.swapi_emulator import SwapiEmulator
+
+
+@pytest.fixture
+def emulator(monkeypatch):
+    with SwapiEmulator() as emu:
+        monkeypatch.setenv("SWAPI_BASE_URL", emu.base_url)
+        monkeypatch.setattr(app_main, "_router", None)
+        yield emu
+
+
+def _get(path, query=None):
+    return app_main._get_router().dispatch(
+        method="GET", path=path, query=query or {}, headers={}, body=None, request_id="rid"
+    )
+
+
+def test_snapshot_serves_lists_filters_and_fanout_without_upstream(emulator):
+    report = prefork.load_snapshot(freeze=False)
+
+    assert report.records["people"] == 82
+    assert report.records["starships"] == 36
+    assert report.frozen_objects == 0
+
+    emulator.reset_calls()
+    status, payload, _ = _get("/people", {"page": "3", "page_size": "25"})
+    assert status == 200 and payload["meta"]["total"] == 82
+    assert _get("/films")[1]["meta"]["total"] == 6
+    assert _get("/planets", {"filter": "population>1000", "sort": "-population"})[0] == 200
+    status, payload, _ = _get("/films/1/characters", {"page_size": "50"})
+    assert status == 200 and payload["data"]
+
+    assert emulator.calls == 0
+
+
+def test_snapshot_client_holds_no_open_connections(emulator):
+    prefork.load_snapshot(freeze=False)
+    status, payload, _ = _get("/health/ready")
+    assert payload["data"]["pool"]["open"] is False
+
+
+def test_snapshot_entries_outlive_normal_ttl(emulator, monkeypatch):
+    monkeypatch.setenv("PREFORK_REFRESH_SECONDS", "0")
+    router, _ = prefork.build_router(ttl_seconds=float("inf"))
+    app_main.install_router(router)
+
+    emulator.reset_calls()
+    assert _get("/starships", {"sort": "name"})[0] == 200
+    assert emulator.calls == 0
@@ -0,0 +1,89 @@
+import pytest
+import respx
+
+from app.main import create_app_router
+from app.projection import Projection, ProjectionError, apply_projection, parse_projection
+from clients.swapi import RetryConfig, SwapiClient
+
+LUKE = {
+    "name": "Luke Skywalker",
+    "height": "172",
+    "homeworld": "https://swapi.dev/api/planets/1/",
+    "films": ["https://swapi.dev/api/films/1/", "https://swapi.dev/api/films/2/"],
+    "species": [],
+    "url": "https://swapi.dev/api/people/1/",
+    "id": 1,
+}
+
+
+def test_parse_projection_defaults_to_identity():
+    assert parse_projection({}) == Projection(fields=None, compact=False)
+
+
+def test_parse_projection_normalizes_fields_and_compact():
+    p = parse_projection({"fields": " name,height,name ", "compact": "1"})
+    assert p.fields == ("height", "name")
+    assert p.compact is True
+    assert p.query() == {"fields": "height,name", "compact": "1"}
+
+
+@pytest.mark.parametrize("query", [{"fields": "name,bad-field"}, {"compact": "maybe"}])
+def test_parse_projection_invalid(query):
+    with pytest.raises(ProjectionError):
+        parse_projection(query)
+
+
+def test_apply_projection_fields_always_keeps_id():
+    out = apply_projection(LUKE, Projection(fields=("name",)))
+    assert out == {"name": "Luke Skywalker", "id": 1}
+
+
+def test_apply_projection_compact_replaces_nested_urls_with_ids():
+    out = apply_projection(LUKE, Projection(compact=True))
+    assert out["homeworld"] == 1
+    assert out["films"] == [1, 2]
+    assert out["species"] == []
+    assert out["height"] == "172"
+    assert out["url"] == "https://swapi.dev/api/people/1/"  # identidade não é compactada
+    assert "homeworld" in LUKE and LUKE["films"][0].startswith("https://")  # não mutou
+
+
+@respx.mock
+def test_people_list_fields_and_compact_are_applied_and_kept_in_links():
+    respx.get("https://swapi.dev/api/people/", params={"page": 1}).respond(
+        200,
+        json={"count": 11, "results": [{k: v for k, v in LUKE.items() if k != "id"}] * 10},
+    )
+
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    router = create_app_router(swapi_client=client)
+
+    status, payload, _ = router.dispatch(
+        method="GET",
+        path="/people",
+        query={"page": "1", "fields": "name,films", "compact": "1"},
+        headers={"x-request-id": "rid-proj"},
+        body=None,
+        request_id="rid-proj",
+    )
+
+    assert status == 200
+    assert payload["data"][0] == {"name": "Luke Skywalker", "films": [1, 2], "id": 1}
+    assert payload["links"]["self"] == "/people?page=1&page_size=10&compact=1&fields=films%2Cname"
+    assert payload["links"]["next"] == "/people?page=2&page_size=10&compact=1&fields=films%2Cname"
+
+
+def test_people_list_invalid_fields_returns_400():
+    router = create_app_router(swapi_client=SwapiClient(sleep_fn=lambda _: None))
+
+    status, payload, _ = router.dispatch(
+        method="GET",
+        path="/people",
+        query={"fields": "name;drop"},
+        headers={},
+        body=None,
+        request_id="rid-proj-2",
+    )
+
+    assert status == 400
+    assert payload["errors"][0]["code"] == "VALIDATION_ERROR"
@@ -0,0 +1,100 @@
+import json
+import tracemalloc
+
+import respx
+
+from bench.fixtures import build_dataset
+from clients import records
+from clients.records import CompactRecord
+from clients.swapi import SwapiClient
+
+BASE = "https://swapi.dev/api"
+
+
+def _all_records():
+    data = build_dataset(BASE)
+    return [rec for by_id in data.values() for rec in by_id.values()]
+
+
+def test_pack_roundtrips_every_resource():
+    for rec in _all_records():
+        packed = records.pack(rec)
+        assert isinstance(packed, CompactRecord)
+        assert packed.to_dict() == rec
+
+
+def test_url_fields_become_ids_and_shapes_are_shared():
+    def person(i, films):
+        return {
+            "name": f"P{i}",
+            "homeworld": f"{BASE}/planets/{i}/",
+            "films": [f"{BASE}/films/{f}/" for f in films],
+            "url": f"{BASE}/people/{i}/",
+        }
+
+    a, b = records.pack(person(1, [1, 2])), records.pack(person(2, [3]))
+
+    assert a.shape is b.shape
+    shape = a.shape
+    assert shape.base == BASE
+    assert shape.kinds == (records.RAW, records.URL, records.URLS, records.URL)
+    assert shape.resources == ("", "planets", "films", "people")
+    assert a.values[1] == 1
+    assert list(a.values[2]) == [1, 2]
+
+
+def test_pack_leaves_unknown_shapes_alone():
+    plain = {"name": "x"}
+    assert records.pack(plain) is plain
+
+    mixed = {"url": f"{BASE}/people/1/", "links": [f"{BASE}/films/1/", f"{BASE}/planets/1/"], "ext": "https://other/x/1/"}
+    assert records.pack(mixed).to_dict() == mixed
+
+
+def test_expand_returns_fresh_structures():
+    page = {"count": 1, "next": None, "results": [{"url": f"{BASE}/people/1/", "films": [f"{BASE}/films/1/"], "tags": ["a"]}]}
+    stored = records.compact(page)
+
+    first = records.expand(stored)
+    first["results"][0]["films"].append("mutated")
+    first["results"][0]["tags"].append("mutated")
+
+    assert records.expand(stored) == page
+
+
+def test_compact_uses_much_less_memory_than_dicts():
+    raw = [json.dumps(r) for r in _all_records()]
+
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        dicts = [json.loads(j) for j in raw]
+        dict_bytes = tracemalloc.get_traced_memory()[0] - base
+
+        base = tracemalloc.get_traced_memory()[0]
+        packed = [records.pack(json.loads(j)) for j in raw]
+        packed_bytes = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+
+    assert len(dicts) == len(packed)
+    assert packed_bytes < dict_bytes * 0.5
+
+
+@respx.mock
+def test_client_stores_compact_records_and_serves_equal_dicts():
+    person = {"name": "Luke", "films": [f"{BASE}/films/1/"], "url": f"{BASE}/people/1/"}
+    route = respx.get(f"{BASE}/people/1/").respond(200, json=person)
+    client = SwapiClient(sleep_fn=lambda _: None)
+
+    assert client.get_by_url(f"{BASE}/people/1/") == person
+    assert client.get_by_url(f"{BASE}/people/1/") == person
+    assert route.call_count == 1
+
+    (stored,) = [v for _, v in client._get_by_url_cache()._store.values()]
+    assert isinstance(stored, CompactRecord)
+
+    plain = SwapiClient(sleep_fn=lambda _: None, compact_cache=False)
+    plain.get_by_url(f"{BASE}/people/1/")
+    (stored,) = [v for _, v in plain._get_by_url_cache()._store.values()]
+    assert stored == person
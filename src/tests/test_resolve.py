@@ -0,0 +1,123 @@
+import respx
+
+from app.main import create_app_router
+from clients.swapi import RetryConfig, SwapiClient
+
+
+@respx.mock
+def test_resolve_dedupes_refs_and_returns_envelope_keyed_by_ref():
+    p1 = respx.get("https://swapi.dev/api/people/1/").respond(
+        200, json={"name": "Luke Skywalker", "url": "https://swapi.dev/api/people/1/"}
+    )
+    f1 = respx.get("https://swapi.dev/api/films/1/").respond(
+        200, json={"title": "A New Hope", "url": "https://swapi.dev/api/films/1/"}
+    )
+
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    router = create_app_router(swapi_client=client)
+
+    status, payload, _ = router.dispatch(
+        method="POST",
+        path="/resolve",
+        query={},
+        headers={"x-request-id": "rid-r1"},
+        body={"refs": ["people/1", "https://swapi.dev/api/people/1/", "films/1", "people/1"]},
+        request_id="rid-r1",
+    )
+
+    assert status == 200
+    assert payload["errors"] == []
+    assert set(payload["data"].keys()) == {"people/1", "https://swapi.dev/api/people/1/", "films/1"}
+    assert payload["data"]["people/1"]["id"] == 1
+    assert payload["data"]["https://swapi.dev/api/people/1/"]["name"] == "Luke Skywalker"
+    assert payload["data"]["films/1"]["title"] == "A New Hope"
+    assert payload["meta"]["total"] == 3
+
+    # refs diferentes para o mesmo recurso = 1 chamada upstream
+    assert p1.call_count == 1
+    assert f1.call_count == 1
+
+
+@respx.mock
+def test_resolve_get_with_missing_ref_keeps_partial_result():
+    respx.get("https://swapi.dev/api/people/1/").respond(
+        200, json={"name": "Luke Skywalker", "url": "https://swapi.dev/api/people/1/"}
+    )
+    respx.get("https://swapi.dev/api/people/17/").respond(404, json={"detail": "Not found"})
+
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    router = create_app_router(swapi_client=client)
+
+    status, payload, _ = router.dispatch(
+        method="GET",
+        path="/resolve",
+        query={"refs": "people/1,people/17"},
+        headers={"x-request-id": "rid-r2"},
+        body=None,
+        request_id="rid-r2",
+    )
+
+    assert status == 200
+    assert payload["data"]["people/1"]["id"] == 1
+    assert payload["data"]["people/17"] is None
+    assert payload["meta"]["count"] == 1
+    assert payload["errors"][0]["code"] == "UPSTREAM_NOT_FOUND"
+    assert payload["errors"][0]["details"] == {"ref": "people/17"}
+
+
+def test_resolve_invalid_refs_returns_400():
+    router = create_app_router(swapi_client=SwapiClient(sleep_fn=lambda _: None))
+
+    status, payload, _ = router.dispatch(
+        method="GET",
+        path="/resolve",
+        query={"refs": "people/1,droids/2,nope"},
+        headers={"x-request-id": "rid-r3"},
+        body=None,
+        request_id="rid-r3",
+    )
+
+    assert status == 400
+    assert payload["errors"][0]["code"] == "VALIDATION_ERROR"
+    assert payload["errors"][0]["details"] == {"refs": ["droids/2", "nope"]}
+
+
+def test_resolve_without_refs_returns_400():
+    router = create_app_router(swapi_client=SwapiClient(sleep_fn=lambda _: None))
+
+    status, payload, _ = router.dispatch(
+        method="GET",
+        path="/resolve",
+        query={},
+        headers={},
+        body=None,
+        request_id="rid-r4",
+    )
+
+    assert status == 400
+    assert payload["errors"][0]["message"] == "refs is required"
+
+
+@respx.mock
+def test_resolve_reuses_the_shared_client_cache():
+    route = respx.get("https://swapi.dev/api/people/1/").respond(
+        200, json={"name": "Luke Skywalker", "url": "https://swapi.dev/api/people/1/"}
+    )
+
+    client = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    client.get_by_url("https://swapi.dev/api/people/1/")
+    router = create_app_router(swapi_client=client)
+
+    status, payload, _ = router.dispatch(
+        method="GET",
+        path="/resolve",
+        query={"refs": "people/1"},
+        headers={"x-request-id": "rid-r3"},
+        body=None,
+        request_id="rid-r3",
+    )
+
+    assert status == 200
+    assert payload["data"]["people/1"]["name"] == "Luke Skywalker"
+    # cache por URL compartilhado com o client da app: nenhuma chamada extra
+    assert route.call_count == 1
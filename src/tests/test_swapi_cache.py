@@ -56,4 +56,19 @@ def test_film_characters_second_call_reuses_people_cache():
     assert payload2["meta"]["count"] == 2
 
     assert p1.call_count == 1
-    assert p2.call_count == 1
\ No newline at end of file
+    assert p2.call_count == 1
+
+@respx.mock
+def test_page_cache_is_bounded_lru_over_distinct_searches():
+    route = respx.get("https://swapi.dev/api/people/").respond(200, json={"count": 0, "results": []})
+    client = SwapiClient(
+        retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None, page_cache_ttl=60.0, cache_max_entries=3
+    )
+
+    client.get("people/", params={"search": "keep"})
+    for i in range(50):
+        client.get("people/", params={"search": f"random-{i}"})
+        client.get("people/", params={"search": "keep"})  # uso recente: fica no LRU
+
+    assert client.cache_entries()["page"] == 3
+    assert route.call_count == 51  # "keep" nunca saiu do cache
@@ -74,3 +74,100 @@ def test_invalid_json_raises_bad_response():
     c = SwapiClient(sleep_fn=lambda _: None)
     with pytest.raises(SwapiBadResponse):
         c.get("/films/")
+
+
+@respx.mock
+def test_profile_shares_pool_and_cache_but_not_retry_policy():
+    route = respx.get("https://swapi.dev/api/people/1/")
+    route.side_effect = [httpx.Response(503), httpx.Response(200, json={"name": "Luke"})]
+
+    c = SwapiClient(retry=RetryConfig(max_retries=2), sleep_fn=lambda _: None)
+    fast = c.with_profile(timeout=2.0, retry=RetryConfig(max_retries=0))
+
+    with pytest.raises(SwapiUpstreamError):
+        fast.get_by_url("https://swapi.dev/api/people/1/")
+    assert c.get_by_url("https://swapi.dev/api/people/1/")["name"] == "Luke"
+    assert fast.get_by_url("https://swapi.dev/api/people/1/")["name"] == "Luke"  # cache do raiz
+
+    assert route.call_count == 2
+    assert fast._get_client() is c._get_client()
+    assert fast.with_profile()._root is c
+    assert route.calls[0].request.extensions["timeout"]["read"] == 2.0
+    assert route.calls[1].request.extensions["timeout"]["read"] == 3.0
+
+    fast.close()
+    assert c._http is not None
+
+
+def test_pool_limits_and_http2_fallback(monkeypatch):
+    monkeypatch.setattr("clients.swapi._http2_available", lambda: False)
+    c = SwapiClient(http2=True, max_connections=4, max_keepalive=2, keepalive_expiry=5.0)
+
+    pool = c._get_client()._transport._pool
+    assert pool._max_connections == 4
+    assert pool._max_keepalive_connections == 2
+    assert pool._keepalive_expiry == 5.0
+    assert c.pool_state()["http2"] is False
+    c.close()
+
+
+@respx.mock
+def test_stale_keepalive_is_replayed_once_outside_retry_budget():
+    route = respx.get("https://swapi.dev/api/people/1/")
+    route.side_effect = [httpx.RemoteProtocolError("Server disconnected"), httpx.Response(200, json={"name": "Luke"})]
+
+    c = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+    assert c.get_by_url("https://swapi.dev/api/people/1/")["name"] == "Luke"
+    assert route.call_count == 2
+
+
+@respx.mock
+def test_failure_on_fresh_connection_goes_through_retry_not_replay():
+    def fresh_connection_reset(request):
+        # o httpcore avisa pelo trace que abriu conexão para este envio
+        request.extensions["trace"]("connection.connect_tcp.started", {})
+        raise httpx.ReadError("reset")
+
+    route = respx.get("https://swapi.dev/api/people/3/")
+    route.side_effect = [fresh_connection_reset, httpx.Response(200, json={"name": "R2-D2"})]
+    sleeps: list[float] = []
+
+    c = SwapiClient(retry=RetryConfig(max_retries=1, backoff_base=0.1), sleep_fn=sleeps.append)
+    assert c.get_by_url("https://swapi.dev/api/people/3/")["name"] == "R2-D2"
+    assert route.call_count == 2
+    assert sleeps == [0.1]  # passou pelo backoff: contou como tentativa, não como replay
+
+    route.side_effect = [fresh_connection_reset]
+    c0 = SwapiClient(retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None, by_url_cache_ttl=0.0)
+    with pytest.raises(SwapiUpstreamError):
+        c0.get_by_url("https://swapi.dev/api/people/3/")
+    assert route.call_count == 3
+
+
+@respx.mock
+def test_second_connection_failure_becomes_upstream_error():
+    route = respx.get("https://swapi.dev/api/people/2/")
+    route.side_effect = [httpx.ReadError("reset"), httpx.ReadError("reset"), httpx.ReadError("reset")]
+
+    c = SwapiClient(retry=RetryConfig(max_retries=1), sleep_fn=lambda _: None)
+    with pytest.raises(SwapiUpstreamError):
+        c.get_by_url("https://swapi.dev/api/people/2/")
+    # 1 replay + 1 retry: o replay não é repetido na tentativa seguinte
+    assert route.call_count == 3
+
+
+@respx.mock
+def test_idle_pool_is_reaped_before_next_call(monkeypatch):
+    respx.get("https://swapi.dev/api/films/").respond(200, json={"count": 0})
+    c = SwapiClient(idle_reap_after=10.0, sleep_fn=lambda _: None)
+    fast = c.with_profile(retry=RetryConfig(max_retries=0))
+    reaped = []
+    monkeypatch.setattr(c, "reap_idle", lambda: reaped.append(1) or 0)
+
+    c.get("films/")
+    fast.get("films/")
+    assert reaped == []
+
+    c._last_activity -= 11.0
+    fast.get("films/")
+    assert reaped == [1]
@@ -0,0 +1,58 @@
+import pytest
+
+from app.swapi_window import fetch_window
+from bench.swapi_emulator import FaultConfig, SwapiEmulator
+from clients.swapi import RetryConfig, SwapiClient, SwapiNotFound, SwapiUpstreamError
+
+
+@pytest.fixture
+def emulator():
+    with SwapiEmulator() as emu:
+        yield emu
+
+
+def test_emulator_pages_like_swapi(emulator):
+    client = SwapiClient(base_url=emulator.base_url, retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+
+    first = client.get("people/", params={"page": 1})
+    assert first["count"] == 82
+    assert len(first["results"]) == 10
+    assert first["previous"] is None
+    assert first["next"].endswith("/people/?page=2")
+
+    last = client.get("people/", params={"page": 9})
+    assert len(last["results"]) == 2
+    assert last["next"] is None
+
+    with pytest.raises(SwapiNotFound):
+        client.get("people/", params={"page": 10})
+
+    # buraco conhecido da SWAPI
+    with pytest.raises(SwapiNotFound):
+        client.get("people/17/")
+
+    luke = client.get_by_url(f"{emulator.base_url}/people/1/")
+    assert luke["name"] == "Luke Skywalker"
+    assert luke["url"] == f"{emulator.base_url}/people/1/"
+
+
+def test_emulator_search_and_window(emulator):
+    client = SwapiClient(base_url=emulator.base_url, retry=RetryConfig(max_retries=0), sleep_fn=lambda _: None)
+
+    data = client.get("planets/", params={"search": "tatoo"})
+    assert data["count"] == 1
+    assert data["results"][0]["name"] == "Tatooine"
+
+    emulator.reset_calls()
+    items, total = fetch_window(client, "people/", page=2, page_size=25)
+    assert total == 82
+    assert len(items) == 25
+    assert emulator.calls == 3  # upstream 3..5
+
+
+def test_emulator_injects_429():
+    with SwapiEmulator(faults=FaultConfig(rate_429=1.0)) as emu:
+        client = SwapiClient(base_url=emu.base_url, retry=RetryConfig(max_retries=1), sleep_fn=lambda _: None)
+        with pytest.raises(SwapiUpstreamError):
+            client.get("films/")
+        assert emu.calls == 2
@@ -1,6 +1,6 @@
 import pytest
 
-from clients.utils import InvalidSwapiUrl, attach_id, extract_id
+from clients.utils import InvalidSwapiUrl, attach_id, extract_id, parse_ref
 
 
 @pytest.mark.parametrize(
@@ -41,3 +41,21 @@ def test_attach_id_returns_new_dict_and_keeps_fields():
     assert out["url"] == original["url"]
     assert out is not original
     assert "id" not in original  # não mutou
+
+
+@pytest.mark.parametrize(
+    "ref, expected",
+    [
+        ("people/1", ("people", 1)),
+        ("/films/2/", ("films", 2)),
+        ("https://swapi.dev/api/planets/10/", ("planets", 10)),
+    ],
+)
+def test_parse_ref_success(ref, expected):
+    assert parse_ref(ref) == expected
+
+
+@pytest.mark.parametrize("ref", ["", "people", "droids/1", "people/abc", "people/1/extra"])
+def test_parse_ref_invalid(ref):
+    with pytest.raises(InvalidSwapiUrl):
+        parse_ref(ref)
@@ -0,0 +1,67 @@
+import pytest
+import respx
+
+from clients import urls
+from clients.swapi import SwapiClient
+from clients.urls import InvalidSwapiUrl, bulk_ids, cache_key, canonical_url, extract_id, url_ref
+
+BASE = "https://swapi.dev/api"
+
+
+def test_canonical_url_folds_scheme_slash_and_host_alias():
+    canon = f"{BASE}/people/1/"
+    for raw in (
+        canon,
+        "http://swapi.dev/api/people/1/",
+        "https://swapi.dev/api/people/1",
+        " HTTPS://SWAPI.DEV/api/people/1/ ",
+        "https://www.swapi.dev/api/people/1/",
+    ):
+        assert canonical_url(raw) == canon
+
+    assert canonical_url(f"{BASE}/people/?search=sky") == f"{BASE}/people/?search=sky"
+    assert canonical_url("people/1") == "people/1"
+
+
+def test_url_ref_is_memoized_and_shared():
+    url = f"{BASE}/starships/9/"
+    first = url_ref(url)
+    assert first == ("starships", 9)
+    assert url_ref(url) is first
+    assert url_ref(f"{BASE}/people/") is None
+    assert urls.memo_info()["url_ref"]["hits"] >= 1
+
+
+def test_extract_id_keeps_validation_contract():
+    assert extract_id("http://swapi.dev/api/films/2") == 2
+    with pytest.raises(InvalidSwapiUrl):
+        extract_id("")
+    with pytest.raises(InvalidSwapiUrl):
+        extract_id("https://swapi.dev/api/films/")
+
+
+def test_bulk_ids_converts_lists_in_one_pass():
+    ids = bulk_ids([f"{BASE}/people/{i}/" for i in (1, 4, 83)])
+    assert ids.typecode == "I"
+    assert ids.tolist() == [1, 4, 83]
+    assert bulk_ids([]).tolist() == []
+    with pytest.raises(InvalidSwapiUrl):
+        bulk_ids([f"{BASE}/people/1/", "nope"])
+
+
+def test_cache_key_sorts_params():
+    assert cache_key(f"{BASE}/people/1") == f"{BASE}/people/1/"
+    assert cache_key("http://swapi.dev/api/people/", {"search": "r2", "page": 2}) == f"{BASE}/people/?page=2&search=r2"
+
+
+@respx.mock
+def test_get_by_url_variants_share_one_cache_entry():
+    route = respx.get(f"{BASE}/people/1/").respond(200, json={"name": "Luke", "url": f"{BASE}/people/1/"})
+    client = SwapiClient(sleep_fn=lambda _: None)
+
+    assert client.get_by_url(f"{BASE}/people/1/")["name"] == "Luke"
+    assert client.get_by_url("https://www.swapi.dev/api/people/1/")["name"] == "Luke"
+    assert client.get_by_url("http://swapi.dev/api/people/1")["name"] == "Luke"
+
+    assert route.call_count == 1
+    assert client.cache_warmth()["people"]["entries"] == 1
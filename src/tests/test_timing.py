@@ -0,0 +1,113 @@
+import json
+import logging
+
+import respx
+from flask import Flask
+
+import app.main as app_main
+from app.concurrency import run_bounded
+from app.main import create_app_router
+from clients.swapi import RetryConfig, SwapiClient
+from observability import timing
+from observability.timing import RequestTimings
+
+
+def test_server_timing_aggregates_spans_and_cache_counters():
+    clock = iter([0.0, 0.0, 0.010, 0.010, 0.015, 0.020])
+    t = RequestTimings(now_fn=lambda: next(clock))
+
+    with t.span("route"):
+        pass
+    with t.span("upstream"):
+        pass
+    t.incr("cache_hit", 2)
+    t.incr("cache_miss")
+
+    header = t.server_timing()
+    assert header == 'route;dur=10.00, upstream;dur=5.00, cache;desc="hit=2 miss=1", total;dur=20.00'
+
+
+def test_helpers_are_noop_outside_a_request():
+    assert timing.current() is None
+    with timing.span("x"):
+        timing.incr("y")
+    assert timing.current() is None
+
+
+def test_run_bounded_propagates_request_timings_to_workers():
+    t = RequestTimings()
+
+    def work(item: str) -> str:
+        timing.incr("seen")
+        with timing.span("work"):
+            return item
+
+    with timing.activate(t):
+        assert run_bounded(work, ["a", "b", "c"], max_workers=3) == ["a", "b", "c"]
+
+    assert t.counters["seen"] == 3
+    assert t.spans["work"].count == 3
+    assert t.spans["fanout"].count == 1
+
+
+@respx.mock
+def test_client_records_one_upstream_call_with_retries():
+    respx.get("https://swapi.dev/api/films/").side_effect = [
+        respx.MockResponse(503),
+        respx.MockResponse(200, json={"count": 0, "results": []}),
+    ]
+    client = SwapiClient(retry=RetryConfig(max_retries=2), sleep_fn=lambda _: None, page_cache_ttl=60.0)
+
+    t = RequestTimings()
+    with timing.activate(t):
+        client.get("films/", params={"page": 1})
+        client.get("films/", params={"page": 1})
+
+    assert t.spans["upstream"].count == 1
+    assert t.counters == {"cache_miss": 1, "cache_hit": 1, "upstream_retries": 1}
+    (call,) = t.upstream_calls
+    assert call["url"] == "/films/"
+    assert call["status"] == 200
+    assert call["attempts"] == 2
+
+
+class _Capture(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(record.getMessage())
+
+
+@respx.mock
+def test_main_emits_server_timing_and_one_log_line(monkeypatch):
+    respx.get("https://swapi.dev/api/films/").respond(
+        200, json={"count": 1, "results": [{"title": "A New Hope", "url": "https://swapi.dev/api/films/1/"}]}
+    )
+    client = SwapiClient(sleep_fn=lambda _: None)
+    monkeypatch.setattr(app_main, "_router", create_app_router(client))
+
+    capture = _Capture()
+    monkeypatch.setattr(timing.logger, "disabled", False)
+    timing.logger.addHandler(capture)
+    try:
+        with Flask(__name__).test_request_context("/films", headers={"x-request-id": "rid-123"}):
+            from flask import request
+
+            resp = app_main.main(request)
+    finally:
+        timing.logger.removeHandler(capture)
+
+    assert resp.status_code == 200
+    header = resp.headers["Server-Timing"]
+    for name in ("route", "validate", "upstream", "handler", "serialize", "total"):
+        assert f"{name};dur=" in header
+
+    (line,) = capture.lines
+    entry = json.loads(line)
+    assert entry["request_id"] == "rid-123"
+    assert entry["status"] == 200
+    assert entry["path"] == "/films"
+    assert entry["spans"]["upstream"]["count"] == 1
+    assert entry["upstream_calls"][0]["status"] == 200
@@ -0,0 +1,85 @@
+import json
+
+import respx
+
+import app.main as app_main
+from app import warmup
+from app.main import create_app_router
+from clients.swapi import SwapiClient
+
+
+def test_default_manifest_loads_and_respects_top_n():
+    paths = warmup.load_manifest(top_n=3)
+    assert paths == ["/films", "/people?page=1", "/planets?page=1"]
+
+
+def test_missing_or_invalid_manifest_is_empty(tmp_path):
+    assert warmup.load_manifest(str(tmp_path / "nope.json")) == []
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json")
+    assert warmup.load_manifest(str(bad)) == []
+
+
+def test_manifest_from_log_counts_successful_gets():
+    def line(path, query="", status=200, method="GET"):
+        return json.dumps({"method": method, "path": path, "query": query, "status": status})
+
+    lines = [
+        line("/films/1/characters"),
+        line("/films/1/characters"),
+        line("/people", "page=2"),
+        line("/people", "page=2"),
+        line("/people", "page=2"),
+        line("/planets", status=502),
+        line("/resolve", method="POST"),
+        line("/health"),
+        "not json",
+    ]
+    assert warmup.manifest_from_log(lines, top_n=5) == ["/people?page=2", "/films/1/characters"]
+
+
+@respx.mock
+def test_warm_primes_parent_and_child_caches():
+    film = respx.get("https://swapi.dev/api/films/1/").respond(
+        200,
+        json={
+            "title": "A New Hope",
+            "characters": ["https://swapi.dev/api/people/1/", "https://swapi.dev/api/people/2/"],
+            "url": "https://swapi.dev/api/films/1/",
+        },
+    )
+    people = [
+        respx.get(f"https://swapi.dev/api/people/{i}/").respond(
+            200, json={"name": f"P{i}", "url": f"https://swapi.dev/api/people/{i}/"}
+        )
+        for i in (1, 2)
+    ]
+    router = create_app_router(SwapiClient(sleep_fn=lambda _: None, page_cache_ttl=60.0))
+
+    report = warmup.warm(router, ["/films/1/characters", "/nope"])
+    assert (report.attempted, report.ok, report.failed) == (2, 1, 1)
+    assert film.call_count == 1
+    assert all(r.call_count == 1 for r in people)
+
+    # request real depois do warm-up: nenhum hit upstream
+    status, payload, _ = router.dispatch(
+        method="GET", path="/films/1/characters", query={}, headers={}, body=None, request_id="rid"
+    )
+    assert status == 200
+    assert len(payload["data"]) == 2
+    assert film.call_count == 1
+    assert all(r.call_count == 1 for r in people)
+
+
+def test_start_warmup_is_off_by_default(monkeypatch):
+    started = []
+    monkeypatch.setattr(warmup, "start_background", lambda router, paths: started.append(paths))
+
+    monkeypatch.delenv("WARMUP", raising=False)
+    app_main._start_warmup(create_app_router(SwapiClient()))
+    assert started == []
+
+    monkeypatch.setenv("WARMUP", "first_request")
+    monkeypatch.setenv("WARMUP_TOP_N", "2")
+    app_main._start_warmup(create_app_router(SwapiClient()))
+    assert started == [["/films", "/people?page=1"]]